@@ -0,0 +1,97 @@
+"""Micro-benchmark for guess parsing over multilingual chat corpora.
+
+Usage:
+    python -m benchmarks.bench_parsing [--messages N] [--repeat R]
+
+Compares the current single-pass parser in ``bot.services.parsing`` with the
+previous two-pass implementation on synthetic but realistic group traffic
+(English, Persian and Arabic chatter mixed with guesses in every script).
+"""
+import argparse
+import os
+import random
+import re
+import timeit
+
+os.environ.setdefault("BOT_TOKEN", "benchmark")
+
+from bot.services.parsing import contains_digit, extract_guess  # noqa: E402
+
+# Previous implementation, kept here as the baseline
+_PERSIAN_TO_ENGLISH = str.maketrans('۰۱۲۳۴۵۶۷۸۹', '0123456789')
+_ARABIC_TO_ENGLISH = str.maketrans('٠١٢٣٤٥٦٧٨٩', '0123456789')
+
+def legacy_extract_guess(text):
+    normalized = text.strip().translate(_PERSIAN_TO_ENGLISH).translate(_ARABIC_TO_ENGLISH)
+    match = re.search(r'\b(\d+)\b', normalized)
+    if match:
+        try:
+            return int(match.group(1))
+        except ValueError:
+            return None
+    return None
+
+CHATTER = {
+    "en": [
+        "lol this round is hard", "good luck everyone!", "who's winning?",
+        "I think it's higher", "admin when next round", "😂😂😂",
+        "gg", "nice try bro", "this bot is fun", "brb",
+    ],
+    "fa": [
+        "سلام به همه", "موفق باشید", "کی برنده میشه؟", "فکر کنم بالاتره",
+        "دور بعدی کیه", "😂😂", "ایول", "خیلی سخته", "بریم که داشته باشیم",
+    ],
+    "ar": [
+        "مرحبا بالجميع", "بالتوفيق", "من سيفوز؟", "أعتقد أنه أعلى", "هههه",
+    ],
+}
+
+def _format_number(value, script):
+    digits = str(value)
+    if script == "fa":
+        return digits.translate(str.maketrans('0123456789', '۰۱۲۳۴۵۶۷۸۹'))
+    if script == "ar":
+        return digits.translate(str.maketrans('0123456789', '٠١٢٣٤٥٦٧٨٩'))
+    return digits
+
+def build_corpus(name, size, seed=42):
+    """Build a deterministic message corpus for one traffic profile."""
+    rng = random.Random(seed)
+    guess_ratio = {"chatter": 0.05, "mixed": 0.4, "guesses": 0.95}[name]
+    corpus = []
+    for _ in range(size):
+        script = rng.choice(("en", "en", "fa", "fa", "ar"))
+        roll = rng.random()
+        if roll < guess_ratio:
+            value = _format_number(rng.randint(1, 10000), script)
+            corpus.append(rng.choice((value, f" {value} ", f"{value}!", f"{rng.choice(CHATTER[script])} {value}")))
+        elif roll < guess_ratio + 0.03:
+            # Long digit runs: phone numbers, order IDs
+            corpus.append(_format_number(rng.randint(10**8, 10**11), script))
+        else:
+            corpus.append(rng.choice(CHATTER[script]))
+    return corpus
+
+def run(messages, repeat):
+    for name in ("chatter", "mixed", "guesses"):
+        corpus = build_corpus(name, messages)
+        cases = {
+            "legacy": lambda: [legacy_extract_guess(m) for m in corpus],
+            "single-pass": lambda: [extract_guess(m) for m in corpus],
+            "strict": lambda: [extract_guess(m, strict=True) for m in corpus],
+            "prefilter+parse": lambda: [extract_guess(m) for m in corpus if contains_digit(m)],
+        }
+        print(f"\n{name} ({messages} messages)")
+        for label, func in cases.items():
+            best = min(timeit.repeat(func, number=1, repeat=repeat))
+            print(f"  {label:<16} {best * 1e9 / messages:8.0f} ns/message")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.messages, args.repeat)
+
+if __name__ == "__main__":
+    main()
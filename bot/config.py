@@ -13,10 +13,20 @@ if not BOT_TOKEN:
 
 # Admin configuration
 ADMIN_IDS_STR = os.getenv("ADMIN_IDS", "")
-ADMIN_IDS = [int(id.strip()) for id in ADMIN_IDS_STR.split(",") if id.strip().isdigit()]
+ADMIN_IDS = frozenset(int(id.strip()) for id in ADMIN_IDS_STR.split(",") if id.strip().isdigit())
+
+# Pending admin input configuration (e.g. waiting for a round's Stars cost)
+PENDING_INPUT_TTL_SECONDS = int(os.getenv("PENDING_INPUT_TTL_SECONDS", "300"))
+PENDING_INPUT_MAX_ENTRIES = int(os.getenv("PENDING_INPUT_MAX_ENTRIES", "10000"))
+PENDING_INPUT_PERSIST = os.getenv("PENDING_INPUT_PERSIST", "true").lower() == "true"
 
 # Database configuration
 DATABASE_PATH = os.getenv("DATABASE_PATH", "game_bot.db")
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sqlite").lower()  # "sqlite" or "memory"
+if STORAGE_BACKEND not in ("sqlite", "memory"):
+    raise ValueError("STORAGE_BACKEND must be either 'sqlite' or 'memory'")
+MEMORY_SNAPSHOT_PATH = os.getenv("MEMORY_SNAPSHOT_PATH", "")  # Memory backend snapshot file (empty = none)
+MEMORY_SNAPSHOT_SECONDS = float(os.getenv("MEMORY_SNAPSHOT_SECONDS", "60"))
 
 # Game configuration
 MIN_NUMBER = int(os.getenv("MIN_NUMBER", "1"))
@@ -24,6 +34,7 @@ MAX_NUMBER = int(os.getenv("MAX_NUMBER", "10000"))
 MAX_GUESSES_PER_PLAYER = 10
 ROUND_DURATION_MINUTES = int(os.getenv("ROUND_DURATION_MINUTES", "2"))
 MIN_GUESSES_BEFORE_CLOSE = 10  # Minimum guesses before timer can close round
+STRICT_GUESS_PARSING = os.getenv("STRICT_GUESS_PARSING", "false").lower() == "true"  # Whole message must be the number
 
 # Round costs (suggested, displayed only)
 ROUND_COSTS = {
@@ -42,11 +53,57 @@ def get_round_cost(round_number: int) -> int:
     """Get the suggested star cost for a given round number."""
     return ROUND_COSTS.get(round_number, ROUND_COSTS.get(max(ROUND_COSTS.keys()), 1000))
 
+# Per-user guess rate limiting (token bucket, per chat)
+GUESS_RATE_PER_SECOND = float(os.getenv("GUESS_RATE_PER_SECOND", "1"))
+GUESS_BURST = int(os.getenv("GUESS_BURST", "5"))
+GUESS_COOLDOWN_SECONDS = float(os.getenv("GUESS_COOLDOWN_SECONDS", "30"))
+GUESS_RATE_WARN = os.getenv("GUESS_RATE_WARN", "true").lower() == "true"  # false = drop silently
+
+# Update deduplication: number of recent update/message IDs remembered
+DEDUPE_WINDOW_SIZE = int(os.getenv("DEDUPE_WINDOW_SIZE", "10000"))
+
+# Outbox (reliable announcement delivery)
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "5"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+
+# Commitment pool: secret numbers committed ahead of time so /newgame only pops one
+COMMITMENT_POOL_SIZE = int(os.getenv("COMMITMENT_POOL_SIZE", "100"))  # 0 disables the pool
+COMMITMENT_POOL_REFILL_AT = int(os.getenv("COMMITMENT_POOL_REFILL_AT", "25"))  # Refill when this many are left
+COMMITMENT_POOL_KEY = os.getenv("COMMITMENT_POOL_KEY", "")  # Encrypts pooled secrets (derived from BOT_TOKEN if unset)
+
+# Health endpoints (/healthz, /readyz) and event loop watchdog
+HEALTH_HOST = os.getenv("HEALTH_HOST", "127.0.0.1")
+HEALTH_PORT = int(os.getenv("HEALTH_PORT", "8081"))  # 0 disables the HTTP endpoints
+LOOP_LAG_THRESHOLD_MS = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "250"))  # Log lag and sample stacks above this
+READY_MAX_OUTBOX = int(os.getenv("READY_MAX_OUTBOX", "500"))  # Not ready with more undelivered announcements
+READY_MAX_UPDATE_AGE_SECONDS = float(os.getenv("READY_MAX_UPDATE_AGE_SECONDS", "0"))  # 0 = don't require updates
+
+# /status cache: after guesses, re-render a chat's status at most this often (0 = every time)
+STATUS_DEBOUNCE_MS = float(os.getenv("STATUS_DEBOUNCE_MS", "500"))
+
+# Graceful shutdown: time allowed to drain in-flight updates and flush the outbox
+SHUTDOWN_TIMEOUT_SECONDS = float(os.getenv("SHUTDOWN_TIMEOUT_SECONDS", "25"))
+
+# Database tracing: per-method timings and slow query log (with EXPLAIN QUERY PLAN)
+DB_TRACE = os.getenv("DB_TRACE", "true").lower() == "true"
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "100"))
+DB_TRACE_WINDOW = int(os.getenv("DB_TRACE_WINDOW", "1000"))  # Recent calls kept per method for percentiles
+
+# On-demand profiling (/profile command and HTTP endpoint)
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")  # Collapsed-stack files are written here
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+
+# Fairness audits: key for signing audit reports (derived from BOT_TOKEN if unset)
+AUDIT_SIGNING_KEY = os.getenv("AUDIT_SIGNING_KEY", "")
+
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
 # Language configuration
-LANGUAGE = os.getenv("LANGUAGE", "en").lower()  # 'en' for English, 'fa' for Persian
-if LANGUAGE not in ["en", "fa"]:
+SUPPORTED_LANGUAGES = ("en", "fa")
+LANGUAGE = os.getenv("LANGUAGE", "en").lower()  # Default for chats without their own setting
+if LANGUAGE not in SUPPORTED_LANGUAGES:
     raise ValueError("LANGUAGE must be either 'en' (English) or 'fa' (Persian/Farsi)")
 
@@ -1,31 +1,45 @@
 """Admin command handlers."""
-import json
+import asyncio
 import logging
 from aiogram import Router, F
 from aiogram.filters import Command
-from aiogram.types import Message, CallbackQuery
-from bot.config import ADMIN_IDS, get_round_cost, ROUND_DURATION_MINUTES, LANGUAGE
+from aiogram.types import Message, CallbackQuery, FSInputFile
+from bot.config import (
+    ADMIN_IDS,
+    get_round_cost,
+    ROUND_DURATION_MINUTES,
+    SUPPORTED_LANGUAGES,
+    PENDING_INPUT_TTL_SECONDS,
+    PENDING_INPUT_MAX_ENTRIES
+)
 from bot.services.game_engine import GameEngine
 from bot.services.announcer import Announcer
+from bot.services import analytics
+from bot.services.outbox import make_announcement
+from bot.services.pending_inputs import PendingInputStore
+from bot.services.profiler import SamplingProfiler
 from bot.keyboards.admin import AdminKeyboards
-from bot.storage.models import GameStatus, RoundStatus
+from bot.keyboards.callback_data import CALLBACK_PREFIX, CallbackAction, decode
+from bot.storage.models import RoundStatus
 from bot.translations import Translations
 
 logger = logging.getLogger(__name__)
 
 router = Router()
 
-# Temporary storage for pending round starts (chat_id -> round_index)
-pending_round_starts = {}
+# Pending round starts awaiting a Stars cost (chat_id -> round_index)
+pending_round_starts = PendingInputStore(PENDING_INPUT_TTL_SECONDS, PENDING_INPUT_MAX_ENTRIES)
 
 def is_admin(user_id: int) -> bool:
     """Check if user is admin."""
     return user_id in ADMIN_IDS
 
-def is_pending_stars_input(message: Message) -> bool:
+async def is_pending_stars_input(message: Message) -> bool:
     """Check if this chat is waiting for Stars cost input from admin."""
-    return (message.chat.id in pending_round_starts and 
-            is_admin(message.from_user.id))
+    # Cheap admin check first so regular players never touch the store
+    if not is_admin(message.from_user.id):
+        return False
+    return await pending_round_starts.lookup(message.chat.id) is not None
 
 @router.message(Command("newgame"))
 async def cmd_newgame(message: Message, game_engine: GameEngine):
@@ -36,7 +50,7 @@ async def cmd_newgame(message: Message, game_engine: GameEngine):
     Example: /newgame 1000 | TechCorp | Welcome to our sponsored round! | Thanks for playing!
     """
     t = Translations.get
-    lang = LANGUAGE
+    lang = Translations.chat_language(message.chat.id)
     
     if not is_admin(message.from_user.id):
         await message.reply(t('only_admins_newgame', lang))
@@ -101,7 +115,7 @@ async def cmd_newgame(message: Message, game_engine: GameEngine):
     )
     
     # Send announcement
-    announcement = Announcer.game_created(target_hash, prize_amount, sponsor_name)
+    announcement = Announcer.game_created(target_hash, prize_amount, sponsor_name, lang=lang)
     keyboard = AdminKeyboards.new_game_controls(next_round=1)
     
     await message.reply(announcement, reply_markup=keyboard, parse_mode="HTML")
@@ -114,7 +128,7 @@ async def cmd_newgame(message: Message, game_engine: GameEngine):
 async def cmd_start_round(message: Message, game_engine: GameEngine):
     """Handle /start_round command - prompt for Stars cost."""
     t = Translations.get
-    lang = LANGUAGE
+    lang = Translations.chat_language(message.chat.id)
     
     if not is_admin(message.from_user.id):
         await message.reply(t('only_admins', lang))
@@ -137,7 +151,7 @@ async def cmd_start_round(message: Message, game_engine: GameEngine):
         return
     
     # Store pending round and ask for Stars cost
-    pending_round_starts[message.chat.id] = next_round
+    await pending_round_starts.set(message.chat.id, next_round)
     await message.reply(t('ask_stars_cost', lang, round=next_round), parse_mode="HTML")
     logger.info(f"Admin {message.from_user.id} initiated /start_round for round {next_round}")
 
@@ -145,7 +159,7 @@ async def cmd_start_round(message: Message, game_engine: GameEngine):
 async def cmd_pause_round(message: Message, game_engine: GameEngine):
     """Handle /pause_round command."""
     t = Translations.get
-    lang = LANGUAGE
+    lang = Translations.chat_language(message.chat.id)
     
     if not is_admin(message.from_user.id):
         await message.reply(t('only_admins', lang))
@@ -163,7 +177,7 @@ async def cmd_pause_round(message: Message, game_engine: GameEngine):
     
     await game_engine.pause_round(active_round.id)
     
-    announcement = Announcer.round_paused()
+    announcement = Announcer.round_paused(lang)
     keyboard = AdminKeyboards.paused_round_controls(active_round.round_index)
     
     await message.reply(announcement, reply_markup=keyboard, parse_mode="HTML")
@@ -173,7 +187,7 @@ async def cmd_pause_round(message: Message, game_engine: GameEngine):
 async def cmd_resume_round(message: Message, game_engine: GameEngine):
     """Handle /resume_round command."""
     t = Translations.get
-    lang = LANGUAGE
+    lang = Translations.chat_language(message.chat.id)
     
     if not is_admin(message.from_user.id):
         await message.reply(t('only_admins', lang))
@@ -191,7 +205,7 @@ async def cmd_resume_round(message: Message, game_engine: GameEngine):
     
     await game_engine.resume_round(active_round.id)
     
-    announcement = Announcer.round_resumed(active_round.round_index)
+    announcement = Announcer.round_resumed(active_round.round_index, lang)
     keyboard = AdminKeyboards.active_round_controls(active_round.round_index)
     
     await message.reply(announcement, reply_markup=keyboard, parse_mode="HTML")
@@ -201,7 +215,7 @@ async def cmd_resume_round(message: Message, game_engine: GameEngine):
 async def cmd_close_round(message: Message, game_engine: GameEngine):
     """Handle /close_round command."""
     t = Translations.get
-    lang = LANGUAGE
+    lang = Translations.chat_language(message.chat.id)
     
     if not is_admin(message.from_user.id):
         await message.reply(t('only_admins', lang))
@@ -217,24 +231,15 @@ async def cmd_close_round(message: Message, game_engine: GameEngine):
         await message.reply(t('no_active_round', lang))
         return
     
-    await game_engine.close_round(active_round.id)
-    
-    # Calculate next round number
-    all_rounds = await game_engine.db.get_rounds_for_game(game.id)
-    next_round = len(all_rounds) + 1
-    
-    # Send announcement with sponsor end message if available
-    announcement = Announcer.round_closed(active_round.round_index, game.sponsor_end_message)
-    keyboard = AdminKeyboards.between_rounds_controls(next_round)
-    
-    await message.reply(announcement, reply_markup=keyboard, parse_mode="HTML")
+    # The engine queues the summary announcement together with the close
+    await game_engine.close_round(active_round.id, message.message_id)
     logger.info(f"Round {active_round.id} closed via command")
 
 @router.message(Command("reveal"))
 async def cmd_reveal(message: Message, game_engine: GameEngine):
     """Handle /reveal command - manually reveal the number."""
     t = Translations.get
-    lang = LANGUAGE
+    lang = Translations.chat_language(message.chat.id)
     
     if not is_admin(message.from_user.id):
         await message.reply(t('only_admins', lang))
@@ -248,12 +253,12 @@ async def cmd_reveal(message: Message, game_engine: GameEngine):
     # Verify the game
     is_valid = await game_engine.verify_game(game.id)
     
-    announcement = Announcer.manual_reveal(game.number, game.salt, game.target_hash)
+    announcement = Announcer.manual_reveal(game.number, game.salt, game.target_hash, lang)
     
     await message.reply(announcement, parse_mode="HTML")
     
     # Mark game as finished (no winner)
-    await game_engine.db.update_game_status(game.id, GameStatus.GAME_FINISHED)
+    await game_engine.reveal_game(game.id)
     
     logger.info(f"Game {game.id} manually revealed via command")
 
@@ -261,7 +266,7 @@ async def cmd_reveal(message: Message, game_engine: GameEngine):
 async def cmd_cancel_game(message: Message, game_engine: GameEngine):
     """Handle /cancel_game command."""
     t = Translations.get
-    lang = LANGUAGE
+    lang = Translations.chat_language(message.chat.id)
     
     if not is_admin(message.from_user.id):
         await message.reply(t('only_admins', lang))
@@ -272,18 +277,15 @@ async def cmd_cancel_game(message: Message, game_engine: GameEngine):
         await message.reply(t('no_active_game', lang))
         return
     
-    await game_engine.cancel_game(game.id)
-    
-    announcement = Announcer.game_canceled()
-    
-    await message.reply(announcement, parse_mode="HTML")
+    announcement = make_announcement(message.chat.id, Announcer.game_canceled(lang), None, message.message_id)
+    await game_engine.cancel_game(game.id, announcement)
     logger.info(f"Game {game.id} canceled via command")
 
 @router.message(Command("post_cost"))
 async def cmd_post_cost(message: Message, game_engine: GameEngine):
     """Handle /post_cost command - post cost hint for next round."""
     t = Translations.get
-    lang = LANGUAGE
+    lang = Translations.chat_language(message.chat.id)
     
     if not is_admin(message.from_user.id):
         await message.reply(t('only_admins', lang))
@@ -299,34 +301,125 @@ async def cmd_post_cost(message: Message, game_engine: GameEngine):
     next_round = len(all_rounds) + 1
     
     cost = get_round_cost(next_round)
-    announcement = Announcer.cost_hint(next_round, cost)
+    announcement = Announcer.cost_hint(next_round, cost, lang)
     
     await message.reply(announcement, parse_mode="HTML")
     logger.info(f"Cost hint posted for round {next_round} via command")
 
+@router.message(Command("language"))
+async def cmd_language(message: Message, game_engine: GameEngine):
+    """Handle /language command - set the bot language for this chat."""
+    t = Translations.get
+    lang = Translations.chat_language(message.chat.id)
+    
+    if not is_admin(message.from_user.id):
+        await message.reply(t('only_admins', lang))
+        return
+    
+    parts = message.text.split(maxsplit=1)
+    new_lang = parts[1].strip().lower() if len(parts) > 1 else ""
+    if new_lang not in SUPPORTED_LANGUAGES:
+        await message.reply(t('language_usage', lang), parse_mode="HTML")
+        return
+    
+    await game_engine.db.set_chat_language(message.chat.id, new_lang)
+    Translations.set_chat_language(message.chat.id, new_lang)
+    
+    await message.reply(t('language_set', new_lang))
+    logger.info(f"Language for chat {message.chat.id} set to {new_lang}")
+
+@router.message(Command("analytics"))
+async def cmd_analytics(message: Message, game_engine: GameEngine):
+    """Handle /analytics command - guess distribution and player statistics for this chat."""
+    t = Translations.get
+    lang = Translations.chat_language(message.chat.id)
+    
+    if not is_admin(message.from_user.id):
+        await message.reply(t('only_admins', lang))
+        return
+    
+    if not analytics.available():
+        await message.reply(t('analytics_unavailable', lang))
+        return
+    
+    columns = await analytics.load_from_db(game_engine.db, chat_id=message.chat.id)
+    # Vectorized, but still CPU work: keep it off the event loop
+    report = await asyncio.to_thread(analytics.build_report, columns, 10)
+    
+    await message.reply(Announcer.analytics_report(report, lang), parse_mode="HTML")
+    logger.info(
+        f"Analytics for chat {message.chat.id}: {report.total_guesses} guesses in {report.elapsed * 1000:.1f} ms"
+    )
+
+@router.message(Command("dbstats"))
+async def cmd_dbstats(message: Message, game_engine: GameEngine):
+    """Handle /dbstats command - slowest database methods by p95 latency."""
+    t = Translations.get
+    lang = Translations.chat_language(message.chat.id)
+    
+    if not is_admin(message.from_user.id):
+        await message.reply(t('only_admins', lang))
+        return
+    
+    tracer = game_engine.db.tracer
+    if tracer is None:
+        await message.reply(t('dbstats_disabled', lang))
+        return
+    
+    await message.reply(Announcer.db_stats(tracer.snapshot(top=10), lang), parse_mode="HTML")
+
+@router.message(Command("profile"))
+async def cmd_profile(message: Message, profiler: SamplingProfiler):
+    """Handle /profile [seconds] command - sample the running bot and send the profile."""
+    t = Translations.get
+    lang = Translations.chat_language(message.chat.id)
+    
+    if not is_admin(message.from_user.id):
+        await message.reply(t('only_admins', lang))
+        return
+    
+    parts = message.text.split(maxsplit=1)
+    try:
+        seconds = float(parts[1]) if len(parts) > 1 else 10.0
+    except ValueError:
+        seconds = 0.0
+    if not 0 < seconds <= profiler.max_seconds:
+        await message.reply(t('profile_usage', lang, max=f"{profiler.max_seconds:g}"), parse_mode="HTML")
+        return
+    if profiler.running:
+        await message.reply(t('profile_busy', lang))
+        return
+    
+    await message.reply(t('profile_started', lang, seconds=seconds))
+    report = await profiler.profile(seconds)
+    await message.reply(Announcer.profile_report(report, lang), parse_mode="HTML")
+    await message.reply_document(FSInputFile(report.path))
+    logger.info(f"Profile requested by {message.from_user.id} written to {report.path}")
+
 @router.message(Command("cancel"))
 async def cmd_cancel_input(message: Message):
     """Cancel any pending admin input."""
     t = Translations.get
-    lang = LANGUAGE
+    lang = Translations.chat_language(message.chat.id)
     
     if not is_admin(message.from_user.id):
         return
     
-    if message.chat.id in pending_round_starts:
-        del pending_round_starts[message.chat.id]
+    if await pending_round_starts.pop(message.chat.id) is not None:
         await message.reply(t('input_cancelled', lang))
     else:
         await message.reply(t('no_pending_input', lang))
 
-@router.message(F.text & ~F.text.startswith('/'), F.func(is_pending_stars_input))
+@router.message(F.text & ~F.text.startswith('/'), is_pending_stars_input)
 async def handle_stars_cost_input(message: Message, game_engine: GameEngine):
     """Handle Stars cost input from admin - only when pending."""
     t = Translations.get
-    lang = LANGUAGE
+    lang = Translations.chat_language(message.chat.id)
     
-    # Get the round index (we know it exists because of the filter)
-    round_index = pending_round_starts[message.chat.id]
+    # Get the round index (checked by the filter, but it may have just expired)
+    round_index = pending_round_starts.get(message.chat.id)
+    if round_index is None:
+        return
     
     # Parse the Stars cost
     try:
@@ -339,7 +432,7 @@ async def handle_stars_cost_input(message: Message, game_engine: GameEngine):
         return
     
     # Clear the pending state
-    del pending_round_starts[message.chat.id]
+    await pending_round_starts.pop(message.chat.id)
     
     # Get the game
     game = await game_engine.db.get_active_game(message.chat.id)
@@ -361,65 +454,54 @@ async def handle_stars_cost_input(message: Message, game_engine: GameEngine):
         round_index, 
         round_obj.message_cost_hint, 
         ROUND_DURATION_MINUTES,
-        game.sponsor_start_message
+        game.sponsor_start_message,
+        lang
     )
     keyboard = AdminKeyboards.active_round_controls(round_index)
     
     await message.reply(announcement, reply_markup=keyboard, parse_mode="HTML")
     logger.info(f"Round {round_index} started for game {game.id} with {stars_cost} Stars cost")
 
-@router.callback_query(F.data.startswith("admin:"))
+@router.callback_query(F.data.startswith(CALLBACK_PREFIX))
 async def handle_admin_callback(callback: CallbackQuery, game_engine: GameEngine):
     """Handle all admin callback buttons."""
     t = Translations.get
-    lang = LANGUAGE
+    lang = Translations.chat_language(callback.message.chat.id)
     
     if not is_admin(callback.from_user.id):
         await callback.answer(t('only_admins', lang), show_alert=True)
         return
     
-    # Parse callback data
+    # Decode and authenticate callback data
     try:
-        json_data = callback.data.replace("admin:", "")
-        data = json.loads(json_data)
-        action = data.get("a")
-    except json.JSONDecodeError:
+        action, round_index = decode(callback.data)
+    except ValueError:
         await callback.answer(t('invalid_callback', lang), show_alert=True)
         return
     
+    handler = CALLBACK_HANDLERS[action]
+    
     # Get active game
     game = await game_engine.db.get_active_game(callback.message.chat.id)
-    if not game and action not in ["status"]:
+    if not game and action != CallbackAction.STATUS:
         await callback.answer(t('no_active_game', lang), show_alert=True)
         return
     
-    # Route to appropriate handler
-    if action == "ask_cost":
-        await handle_ask_cost(callback, data.get("n", 1))
-    elif action == "pause_round":
-        await handle_pause_round(callback, game_engine, game)
-    elif action == "resume_round":
-        await handle_resume_round(callback, game_engine, game)
-    elif action == "close_round":
-        await handle_close_round(callback, game_engine, game)
-    elif action == "reveal":
-        await handle_reveal(callback, game_engine, game)
-    elif action == "cancel":
-        await handle_cancel(callback, game_engine, game)
-    elif action == "post_cost":
-        await handle_post_cost(callback, game_engine, game, data.get("n", 1))
-    elif action == "status":
-        await handle_status(callback, game_engine, callback.message.chat.id)
-    else:
-        await callback.answer(t('unknown_action', lang), show_alert=True)
+    await handler(callback, game_engine, game, round_index)
 
-async def handle_ask_cost(callback: CallbackQuery, round_index: int):
+@router.callback_query(F.data.startswith("admin:"))
+async def handle_legacy_callback(callback: CallbackQuery):
+    """Answer buttons posted before the compact codec ("admin:{json}") so they don't spin."""
+    lang = Translations.chat_language(callback.message.chat.id)
+    await callback.answer(Translations.get('invalid_callback', lang), show_alert=True)
+
+async def handle_ask_cost(callback: CallbackQuery, engine: GameEngine, game, round_index: int):
     """Ask admin to type Stars cost for the round."""
     t = Translations.get
-    lang = LANGUAGE
+    lang = Translations.chat_language(callback.message.chat.id)
     
     # Store the pending round start
-    pending_round_starts[callback.message.chat.id] = round_index
+    await pending_round_starts.set(callback.message.chat.id, round_index)
     
     await callback.message.reply(
         t('ask_stars_cost', lang, round=round_index),
@@ -427,10 +509,10 @@ async def handle_ask_cost(callback: CallbackQuery, round_index: int):
     )
     await callback.answer()
 
-async def handle_pause_round(callback: CallbackQuery, engine: GameEngine, game):
+async def handle_pause_round(callback: CallbackQuery, engine: GameEngine, game, round_index: int):
     """Handle pausing the current round."""
     t = Translations.get
-    lang = LANGUAGE
+    lang = Translations.chat_language(callback.message.chat.id)
     
     active_round = await engine.db.get_active_round(game.id)
     if not active_round:
@@ -439,17 +521,17 @@ async def handle_pause_round(callback: CallbackQuery, engine: GameEngine, game):
     
     await engine.pause_round(active_round.id)
     
-    announcement = Announcer.round_paused()
+    announcement = Announcer.round_paused(lang)
     keyboard = AdminKeyboards.paused_round_controls(active_round.round_index)
     
     await callback.message.reply(announcement, reply_markup=keyboard, parse_mode="HTML")
     await callback.answer(t('round_paused_btn', lang))
     logger.info(f"Round {active_round.id} paused")
 
-async def handle_resume_round(callback: CallbackQuery, engine: GameEngine, game):
+async def handle_resume_round(callback: CallbackQuery, engine: GameEngine, game, round_index: int):
     """Handle resuming a paused round."""
     t = Translations.get
-    lang = LANGUAGE
+    lang = Translations.chat_language(callback.message.chat.id)
     
     active_round = await engine.db.get_active_round(game.id)
     if not active_round:
@@ -458,97 +540,93 @@ async def handle_resume_round(callback: CallbackQuery, engine: GameEngine, game)
     
     await engine.resume_round(active_round.id)
     
-    announcement = Announcer.round_resumed(active_round.round_index)
+    announcement = Announcer.round_resumed(active_round.round_index, lang)
     keyboard = AdminKeyboards.active_round_controls(active_round.round_index)
     
     await callback.message.reply(announcement, reply_markup=keyboard, parse_mode="HTML")
     await callback.answer(t('round_resumed_btn', lang))
     logger.info(f"Round {active_round.id} resumed")
 
-async def handle_close_round(callback: CallbackQuery, engine: GameEngine, game):
+async def handle_close_round(callback: CallbackQuery, engine: GameEngine, game, round_index: int):
     """Handle closing the current round."""
     t = Translations.get
-    lang = LANGUAGE
+    lang = Translations.chat_language(callback.message.chat.id)
     
     active_round = await engine.db.get_active_round(game.id)
     if not active_round:
         await callback.answer(t('no_active_round', lang), show_alert=True)
         return
     
-    await engine.close_round(active_round.id)
-    
-    # Calculate next round number
-    all_rounds = await engine.db.get_rounds_for_game(game.id)
-    next_round = len(all_rounds) + 1
-    
-    # Send announcement with sponsor end message if available
-    announcement = Announcer.round_closed(active_round.round_index, game.sponsor_end_message)
-    keyboard = AdminKeyboards.between_rounds_controls(next_round)
-    
-    await callback.message.reply(announcement, reply_markup=keyboard, parse_mode="HTML")
+    # The engine queues the summary announcement together with the close
+    await engine.close_round(active_round.id, callback.message.message_id)
     await callback.answer(t('round_closed_btn', lang))
     logger.info(f"Round {active_round.id} closed")
 
-async def handle_reveal(callback: CallbackQuery, engine: GameEngine, game):
+async def handle_reveal(callback: CallbackQuery, engine: GameEngine, game, round_index: int):
     """Handle manual reveal of the number."""
     t = Translations.get
-    lang = LANGUAGE
+    lang = Translations.chat_language(callback.message.chat.id)
     
     # Verify the game
     is_valid = await engine.verify_game(game.id)
     
-    announcement = Announcer.manual_reveal(game.number, game.salt, game.target_hash)
+    announcement = Announcer.manual_reveal(game.number, game.salt, game.target_hash, lang)
     
     await callback.message.reply(announcement, parse_mode="HTML")
     
     # Mark game as finished (no winner)
-    await engine.db.update_game_status(game.id, GameStatus.GAME_FINISHED)
+    await engine.reveal_game(game.id)
     
     await callback.answer(t('game_revealed_btn', lang))
     logger.info(f"Game {game.id} manually revealed")
 
-async def handle_cancel(callback: CallbackQuery, engine: GameEngine, game):
+async def handle_cancel(callback: CallbackQuery, engine: GameEngine, game, round_index: int):
     """Handle game cancellation."""
     t = Translations.get
-    lang = LANGUAGE
+    lang = Translations.chat_language(callback.message.chat.id)
     
-    await engine.cancel_game(game.id)
-    
-    announcement = Announcer.game_canceled()
-    
-    await callback.message.reply(announcement, parse_mode="HTML")
+    announcement = make_announcement(
+        callback.message.chat.id,
+        Announcer.game_canceled(lang),
+        None,
+        callback.message.message_id
+    )
+    await engine.cancel_game(game.id, announcement)
     await callback.answer(t('game_canceled_btn', lang))
     logger.info(f"Game {game.id} canceled")
 
 async def handle_post_cost(callback: CallbackQuery, engine: GameEngine, game, round_index: int):
     """Handle posting cost hint for a round."""
+    lang = Translations.chat_language(callback.message.chat.id)
+    
     cost = get_round_cost(round_index)
-    announcement = Announcer.cost_hint(round_index, cost)
+    announcement = Announcer.cost_hint(round_index, cost, lang)
     
     await callback.message.reply(announcement, parse_mode="HTML")
     await callback.answer("💰 Cost hint posted")
 
-async def handle_status(callback: CallbackQuery, engine: GameEngine, chat_id: int):
+async def handle_status(callback: CallbackQuery, engine: GameEngine, game, round_index: int):
     """Handle status request."""
     t = Translations.get
-    lang = LANGUAGE
+    lang = Translations.chat_language(callback.message.chat.id)
     
-    status = await engine.get_status(chat_id)
+    announcement = await engine.status_text(callback.message.chat.id, lang)
     
-    if not status:
+    if announcement is None:
         await callback.answer(t('no_active_game', lang), show_alert=True)
         return
     
-    last_guess_value = None
-    if status.get('last_guess'):
-        last_guess_value = status['last_guess'].value
-    
-    announcement = Announcer.status_message(
-        status['game'],
-        status.get('active_round'),
-        len(status['all_rounds']),
-        last_guess_value
-    )
-    
     await callback.message.reply(announcement, parse_mode="HTML")
     await callback.answer("📊 Status displayed")
+
+# Dispatch table: action code -> handler(callback, engine, game, round_index)
+CALLBACK_HANDLERS = {
+    CallbackAction.ASK_COST: handle_ask_cost,
+    CallbackAction.PAUSE_ROUND: handle_pause_round,
+    CallbackAction.RESUME_ROUND: handle_resume_round,
+    CallbackAction.CLOSE_ROUND: handle_close_round,
+    CallbackAction.REVEAL: handle_reveal,
+    CallbackAction.CANCEL: handle_cancel,
+    CallbackAction.POST_COST: handle_post_cost,
+    CallbackAction.STATUS: handle_status,
+}
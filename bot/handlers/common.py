@@ -5,6 +5,8 @@ from aiogram.filters import Command
 from aiogram.types import Message
 from bot.services.game_engine import GameEngine
 from bot.services.announcer import Announcer
+from bot.services.merkle import leaf_data
+from bot.translations import Translations
 
 logger = logging.getLogger(__name__)
 
@@ -13,32 +15,52 @@ router = Router()
 @router.message(Command("start"))
 async def cmd_start(message: Message):
     """Handle /start command - show help message."""
-    announcement = Announcer.help_message()
+    announcement = Announcer.help_message(Translations.chat_language(message.chat.id))
     await message.reply(announcement, parse_mode="HTML")
     logger.info(f"User {message.from_user.id} requested help")
 
 @router.message(Command("status"))
 async def cmd_status(message: Message, game_engine: GameEngine):
     """Handle /status command - show current game status."""
+    lang = Translations.chat_language(message.chat.id)
     
-    # Get status for this chat
-    status = await game_engine.get_status(message.chat.id)
+    # Served from the status cache: no database reads unless the game changed
+    announcement = await game_engine.status_text(message.chat.id, lang)
     
-    if not status:
-        await message.reply(Announcer.no_active_game())
+    if announcement is None:
+        await message.reply(Announcer.no_active_game(lang))
         return
     
-    # Extract status information
-    last_guess_value = None
-    if status.get('last_guess'):
-        last_guess_value = status['last_guess'].value
+    await message.reply(announcement, parse_mode="HTML")
+    logger.info(f"Status requested for chat {message.chat.id}")
+
+@router.message(Command("proof"))
+async def cmd_proof(message: Message, game_engine: GameEngine):
+    """Handle /proof command - prove a guess is in its round's Merkle log."""
+    lang = Translations.chat_language(message.chat.id)
     
-    announcement = Announcer.status_message(
-        status['game'],
-        status.get('active_round'),
-        len(status['all_rounds']),
-        last_guess_value
+    # Replying to one of your guesses proves that guess; otherwise your latest one
+    replied = message.reply_to_message
+    guess = await game_engine.db.get_logged_guess(
+        message.chat.id,
+        message.from_user.id,
+        replied.message_id if replied else None
+    )
+    if not guess:
+        await message.reply(Translations.template('log_proof_none', lang))
+        return
+    
+    round_obj = await game_engine.db.get_round(guess.round_id)
+    size, root, path = await game_engine.guess_proof(guess)
+    announcement = Announcer.guess_log_proof(
+        round_obj.round_index,
+        leaf_data(guess.round_id, guess.user_id, guess.value, guess.message_id),
+        guess.log_index,
+        size,
+        root,
+        path,
+        lang
     )
     
     await message.reply(announcement, parse_mode="HTML")
-    logger.info(f"Status requested for chat {message.chat.id}")
+    logger.info(f"Guess log proof for guess {guess.id} requested in chat {message.chat.id}")
@@ -3,6 +3,7 @@ import logging
 from aiogram import Router, F
 from aiogram.types import Message
 from bot.services.game_engine import GameEngine
+from bot.config import STRICT_GUESS_PARSING
 from bot.services.parsing import extract_guess
 from bot.services.validators import (
     validate_guess_range,
@@ -10,7 +11,9 @@ from bot.services.validators import (
     validate_round_status_for_guess
 )
 from bot.services.announcer import Announcer
+from bot.services.outbox import make_announcement
 from bot.storage.models import GameStatus, RoundStatus
+from bot.translations import Translations
 
 logger = logging.getLogger(__name__)
 
@@ -22,10 +25,11 @@ logger.info("Player router initialized")
 @router.message(F.text & ~F.text.startswith('/'), F.chat.type.in_({"group", "supergroup"}))
 async def handle_guess(message: Message, game_engine: GameEngine):
     """Handle player guesses in group chats."""
+    lang = Translations.chat_language(message.chat.id)
     logger.info(f"Received text message from user {message.from_user.id}: {message.text}")
     
     # Extract guess from message
-    guess_value = extract_guess(message.text)
+    guess_value = extract_guess(message.text, strict=STRICT_GUESS_PARSING)
     
     if guess_value is None:
         # Not a guess, ignore
@@ -33,12 +37,11 @@ async def handle_guess(message: Message, game_engine: GameEngine):
         return
     
     logger.info(f"Extracted guess value: {guess_value}")
-    logger.info(f"Extracted guess value: {guess_value}")
     
     # Validate guess range
     if not validate_guess_range(guess_value):
         logger.info(f"Guess {guess_value} is out of range")
-        await message.reply(Announcer.invalid_guess())
+        await message.reply(Announcer.invalid_guess(lang))
         return
     
     # Get active game
@@ -54,7 +57,7 @@ async def handle_guess(message: Message, game_engine: GameEngine):
     # Check game status
     if game.status != GameStatus.ROUND_ACTIVE:
         logger.info(f"Game {game.id} is not in ROUND_ACTIVE status, current: {game.status}")
-        await message.reply(Announcer.not_accepting_guesses())
+        await message.reply(Announcer.not_accepting_guesses(lang))
         return
     
     # Get active round
@@ -66,7 +69,13 @@ async def handle_guess(message: Message, game_engine: GameEngine):
     
     # Check round status
     if not validate_round_status_for_guess(active_round.status):
-        await message.reply(Announcer.not_accepting_guesses())
+        await message.reply(Announcer.not_accepting_guesses(lang))
+        return
+    
+    # Fast path: the hints already rule this number out, so don't spend a write on it
+    if game_engine.is_ruled_out(game.id, guess_value, active_round):
+        low, high = game_engine.known_range(game.id)
+        await message.reply(Announcer.guess_ruled_out(low, high, lang), parse_mode="HTML")
         return
     
     # Check guess limit for this player
@@ -76,7 +85,7 @@ async def handle_guess(message: Message, game_engine: GameEngine):
     )
     
     if not validate_guess_limit(len(user_guesses)):
-        await message.reply(Announcer.guess_limit_reached())
+        await message.reply(Announcer.guess_limit_reached(lang))
         return
     
     # Register the guess
@@ -84,9 +93,15 @@ async def handle_guess(message: Message, game_engine: GameEngine):
         game.id,
         active_round.id,
         message.from_user.id,
-        guess_value
+        guess_value,
+        message.message_id
     )
     
+    if guess is None:
+        # Duplicate delivery of an already registered guess
+        logger.info(f"Ignoring duplicate guess message {message.message_id} in chat {message.chat.id}")
+        return
+    
     logger.info(
         f"Guess registered: user={message.from_user.id}, "
         f"value={guess_value}, correct={is_correct}"
@@ -94,19 +109,16 @@ async def handle_guess(message: Message, game_engine: GameEngine):
     
     # Check if guess is correct (WINNER!)
     if is_correct:
-        await handle_winner(message, game_engine, game, active_round)
+        await handle_winner(message, game_engine, game, active_round, guess, lang)
         return
     
     # Send text hint - reactions are unreliable in groups
     # They're often private or disappear, so use clear text hints
-    if guess_value < game.number:
-        hint = "The number is <b>higher</b> ⬆️"
-    else:
-        hint = "The number is <b>lower</b> ⬇️"
+    hint = Announcer.guess_hint(guess_value, game.number, lang)
     
     await message.reply(hint, parse_mode="HTML")
 
-async def handle_winner(message: Message, engine: GameEngine, game, active_round):
+async def handle_winner(message: Message, engine: GameEngine, game, active_round, guess, lang: str):
     """Handle a winning guess."""
     winner_id = message.from_user.id
     winner_username = message.from_user.username
@@ -114,10 +126,10 @@ async def handle_winner(message: Message, engine: GameEngine, game, active_round
     # Calculate loyalty percentage
     loyalty = await engine.compute_loyalty_for_winner(game.id, winner_id)
     
-    # Mark game as finished
-    await engine.finish_game(game.id, winner_id)
+    # Publish the round's guess log root so the winning position can be proven
+    log = await engine.round_log(active_round.id)
     
-    # Send winner announcement
+    # Winner announcement
     announcement = Announcer.winner_announcement(
         user_id=winner_id,
         username=winner_username,
@@ -126,10 +138,20 @@ async def handle_winner(message: Message, engine: GameEngine, game, active_round
         target_hash=game.target_hash,
         loyalty_percent=loyalty,
         round_index=active_round.round_index,
-        prize_amount=game.prize_amount
+        prize_amount=game.prize_amount,
+        lang=lang,
+        log_index=guess.log_index,
+        log_size=log.size,
+        log_root=log.root().hex()
     )
     
-    await message.reply(announcement, parse_mode="HTML")
+    # Mark game as finished and queue the announcement in the same transaction
+    if not await engine.finish_game(
+        game.id,
+        winner_id,
+        make_announcement(message.chat.id, announcement, None, message.message_id)
+    ):
+        return
     
     logger.info(
         f"Game {game.id} won by user {winner_id} "
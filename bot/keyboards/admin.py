@@ -1,12 +1,22 @@
 """Admin keyboard layouts."""
-import json
+from functools import lru_cache
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from bot.config import get_round_cost
+from bot.keyboards.callback_data import CallbackAction, encode
+
+def _button(text: str, action: CallbackAction, round_index: int = 0) -> InlineKeyboardButton:
+    """Build a button carrying an encoded admin action."""
+    return InlineKeyboardButton(text=text, callback_data=encode(action, round_index))
 
 class AdminKeyboards:
-    """Factory for admin inline keyboards."""
+    """Factory for admin inline keyboards.
+    
+    Keyboards only depend on their kind and round number, so each one is
+    built once and cached.
+    """
     
     @staticmethod
+    @lru_cache(maxsize=256)
     def new_game_controls(next_round: int = 1) -> InlineKeyboardMarkup:
         """
         Keyboard for new game with first round start.
@@ -18,32 +28,17 @@ class AdminKeyboards:
             InlineKeyboardMarkup
         """
         keyboard = [
+            [_button(f"▶️ Start Round {next_round}", CallbackAction.ASK_COST, next_round)],
+            [_button("💰 Post Cost Hint", CallbackAction.POST_COST, next_round)],
             [
-                InlineKeyboardButton(
-                    text=f"▶️ Start Round {next_round}",
-                    callback_data=f'admin:{json.dumps({"a":"ask_cost","n":next_round})}'
-                )
-            ],
-            [
-                InlineKeyboardButton(
-                    text="💰 Post Cost Hint",
-                    callback_data=f'admin:{json.dumps({"a":"post_cost","n":next_round})}'
-                )
-            ],
-            [
-                InlineKeyboardButton(
-                    text="📊 Show Status",
-                    callback_data=f'admin:{json.dumps({"a":"status"})}'
-                ),
-                InlineKeyboardButton(
-                    text="❌ Cancel Game",
-                    callback_data=f'admin:{json.dumps({"a":"cancel"})}'
-                )
+                _button("📊 Show Status", CallbackAction.STATUS),
+                _button("❌ Cancel Game", CallbackAction.CANCEL)
             ]
         ]
         return InlineKeyboardMarkup(inline_keyboard=keyboard)
     
     @staticmethod
+    @lru_cache(maxsize=256)
     def active_round_controls(round_index: int) -> InlineKeyboardMarkup:
         """
         Keyboard for managing an active round.
@@ -56,35 +51,19 @@ class AdminKeyboards:
         """
         keyboard = [
             [
-                InlineKeyboardButton(
-                    text="⏸ Pause Round",
-                    callback_data=f'admin:{json.dumps({"a":"pause_round"})}'
-                ),
-                InlineKeyboardButton(
-                    text="🔒 Close Round",
-                    callback_data=f'admin:{json.dumps({"a":"close_round"})}'
-                )
+                _button("⏸ Pause Round", CallbackAction.PAUSE_ROUND),
+                _button("🔒 Close Round", CallbackAction.CLOSE_ROUND)
             ],
             [
-                InlineKeyboardButton(
-                    text="🔓 Reveal Number",
-                    callback_data=f'admin:{json.dumps({"a":"reveal"})}'
-                ),
-                InlineKeyboardButton(
-                    text="📊 Show Status",
-                    callback_data=f'admin:{json.dumps({"a":"status"})}'
-                )
+                _button("🔓 Reveal Number", CallbackAction.REVEAL),
+                _button("📊 Show Status", CallbackAction.STATUS)
             ],
-            [
-                InlineKeyboardButton(
-                    text="❌ Cancel Game",
-                    callback_data=f'admin:{json.dumps({"a":"cancel"})}'
-                )
-            ]
+            [_button("❌ Cancel Game", CallbackAction.CANCEL)]
         ]
         return InlineKeyboardMarkup(inline_keyboard=keyboard)
     
     @staticmethod
+    @lru_cache(maxsize=256)
     def paused_round_controls(round_index: int) -> InlineKeyboardMarkup:
         """
         Keyboard for a paused round.
@@ -97,35 +76,19 @@ class AdminKeyboards:
         """
         keyboard = [
             [
-                InlineKeyboardButton(
-                    text="▶️ Resume Round",
-                    callback_data=f'admin:{json.dumps({"a":"resume_round"})}'
-                ),
-                InlineKeyboardButton(
-                    text="🔒 Close Round",
-                    callback_data=f'admin:{json.dumps({"a":"close_round"})}'
-                )
+                _button("▶️ Resume Round", CallbackAction.RESUME_ROUND),
+                _button("🔒 Close Round", CallbackAction.CLOSE_ROUND)
             ],
             [
-                InlineKeyboardButton(
-                    text="🔓 Reveal Number",
-                    callback_data=f'admin:{json.dumps({"a":"reveal"})}'
-                ),
-                InlineKeyboardButton(
-                    text="📊 Show Status",
-                    callback_data=f'admin:{json.dumps({"a":"status"})}'
-                )
+                _button("🔓 Reveal Number", CallbackAction.REVEAL),
+                _button("📊 Show Status", CallbackAction.STATUS)
             ],
-            [
-                InlineKeyboardButton(
-                    text="❌ Cancel Game",
-                    callback_data=f'admin:{json.dumps({"a":"cancel"})}'
-                )
-            ]
+            [_button("❌ Cancel Game", CallbackAction.CANCEL)]
         ]
         return InlineKeyboardMarkup(inline_keyboard=keyboard)
     
     @staticmethod
+    @lru_cache(maxsize=256)
     def between_rounds_controls(next_round: int) -> InlineKeyboardMarkup:
         """
         Keyboard between rounds (after closing a round).
@@ -137,34 +100,12 @@ class AdminKeyboards:
             InlineKeyboardMarkup
         """
         keyboard = [
+            [_button(f"▶️ Start Round {next_round}", CallbackAction.ASK_COST, next_round)],
+            [_button("💰 Post Cost Hint", CallbackAction.POST_COST, next_round)],
             [
-                InlineKeyboardButton(
-                    text=f"▶️ Start Round {next_round}",
-                    callback_data=f'admin:{json.dumps({"a":"ask_cost","n":next_round})}'
-                )
-            ],
-            [
-                InlineKeyboardButton(
-                    text="💰 Post Cost Hint",
-                    callback_data=f'admin:{json.dumps({"a":"post_cost","n":next_round})}'
-                )
-            ],
-            [
-                InlineKeyboardButton(
-                    text="🔓 Reveal Number",
-                    callback_data=f'admin:{json.dumps({"a":"reveal"})}'
-                ),
-                InlineKeyboardButton(
-                    text="📊 Show Status",
-                    callback_data=f'admin:{json.dumps({"a":"status"})}'
-                )
+                _button("🔓 Reveal Number", CallbackAction.REVEAL),
+                _button("📊 Show Status", CallbackAction.STATUS)
             ],
-            [
-                InlineKeyboardButton(
-                    text="❌ Cancel Game",
-                    callback_data=f'admin:{json.dumps({"a":"cancel"})}'
-                )
-            ]
+            [_button("❌ Cancel Game", CallbackAction.CANCEL)]
         ]
         return InlineKeyboardMarkup(inline_keyboard=keyboard)
-
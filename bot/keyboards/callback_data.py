@@ -0,0 +1,86 @@
+"""Compact, versioned and HMAC-tagged callback_data codec for admin buttons."""
+import base64
+import hashlib
+import hmac
+import struct
+from enum import IntEnum
+from typing import Tuple
+from bot.config import BOT_TOKEN
+
+# Every encoded payload starts with this prefix (used by the router filter)
+CALLBACK_PREFIX = "g:"
+
+# Bump when the binary layout changes; old buttons then fail to decode
+CODEC_VERSION = 1
+
+# Layout: version (u8), action (u8), round index (u32)
+_PAYLOAD = struct.Struct("!BBI")
+_TAG_SIZE = 6
+
+# Key is derived from the bot token so payloads can't be forged by clients
+_KEY = hashlib.sha256(b"callback-data:" + BOT_TOKEN.encode()).digest()
+
+class CallbackAction(IntEnum):
+    """Short action codes for admin buttons."""
+    ASK_COST = 1
+    PAUSE_ROUND = 2
+    RESUME_ROUND = 3
+    CLOSE_ROUND = 4
+    REVEAL = 5
+    CANCEL = 6
+    POST_COST = 7
+    STATUS = 8
+
+def _tag(payload: bytes) -> bytes:
+    """Compute the truncated HMAC tag for a payload."""
+    return hmac.new(_KEY, payload, hashlib.sha256).digest()[:_TAG_SIZE]
+
+def encode(action: CallbackAction, round_index: int = 0) -> str:
+    """
+    Encode an admin action into callback_data.
+    
+    Args:
+        action: The button action
+        round_index: Optional round number carried by the button
+        
+    Returns:
+        Encoded callback_data string (18 characters)
+    """
+    payload = _PAYLOAD.pack(CODEC_VERSION, action, round_index)
+    raw = payload + _tag(payload)
+    return CALLBACK_PREFIX + base64.urlsafe_b64encode(raw).decode("ascii")
+
+def decode(data: str) -> Tuple[CallbackAction, int]:
+    """
+    Decode and authenticate callback_data produced by ``encode``.
+    
+    Args:
+        data: The callback_data string
+        
+    Returns:
+        Tuple of (action, round_index)
+        
+    Raises:
+        ValueError: If the data is malformed, from another codec version,
+            carries an unknown action or fails the HMAC check
+    """
+    if not data.startswith(CALLBACK_PREFIX):
+        raise ValueError("Unknown callback prefix")
+    
+    try:
+        raw = base64.urlsafe_b64decode(data[len(CALLBACK_PREFIX):])
+    except (ValueError, TypeError) as e:
+        raise ValueError("Malformed callback data") from e
+    
+    if len(raw) != _PAYLOAD.size + _TAG_SIZE:
+        raise ValueError("Malformed callback data")
+    
+    payload, tag = raw[:_PAYLOAD.size], raw[_PAYLOAD.size:]
+    if not hmac.compare_digest(tag, _tag(payload)):
+        raise ValueError("Invalid callback signature")
+    
+    version, action, round_index = _PAYLOAD.unpack(payload)
+    if version != CODEC_VERSION:
+        raise ValueError(f"Unsupported callback version {version}")
+    
+    return CallbackAction(action), round_index
@@ -1,28 +1,140 @@
 """Main bot entry point."""
 import asyncio
 import logging
-from aiogram import Bot, Dispatcher
+from typing import Optional
+from aiogram import Bot, Dispatcher, Router
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 
-from bot.config import BOT_TOKEN, DATABASE_PATH, LOG_LEVEL
+from bot.config import (
+    BOT_TOKEN,
+    DATABASE_PATH,
+    STORAGE_BACKEND,
+    MEMORY_SNAPSHOT_PATH,
+    MEMORY_SNAPSHOT_SECONDS,
+    LOG_LEVEL,
+    STATUS_DEBOUNCE_MS,
+    PENDING_INPUT_PERSIST,
+    DEDUPE_WINDOW_SIZE,
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_POLL_SECONDS,
+    OUTBOX_MAX_ATTEMPTS,
+    GUESS_RATE_PER_SECOND,
+    GUESS_BURST,
+    GUESS_COOLDOWN_SECONDS,
+    GUESS_RATE_WARN,
+    COMMITMENT_POOL_SIZE,
+    COMMITMENT_POOL_REFILL_AT,
+    HEALTH_HOST,
+    HEALTH_PORT,
+    LOOP_LAG_THRESHOLD_MS,
+    READY_MAX_OUTBOX,
+    READY_MAX_UPDATE_AGE_SECONDS,
+    DB_TRACE,
+    DB_SLOW_QUERY_MS,
+    DB_TRACE_WINDOW,
+    PROFILE_DIR,
+    PROFILE_INTERVAL_MS,
+    PROFILE_MAX_SECONDS,
+    SHUTDOWN_TIMEOUT_SECONDS
+)
 from bot.storage.db import Database
+from bot.storage.memory import MemoryDatabase
+from bot.storage.tracing import QueryTracer
 from bot.services.game_engine import GameEngine
+from bot.services.announcer import Announcer
+from bot.services.outbox import OutboxDispatcher
+from bot.services.commitment_pool import CommitmentPool
+from bot.services.health import LoopWatchdog, HealthServer
+from bot.services.profiler import SamplingProfiler
+from bot.services.shutdown import ShutdownCoordinator
+from bot.translations import Translations
 from bot.utils.logging import setup_logging
 from bot.handlers import admin, player, common
+from bot.middlewares.activity import UpdateActivityMiddleware
+from bot.middlewares.dedupe import DedupeMiddleware
+from bot.middlewares.inflight import InFlightMiddleware
+from bot.middlewares.prefilter import GuessPrefilterMiddleware
+from bot.middlewares.throttling import GuessThrottleMiddleware
+from bot.services.rate_limit import TokenBucketLimiter
 
 logger = logging.getLogger(__name__)
 
+def _fresh_router(template: Router) -> Router:
+    """
+    Copy a handler module's router for one dispatcher.
+    
+    A router can only be attached to one dispatcher, and middlewares added
+    to a shared router would stack up with each dispatcher (replays and
+    tests build several in one process). The module routers only collect
+    handlers; every dispatcher gets copies of them.
+    """
+    router = Router(name=template.name)
+    for event_name, observer in template.observers.items():
+        router.observers[event_name].handlers.extend(observer.handlers)
+    return router
+
+def setup_dispatcher(
+    dp: Dispatcher,
+    limiter: Optional[TokenBucketLimiter] = None,
+    health: Optional[HealthServer] = None,
+    shutdown: Optional[ShutdownCoordinator] = None
+):
+    """
+    Register middlewares and routers on the dispatcher.
+    
+    Args:
+        dp: The dispatcher
+        limiter: Per-user guess rate limiter; guesses are not throttled if None
+        health: Health server to report update arrivals to
+        shutdown: Shutdown coordinator that waits for updates being handled
+    """
+    if health:
+        dp.update.outer_middleware(UpdateActivityMiddleware(health))
+    if shutdown:
+        dp.update.outer_middleware(InFlightMiddleware(shutdown))
+    # Skip redelivered updates (reconnects, webhook retries) before any router runs
+    dp.update.outer_middleware(DedupeMiddleware(DEDUPE_WINDOW_SIZE))
+    
+    # Register routers (order matters - more specific first)
+    player_router = _fresh_router(player.router)
+    dp.include_router(_fresh_router(admin.router))
+    dp.include_router(_fresh_router(common.router))
+    dp.include_router(player_router)  # Last, as it catches all text messages
+    
+    # Drop chatter from chats without an active round before the player router runs
+    player_router.message.outer_middleware(GuessPrefilterMiddleware())
+    # Then throttle flooders before any parsing or database work
+    if limiter is not None:
+        player_router.message.outer_middleware(GuessThrottleMiddleware(limiter, warn=GUESS_RATE_WARN))
+
 async def main():
     """Main bot function."""
     # Setup logging
     setup_logging(LOG_LEVEL)
     logger.info("Starting Telegram Game Bot...")
     
-    # Initialize database
-    db = Database(DATABASE_PATH)
-    await db.init_db()
-    logger.info(f"Database initialized at {DATABASE_PATH}")
+    # Initialize storage: SQLite, or memory-first with optional snapshots
+    tracer = None
+    memory = None
+    if STORAGE_BACKEND == "memory":
+        db = memory = MemoryDatabase(MEMORY_SNAPSHOT_PATH or None, MEMORY_SNAPSHOT_SECONDS)
+        await db.init_db()
+        logger.info(f"In-memory storage initialized (snapshot: {MEMORY_SNAPSHOT_PATH or 'none'})")
+    else:
+        tracer = QueryTracer(DB_SLOW_QUERY_MS, DB_TRACE_WINDOW) if DB_TRACE else None
+        db = Database(DATABASE_PATH, tracer=tracer)
+        await db.init_db()
+        logger.info(f"Database initialized at {DATABASE_PATH}")
+    
+    # Load per-chat language settings and pre-render static templates
+    Translations.load_chat_languages(await db.get_chat_languages())
+    Announcer.warm_up()
+    
+    # Persist pending admin inputs so they survive restarts
+    if PENDING_INPUT_PERSIST:
+        admin.pending_round_starts.attach(db)
+        await admin.pending_round_starts.load()
     
     # Initialize bot and dispatcher
     bot = Bot(
@@ -31,26 +143,93 @@ async def main():
     )
     dp = Dispatcher()
     
-    # Initialize game engine with bot instance for auto-close announcements
-    game_engine = GameEngine(db, bot)
+    # Outbox dispatcher delivers announcements committed with state changes
+    outbox = OutboxDispatcher(
+        db,
+        bot,
+        batch_size=OUTBOX_BATCH_SIZE,
+        poll_interval=OUTBOX_POLL_SECONDS,
+        max_attempts=OUTBOX_MAX_ATTEMPTS
+    )
+    
+    # Pre-generated commitments make /newgame a single pop
+    commitments = None
+    if COMMITMENT_POOL_SIZE > 0:
+        commitments = CommitmentPool(db, COMMITMENT_POOL_SIZE, COMMITMENT_POOL_REFILL_AT)
+    
+    # Initialize game engine with bot instance and outbox for announcements
+    game_engine = GameEngine(
+        db,
+        bot,
+        outbox,
+        commitments=commitments,
+        status_debounce=STATUS_DEBOUNCE_MS / 1000
+    )
+    await game_engine.load_active_round_chats()
+    await game_engine.restore_round_timers()
     logger.info("Game engine initialized")
     
-    # Register routers (order matters - more specific first)
-    dp.include_router(admin.router)
-    dp.include_router(common.router)
-    dp.include_router(player.router)  # Last, as it catches all text messages
+    # Sampling profiler: idle until an admin asks for a profile
+    profiler = SamplingProfiler(PROFILE_DIR, PROFILE_INTERVAL_MS / 1000, max_seconds=PROFILE_MAX_SECONDS)
     
+    # Loop lag watchdog, and the local health/readiness endpoints for the orchestrator
+    watchdog = LoopWatchdog(threshold=LOOP_LAG_THRESHOLD_MS / 1000)
+    health = None
+    if HEALTH_PORT:
+        health = HealthServer(
+            game_engine,
+            watchdog,
+            HEALTH_HOST,
+            HEALTH_PORT,
+            max_outbox_depth=READY_MAX_OUTBOX,
+            max_update_age=READY_MAX_UPDATE_AGE_SECONDS
+        )
+        if tracer:
+            health.add_metrics(tracer.prometheus)
+        health.add_metrics(game_engine.events.prometheus)
+        health.app.router.add_get("/profile", profiler.handle_profile)
+    
+    # Drains in-flight work when polling stops (SIGTERM during a rolling deploy)
+    shutdown = ShutdownCoordinator(game_engine, outbox, health, SHUTDOWN_TIMEOUT_SECONDS)
+    
+    setup_dispatcher(
+        dp,
+        TokenBucketLimiter(GUESS_RATE_PER_SECOND, GUESS_BURST, GUESS_COOLDOWN_SECONDS),
+        health,
+        shutdown
+    )
     logger.info("Routers registered")
     
     # Start polling - pass game_engine as workflow_data
     try:
+        watchdog.start()
+        if memory:
+            memory.start()
+        if health:
+            await health.start()
+        outbox.start()
+        game_engine.events.start()
+        if commitments:
+            commitments.start()
         logger.info("Bot started successfully! Polling for updates...")
         await dp.start_polling(
             bot, 
             allowed_updates=dp.resolve_used_update_types(),
-            game_engine=game_engine  # Pass as keyword argument to workflow_data
+            close_bot_session=False,  # The outbox still sends while draining
+            game_engine=game_engine,  # Pass as keyword argument to workflow_data
+            profiler=profiler
         )
     finally:
+        await shutdown.shutdown()
+        await outbox.stop()
+        await game_engine.events.stop()
+        if commitments:
+            await commitments.stop()
+        if health:
+            await health.stop()
+        await watchdog.stop()
+        if memory:
+            await memory.stop()  # Final snapshot, after the drain
         await bot.session.close()
 
 if __name__ == "__main__":
@@ -0,0 +1,19 @@
+"""Record when updates arrive, for the readiness probe."""
+from typing import Any, Awaitable, Callable, Dict
+from aiogram import BaseMiddleware
+from aiogram.types import Update
+
+class UpdateActivityMiddleware(BaseMiddleware):
+    """Outer update middleware that stamps the health server's last-update time."""
+    
+    def __init__(self, health):
+        self.health = health
+    
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any]
+    ) -> Any:
+        self.health.mark_update()
+        return await handler(event, data)
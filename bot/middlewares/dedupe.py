@@ -0,0 +1,65 @@
+"""Drop redelivered Telegram updates before they reach any router."""
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from aiogram import BaseMiddleware
+from aiogram.types import Update
+
+logger = logging.getLogger(__name__)
+
+class RecentKeys:
+    """Bounded LRU set of recently seen keys."""
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._keys: "OrderedDict[Hashable, None]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._keys
+    
+    def add(self, key: Hashable) -> bool:
+        """
+        Record a key.
+        
+        Returns:
+            True if the key is new, False if it was already present
+        """
+        if key in self._keys:
+            self._keys.move_to_end(key)
+            return False
+        self._keys[key] = None
+        if len(self._keys) > self.max_size:
+            self._keys.popitem(last=False)
+        return True
+
+class DedupeMiddleware(BaseMiddleware):
+    """
+    Outer update middleware that makes update processing idempotent.
+    
+    An update is skipped if its ``update_id`` or, for messages, its
+    ``(chat_id, message_id)`` pair was seen within the window. The
+    database enforces the same guarantee for guesses through a unique
+    message id constraint, which also covers restarts.
+    """
+    
+    def __init__(self, window_size: int):
+        self.recent = RecentKeys(window_size)
+    
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any]
+    ) -> Any:
+        is_new = self.recent.add(("u", event.update_id))
+        if event.message is not None:
+            is_new = self.recent.add(("m", event.message.chat.id, event.message.message_id)) and is_new
+        
+        if not is_new:
+            logger.debug(f"Skipping duplicate update {event.update_id}")
+            return None
+        
+        return await handler(event, data)
@@ -0,0 +1,24 @@
+"""Track updates being handled, so shutdown can wait for them."""
+from typing import Any, Awaitable, Callable, Dict
+from aiogram import BaseMiddleware
+from aiogram.types import Update
+
+class InFlightMiddleware(BaseMiddleware):
+    """Outer update middleware reporting handler start and end to the shutdown coordinator."""
+    
+    def __init__(self, coordinator):
+        self.coordinator = coordinator
+    
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any]
+    ) -> Any:
+        chat = data.get("event_chat")
+        chat_id = chat.id if chat else None
+        self.coordinator.update_started(chat_id)
+        try:
+            return await handler(event, data)
+        finally:
+            self.coordinator.update_finished(chat_id)
@@ -0,0 +1,33 @@
+"""Cheap pre-filter that drops chatter before the player router resolves handlers."""
+import logging
+from typing import Any, Awaitable, Callable, Dict
+from aiogram import BaseMiddleware
+from aiogram.types import Message
+from bot.services.parsing import contains_digit
+
+logger = logging.getLogger(__name__)
+
+class GuessPrefilterMiddleware(BaseMiddleware):
+    """
+    Outer middleware for the player router.
+    
+    Drops messages from chats without an active (or paused) round and
+    messages that contain no digit in any supported script, before any
+    filter, handler or logging runs. Both checks are O(1)/O(len(text))
+    and touch neither the database nor the logger.
+    """
+    
+    async def __call__(
+        self,
+        handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
+        event: Message,
+        data: Dict[str, Any]
+    ) -> Any:
+        game_engine = data.get("game_engine")
+        if game_engine is not None and event.chat.id not in game_engine.active_round_chats:
+            return None
+        
+        if not event.text or not contains_digit(event.text):
+            return None
+        
+        return await handler(event, data)
@@ -0,0 +1,42 @@
+"""Per-user flood protection for the guess pipeline."""
+import logging
+from typing import Any, Awaitable, Callable, Dict
+from aiogram import BaseMiddleware
+from aiogram.types import Message
+from bot.services.rate_limit import TokenBucketLimiter
+from bot.translations import Translations
+
+logger = logging.getLogger(__name__)
+
+class GuessThrottleMiddleware(BaseMiddleware):
+    """
+    Outer middleware for the player router.
+    
+    Applies a per-(chat, user) token bucket before parsing or any database
+    work. Over-limit messages are dropped; if ``warn`` is set, the user gets
+    a single warning per cooldown.
+    """
+    
+    def __init__(self, limiter: TokenBucketLimiter, warn: bool = True):
+        self.limiter = limiter
+        self.warn = warn
+    
+    async def __call__(
+        self,
+        handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
+        event: Message,
+        data: Dict[str, Any]
+    ) -> Any:
+        if event.from_user is None:
+            return await handler(event, data)
+        
+        allowed, should_warn = self.limiter.check((event.chat.id, event.from_user.id))
+        if allowed:
+            return await handler(event, data)
+        
+        if should_warn:
+            logger.info(f"Rate limiting user {event.from_user.id} in chat {event.chat.id}")
+            if self.warn:
+                lang = Translations.chat_language(event.chat.id)
+                await event.reply(Translations.get('slow_down', lang))
+        return None
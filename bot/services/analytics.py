@@ -0,0 +1,359 @@
+"""Vectorized guess-distribution analytics.
+
+Guess columns are loaded in chunks, from the database or from a CSV export,
+into NumPy arrays. Every statistic is then computed with array operations
+instead of per-row Python loops, so reports over millions of guesses take
+seconds.
+
+Usage:
+    python -m bot.services.analytics [--db PATH | --csv PATH] [--chat ID] [--game ID]
+                                     [--bins N] [--export PATH]
+
+NumPy is an optional dependency: without it ``available()`` is False and the
+admin command reports that analytics are unavailable.
+"""
+import argparse
+import asyncio
+import csv
+import itertools
+import time
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency
+    np = None
+
+from bot.config import DATABASE_PATH, MIN_NUMBER, MAX_NUMBER
+
+# Column order shared by ``Database.iter_guess_rows`` and CSV exports
+EXPORT_HEADER = ("id", "game_id", "round_id", "round_index", "user_id", "value", "number")
+
+DEFAULT_CHUNK_SIZE = 50000
+
+def available() -> bool:
+    """Check whether NumPy is installed."""
+    return np is not None
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("NumPy is required for analytics (pip install numpy)")
+
+class GuessColumns:
+    """Guess table as parallel int64 arrays, one per ``EXPORT_HEADER`` column."""
+    __slots__ = EXPORT_HEADER
+    
+    def __init__(self, matrix):
+        for index, name in enumerate(EXPORT_HEADER):
+            setattr(self, name, matrix[:, index])
+    
+    def __len__(self) -> int:
+        return len(self.id)
+    
+    @classmethod
+    def from_blocks(cls, blocks: Sequence) -> "GuessColumns":
+        """Build columns from ``(n, 7)`` chunk arrays, sorted by guess ID."""
+        _require_numpy()
+        if blocks:
+            matrix = np.concatenate(blocks)
+        else:
+            matrix = np.empty((0, len(EXPORT_HEADER)), dtype=np.int64)
+        matrix = matrix[np.argsort(matrix[:, 0], kind="stable")]
+        return cls(matrix)
+    
+    def select(self, mask) -> "GuessColumns":
+        """Get the rows where ``mask`` is true."""
+        return GuessColumns(np.column_stack([getattr(self, name)[mask] for name in EXPORT_HEADER]))
+
+async def load_from_db(
+    db,
+    chat_id: Optional[int] = None,
+    game_id: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> GuessColumns:
+    """Load guess columns from the database in chunks."""
+    _require_numpy()
+    blocks = []
+    async for rows in db.iter_guess_rows(chat_id, game_id, chunk_size):
+        blocks.append(np.array(rows, dtype=np.int64))
+    return GuessColumns.from_blocks(blocks)
+
+def load_from_csv(path: str, game_id: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> GuessColumns:
+    """
+    Load guess columns from a CSV export in chunks.
+    
+    The file needs a header row containing every ``EXPORT_HEADER`` column;
+    extra columns are ignored.
+    """
+    _require_numpy()
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        missing = [name for name in EXPORT_HEADER if name not in header]
+        if missing:
+            raise ValueError(f"{path}: missing columns {', '.join(missing)}")
+        indices = [header.index(name) for name in EXPORT_HEADER]
+        
+        blocks = []
+        while True:
+            chunk = list(itertools.islice(reader, chunk_size))
+            if not chunk:
+                break
+            blocks.append(np.array(chunk, dtype=np.int64)[:, indices])
+    
+    columns = GuessColumns.from_blocks(blocks)
+    if game_id is not None:
+        columns = columns.select(columns.game_id == game_id)
+    return columns
+
+async def export_csv(
+    db,
+    path: str,
+    chat_id: Optional[int] = None,
+    game_id: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> int:
+    """
+    Export guesses to a CSV archive readable by ``load_from_csv``.
+    
+    Returns:
+        Number of rows written
+    """
+    count = 0
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_HEADER)
+        async for rows in db.iter_guess_rows(chat_id, game_id, chunk_size):
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+def value_histogram(values, bins: int) -> Tuple:
+    """
+    Count guesses per number over ``MIN_NUMBER..MAX_NUMBER``, grouped into bins.
+    
+    Returns:
+        Tuple of (bin lower edges, counts per bin, bin width, counts per number)
+    """
+    span = MAX_NUMBER - MIN_NUMBER + 1
+    per_number = np.bincount(np.clip(values - MIN_NUMBER, 0, span - 1), minlength=span)
+    
+    width = -(-span // bins)
+    padded = np.zeros(width * bins, dtype=np.int64)
+    padded[:span] = per_number
+    counts = padded.reshape(bins, width).sum(axis=1)
+    edges = MIN_NUMBER + np.arange(bins) * width
+    return edges, counts, width, per_number
+
+def _grouped_running(candidates, group_index, span: int):
+    """Running maximum of ``candidates`` (in ``0..span``) restarting at each group."""
+    offset = group_index * (span + 1)
+    return np.maximum.accumulate(candidates + offset) - offset
+
+def search_intervals(columns: GuessColumns) -> Tuple:
+    """
+    Replay the higher/lower hints of every game in one pass.
+    
+    Guesses are ordered by game then ID, and the known interval is a running
+    max/min of the bounds each hint implies, restarted per game with offsets
+    so a single ``np.maximum.accumulate`` covers all games.
+    
+    Returns:
+        Tuple of (order, low before, high before, low after, high after);
+        ``order`` maps the result positions back to ``columns`` rows
+    """
+    order = np.lexsort((columns.id, columns.game_id))
+    games = columns.game_id[order]
+    values = columns.value[order]
+    targets = columns.number[order]
+    
+    span = MAX_NUMBER - MIN_NUMBER + 1
+    group_index = np.unique(games, return_inverse=True)[1].reshape(-1)
+    
+    # Bounds relative to MIN_NUMBER; the upper bound is mirrored so both use a running max
+    low_candidates = np.where(values < targets, values + 1 - MIN_NUMBER, 0)
+    high_candidates = np.where(values > targets, MAX_NUMBER - values + 1, 0)
+    low_after = _grouped_running(low_candidates, group_index, span) + MIN_NUMBER
+    high_after = MAX_NUMBER - _grouped_running(high_candidates, group_index, span)
+    
+    # The interval before a guess is the one after the previous guess of the same game
+    starts = np.ones(len(order), dtype=bool)
+    starts[1:] = games[1:] != games[:-1]
+    low_before = np.roll(low_after, 1)
+    high_before = np.roll(high_after, 1)
+    low_before[starts] = MIN_NUMBER
+    high_before[starts] = MAX_NUMBER
+    return order, low_before, high_before, low_after, high_after
+
+class AnalyticsReport:
+    """Aggregated guess statistics for a chat, a game or an export."""
+    __slots__ = (
+        "total_guesses", "games", "players", "bin_edges", "bin_counts", "bin_width",
+        "top_numbers", "rounds", "top_players", "wasted_guesses", "elapsed",
+    )
+    
+    def __init__(self):
+        self.total_guesses = 0
+        self.games = 0
+        self.players = 0
+        self.bin_edges: List[int] = []
+        self.bin_counts: List[int] = []
+        self.bin_width = 0
+        self.top_numbers: List[Tuple[int, int]] = []  # (number, times guessed)
+        self.rounds: List[Tuple[int, float, float]] = []  # (round index, avg guesses, median numbers left)
+        self.top_players: List[Tuple[int, int, float, int]] = []  # (user ID, guesses, bits/guess, wasted)
+        self.wasted_guesses = 0
+        self.elapsed = 0.0
+
+def build_report(
+    columns: GuessColumns,
+    bins: int = 20,
+    top: int = 5,
+    min_player_guesses: int = 3
+) -> AnalyticsReport:
+    """
+    Compute histograms, per-round convergence and per-player efficiency.
+    
+    Efficiency is the information a player's guesses extracted, in bits per
+    guess: ``log2(width before / width after)`` of the known interval.
+    Guesses outside the interval already known when they were made are
+    counted as wasted.
+    
+    Args:
+        columns: Guess columns to analyze
+        bins: Number of histogram bins over the number range
+        top: How many numbers and players to list
+        min_player_guesses: Minimum guesses for a player to be ranked
+    """
+    _require_numpy()
+    started = time.perf_counter()
+    report = AnalyticsReport()
+    if not len(columns):
+        return report
+    
+    report.total_guesses = int(len(columns))
+    report.games = int(len(np.unique(columns.game_id)))
+    
+    # Distribution of guessed numbers
+    edges, counts, width, per_number = value_histogram(columns.value, bins)
+    report.bin_edges = edges.tolist()
+    report.bin_counts = counts.tolist()
+    report.bin_width = int(width)
+    hottest = np.argsort(per_number, kind="stable")[::-1][:top]
+    report.top_numbers = [
+        (int(i) + MIN_NUMBER, int(per_number[i])) for i in hottest if per_number[i] > 0
+    ]
+    
+    # Interval convergence, replayed for every game at once
+    order, low_before, high_before, low_after, high_after = search_intervals(columns)
+    width_before = np.maximum(high_before - low_before + 1, 1)
+    width_after = np.maximum(high_after - low_after + 1, 1)
+    values = columns.value[order]
+    wasted = (values < low_before) | (values > high_before)
+    report.wasted_guesses = int(wasted.sum())
+    
+    # Per (game, round): guess count and interval width after its last guess
+    games = columns.game_id[order]
+    round_index = columns.round_index[order]
+    ends = np.ones(len(order), dtype=bool)
+    ends[:-1] = (games[1:] != games[:-1]) | (round_index[1:] != round_index[:-1])
+    end_positions = np.flatnonzero(ends)
+    guesses_per_round = np.diff(np.concatenate(([-1], end_positions)))
+    round_of_group = round_index[end_positions]
+    width_of_group = width_after[end_positions]
+    for index in np.unique(round_of_group):
+        in_round = round_of_group == index
+        report.rounds.append((
+            int(index),
+            float(guesses_per_round[in_round].mean()),
+            float(np.median(width_of_group[in_round])),
+        ))
+    
+    # Per-player efficiency
+    users, user_index = np.unique(columns.user_id[order], return_inverse=True)
+    user_index = user_index.reshape(-1)
+    report.players = int(len(users))
+    bits = np.log2(width_before / width_after)
+    guess_counts = np.bincount(user_index)
+    bits_per_guess = np.bincount(user_index, weights=bits) / guess_counts
+    wasted_counts = np.bincount(user_index, weights=wasted).astype(np.int64)
+    ranked = np.flatnonzero(guess_counts >= min_player_guesses)
+    ranked = ranked[np.argsort(-bits_per_guess[ranked], kind="stable")][:top]
+    report.top_players = [
+        (int(users[i]), int(guess_counts[i]), float(bits_per_guess[i]), int(wasted_counts[i]))
+        for i in ranked
+    ]
+    
+    report.elapsed = time.perf_counter() - started
+    return report
+
+def heatmap_lines(report: AnalyticsReport, bar_width: int = 20) -> List[str]:
+    """Render the histogram as text bars, one line per bin."""
+    peak = max(report.bin_counts, default=0) or 1
+    last = MAX_NUMBER
+    lines = []
+    for low, count in zip(report.bin_edges, report.bin_counts):
+        high = min(low + report.bin_width - 1, last)
+        bar = "█" * round(bar_width * count / peak)
+        lines.append(f"{low:>5}-{high:<5} {bar} {count}")
+    return lines
+
+def format_text(report: AnalyticsReport) -> str:
+    """Format a report as plain text for the command line."""
+    lines = [
+        f"Guesses: {report.total_guesses}  Games: {report.games}  Players: {report.players}",
+        f"Ruled-out guesses: {report.wasted_guesses}",
+        "",
+        "Distribution:",
+        *heatmap_lines(report),
+        "",
+        "Most guessed: " + ", ".join(f"{n} ({c})" for n, c in report.top_numbers),
+        "",
+        "Convergence by round (avg guesses, median numbers left):",
+        *(f"  round {i}: {g:.1f}, {w:.0f}" for i, g, w in report.rounds),
+        "",
+        "Most efficient players (guesses, bits/guess, wasted):",
+        *(f"  {u}: {g}, {b:.2f}, {w}" for u, g, b, w in report.top_players),
+        "",
+        f"Computed in {report.elapsed * 1000:.1f} ms",
+    ]
+    return "\n".join(lines)
+
+async def _main(args: argparse.Namespace):
+    from bot.storage.db import Database
+    
+    started = time.perf_counter()
+    if args.export:
+        count = await export_csv(Database(args.db), args.export, args.chat, args.game, args.chunk_size)
+        print(f"Exported {count} guesses to {args.export}")
+        return
+    
+    if args.csv:
+        columns = load_from_csv(args.csv, args.game, args.chunk_size)
+    else:
+        columns = await load_from_db(Database(args.db), args.chat, args.game, args.chunk_size)
+    loaded = time.perf_counter()
+    
+    report = build_report(columns, bins=args.bins, top=args.top)
+    print(format_text(report))
+    print(f"Loaded {len(columns)} guesses in {(loaded - started) * 1000:.1f} ms")
+
+def main(argv: Optional[Iterable[str]] = None):
+    parser = argparse.ArgumentParser(description="Guess distribution analytics")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--db", default=DATABASE_PATH, help="SQLite database (default: DATABASE_PATH)")
+    source.add_argument("--csv", help="CSV export to analyze instead of the database")
+    parser.add_argument("--chat", type=int, help="Only guesses from this chat")
+    parser.add_argument("--game", type=int, help="Only guesses from this game")
+    parser.add_argument("--bins", type=int, default=20, help="Histogram bins")
+    parser.add_argument("--top", type=int, default=10, help="Numbers and players to list")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--export", metavar="PATH", help="Write the selected guesses to a CSV and exit")
+    args = parser.parse_args(argv)
+    
+    if not args.export:
+        _require_numpy()
+    asyncio.run(_main(args))
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,99 @@
 """Announcer service for formatting game messages."""
-from typing import Optional
-from bot.storage.models import Game, Round, Guess
+import html
+from typing import Any, Dict, List, Optional
+from bot.storage.models import Game, Round, Guess, RoundSummary
+from bot.services.analytics import AnalyticsReport, heatmap_lines
 from bot.services.commit_reveal import verify
+from bot.services.profiler import ProfileReport
 from bot.translations import Translations
-from bot.config import LANGUAGE
+from bot.config import LANGUAGE, SUPPORTED_LANGUAGES
+
+# Static blocks rendered once per language (empty string = blank line)
+_RULES_BLOCK = (
+    'rules_title',
+    'rule_range',
+    'rule_guesses',
+    'rule_duration',
+    'rule_hints',
+    'rule_winner',
+    'rule_loyalty',
+    '',
+    'start_button_prompt',
+)
+
+_ROUND_FOOTER_BLOCK = (
+    'range',
+    'guess_limit',
+    '',
+    'good_luck',
+)
+
+_HELP_BLOCK = (
+    'help_title',
+    '',
+    'how_to_play',
+    'help_step1',
+    'help_step2',
+    'help_step3',
+    'help_step4',
+    'help_step5',
+    'help_step6',
+    '',
+    'loyalty_title',
+    'loyalty_rule1',
+    'loyalty_rule2',
+    'loyalty_rule3',
+    'loyalty_rule4',
+    '',
+    'commands_title',
+    'cmd_start',
+    'cmd_status',
+    'cmd_newgame',
+    'cmd_start_round',
+    'cmd_pause_round',
+    'cmd_resume_round',
+    'cmd_close_round',
+    'cmd_reveal',
+    'cmd_cancel_game',
+    'cmd_post_cost',
+    'cmd_language',
+    'cmd_analytics',
+    'cmd_proof',
+    'cmd_dbstats',
+    'cmd_profile',
+    '',
+    'help_footer',
+)
 
 class Announcer:
-    """Formats messages for game announcements."""
+    """Formats messages for game announcements.
+    
+    Static text is rendered once per language through ``Translations.block``;
+    only dynamic fields are formatted per call. Every method takes an optional
+    ``lang`` so callers can pass a per-chat language.
+    """
     
     @staticmethod
-    def game_created(target_hash: str, prize_amount: Optional[float] = None, sponsor_name: Optional[str] = None) -> str:
+    def warm_up():
+        """Pre-render all static blocks for every language."""
+        Translations.preload()
+        for lang in SUPPORTED_LANGUAGES:
+            for block in (_RULES_BLOCK, _ROUND_FOOTER_BLOCK, _HELP_BLOCK):
+                Translations.block(block, lang)
+    
+    @staticmethod
+    def game_created(
+        target_hash: str,
+        prize_amount: Optional[float] = None,
+        sponsor_name: Optional[str] = None,
+        lang: str = LANGUAGE
+    ) -> str:
         """Format message for new game creation."""
-        t = Translations.get
-        lang = LANGUAGE
+        t = Translations.template
+        f = Translations.formatter
         
-        prize_text = f"\n{t('prize', lang, amount=prize_amount)}\n" if prize_amount else "\n"
-        sponsor_text = f"{t('sponsored_by', lang, sponsor=sponsor_name)}\n" if sponsor_name else ""
+        prize_text = f"\n{f('prize', lang)(amount=prize_amount)}\n" if prize_amount else "\n"
+        sponsor_text = f"{f('sponsored_by', lang)(sponsor=sponsor_name)}\n" if sponsor_name else ""
         
         return (
             f"{t('game_created_title', lang)}\n\n"
@@ -23,79 +101,118 @@ class Announcer:
             f"<code>{target_hash}</code>\n"
             f"{prize_text}"
             f"{sponsor_text}"
-            f"{t('rules_title', lang)}\n"
-            f"{t('rule_range', lang)}\n"
-            f"{t('rule_guesses', lang)}\n"
-            f"{t('rule_duration', lang)}\n"
-            f"{t('rule_hints', lang)}\n"
-            f"{t('rule_winner', lang)}\n"
-            f"{t('rule_loyalty', lang)}\n\n"
-            f"{t('start_button_prompt', lang)}"
+            f"{Translations.block(_RULES_BLOCK, lang)}"
         )
     
     @staticmethod
-    def round_started(round_index: int, cost: int, duration_minutes: int = 2, sponsor_message: Optional[str] = None) -> str:
+    def round_started(
+        round_index: int,
+        cost: int,
+        duration_minutes: int = 2,
+        sponsor_message: Optional[str] = None,
+        lang: str = LANGUAGE
+    ) -> str:
         """Format message for round start."""
-        t = Translations.get
-        lang = LANGUAGE
+        f = Translations.formatter
         
         # Only round 1 requires minimum guesses
-        if round_index == 1:
-            duration_text = f"{t('duration_with_min', lang, minutes=duration_minutes)}\n"
-        else:
-            duration_text = f"{t('duration', lang, minutes=duration_minutes)}\n"
+        duration_key = 'duration_with_min' if round_index == 1 else 'duration'
         
         base_message = (
-            f"{t('round_started', lang, round=round_index)}\n\n"
-            f"{t('suggested_cost', lang, cost=cost)}\n"
-            f"{duration_text}"
-            f"{t('range', lang)}\n"
-            f"{t('guess_limit', lang)}\n\n"
-            f"{t('good_luck', lang)}"
+            f"{f('round_started', lang)(round=round_index)}\n\n"
+            f"{f('suggested_cost', lang)(cost=cost)}\n"
+            f"{f(duration_key, lang)(minutes=duration_minutes)}\n"
+            f"{Translations.block(_ROUND_FOOTER_BLOCK, lang)}"
         )
         
         # Add sponsor message if provided
         if sponsor_message:
-            base_message += f"\n\n{t('sponsor_message', lang, message=sponsor_message)}"
+            base_message += f"\n\n{f('sponsor_message', lang)(message=sponsor_message)}"
         
         return base_message
     
     @staticmethod
-    def round_paused() -> str:
+    def round_paused(lang: str = LANGUAGE) -> str:
         """Format message for round pause."""
-        return Translations.get('round_paused', LANGUAGE)
+        return Translations.template('round_paused', lang)
     
     @staticmethod
-    def round_resumed(round_index: int) -> str:
+    def round_resumed(round_index: int, lang: str = LANGUAGE) -> str:
         """Format message for round resume."""
-        return Translations.get('round_resumed', LANGUAGE, round=round_index)
+        return Translations.formatter('round_resumed', lang)(round=round_index)
     
     @staticmethod
-    def round_closed(round_index: int, sponsor_message: Optional[str] = None) -> str:
-        """Format message for round close."""
-        t = Translations.get
-        lang = LANGUAGE
+    def round_closed(
+        round_index: int,
+        sponsor_message: Optional[str] = None,
+        lang: str = LANGUAGE,
+        summary: Optional[RoundSummary] = None
+    ) -> str:
+        """Format message for round close, with the round summary if given."""
+        f = Translations.formatter
+        
+        base_message = f('round_closed', lang)(round=round_index)
         
-        base_message = t('round_closed', lang, round=round_index)
+        if summary:
+            base_message += f"\n\n{Announcer.round_summary(summary, lang)}"
         
         # Add sponsor closing message if provided
         if sponsor_message:
-            base_message += f"\n\n{t('sponsor_message', lang, message=sponsor_message)}"
+            base_message += f"\n\n{f('sponsor_message', lang)(message=sponsor_message)}"
         
         return base_message
     
     @staticmethod
-    def hint_message(last_guess: int, target_number: int) -> str:
+    def round_summary(summary: RoundSummary, lang: str = LANGUAGE) -> str:
+        """
+        Format a stored round summary.
+        
+        The closest guess is deliberately left out: while the game is running
+        it would narrow down the secret number beyond the public hints.
+        """
+        f = Translations.formatter
+        
+        text = (
+            f"{Translations.template('summary_title', lang)}\n"
+            f"{f('summary_guesses', lang)(guesses=summary.guess_count, players=summary.unique_players)}"
+        )
+        if summary.range_low is not None and summary.range_high is not None:
+            text += f"\n{f('summary_range', lang)(low=summary.range_low, high=summary.range_high)}"
+        if summary.top_guessers:
+            players = ", ".join(
+                f'<a href="tg://user?id={user_id}">{user_id}</a> ({count})'
+                for user_id, count in summary.top_guessers
+            )
+            text += f"\n{f('summary_top', lang)(players=players)}"
+        if summary.log_root:
+            text += f"\n{f('summary_log', lang)(size=summary.log_size, root=summary.log_root)}"
+        return text
+    
+    @staticmethod
+    def hint_message(last_guess: int, target_number: int, lang: str = LANGUAGE) -> str:
         """Format hint message based on last guess."""
-        t = Translations.get
-        lang = LANGUAGE
+        hint_key = 'hint_higher' if last_guess < target_number else 'hint_lower'
+        hint_text = Translations.formatter(hint_key, lang)(guess=last_guess)
         
-        if last_guess < target_number:
-            hint_text = t('hint_higher', lang, guess=last_guess)
-        else:
-            hint_text = t('hint_lower', lang, guess=last_guess)
+        return f"{Translations.template('hint_title', lang)}\n\n{hint_text}"
+    
+    @staticmethod
+    def _proof_block(number: int, salt: str, target_hash: str, lang: str) -> str:
+        """Format the commit-reveal proof section shared by reveal messages."""
+        t = Translations.template
+        f = Translations.formatter
         
-        return f"{t('hint_title', lang)}\n\n{hint_text}"
+        verification = verify(number, salt, target_hash)
+        verify_emoji = "✅" if verification else "❌"
+        verify_status = t('verification_valid', lang) if verification else t('verification_invalid', lang)
+        
+        return (
+            f"{t('proof_title', lang)}\n"
+            f"{f('proof_number', lang)(number=number)}\n"
+            f"{f('proof_salt', lang)(salt=salt)}\n"
+            f"{f('proof_hash', lang)(hash=target_hash)}\n\n"
+            f"{f('verification', lang)(emoji=verify_emoji, status=verify_status)}"
+        )
     
     @staticmethod
     def winner_announcement(
@@ -106,162 +223,246 @@ class Announcer:
         target_hash: str,
         loyalty_percent: int,
         round_index: int,
-        prize_amount: Optional[float] = None
+        prize_amount: Optional[float] = None,
+        lang: str = LANGUAGE,
+        log_index: Optional[int] = None,
+        log_size: int = 0,
+        log_root: Optional[str] = None
     ) -> str:
-        """Format winner announcement with reveal."""
-        t = Translations.get
-        lang = LANGUAGE
+        """Format winner announcement with reveal, and the winning guess's place in the round's log."""
+        t = Translations.template
+        f = Translations.formatter
         
         # Format user mention
         user_mention = f"@{username}" if username else f"User {user_id}"
         
-        # Verify hash
-        verification = verify(number, salt, target_hash)
-        verify_emoji = "✅" if verification else "❌"
-        verify_status = t('verification_valid', lang) if verification else t('verification_invalid', lang)
-        
         # Calculate actual prize won based on loyalty penalty
         prize_text = ""
         if prize_amount:
             actual_prize = (prize_amount * loyalty_percent) / 100
-            prize_text = f"{t('prize_won', lang, amount=f'{actual_prize:.0f}')}\n"
+            prize_text = f"{f('prize_won', lang)(amount=f'{actual_prize:.0f}')}\n"
             # Show penalty info if loyalty is less than 100%
             if loyalty_percent < 100:
                 penalty = 100 - loyalty_percent
-                prize_text += f"{t('loyalty_penalty', lang, penalty=penalty)}\n"
+                prize_text += f"{f('loyalty_penalty', lang)(penalty=penalty)}\n"
+        
+        log_text = ""
+        if log_index is not None and log_root:
+            log_text = f"{f('winner_log', lang)(index=log_index, size=log_size, root=log_root)}\n\n"
         
         return (
             f"{t('winner_title', lang)}\n\n"
-            f"{t('winner', lang, user=user_mention)}\n"
-            f"{t('secret_number', lang, number=number)}\n"
-            f"{t('won_in_round', lang, round=round_index)}\n"
+            f"{f('winner', lang)(user=user_mention)}\n"
+            f"{f('secret_number', lang)(number=number)}\n"
+            f"{f('won_in_round', lang)(round=round_index)}\n"
             f"{prize_text}"
-            f"{t('proof_title', lang)}\n"
-            f"{t('proof_number', lang, number=number)}\n"
-            f"{t('proof_salt', lang, salt=salt)}\n"
-            f"{t('proof_hash', lang, hash=target_hash)}\n\n"
-            f"{t('verification', lang, emoji=verify_emoji, status=verify_status)}\n\n"
+            f"{Announcer._proof_block(number, salt, target_hash, lang)}\n\n"
+            f"{log_text}"
             f"{t('thank_you', lang)}"
         )
     
     @staticmethod
-    def game_canceled() -> str:
+    def game_canceled(lang: str = LANGUAGE) -> str:
         """Format message for game cancellation."""
-        return Translations.get('game_canceled', LANGUAGE)
+        return Translations.template('game_canceled', lang)
     
     @staticmethod
-    def guess_limit_reached() -> str:
+    def guess_limit_reached(lang: str = LANGUAGE) -> str:
         """Format message when player reaches guess limit."""
-        return Translations.get('guess_limit_reached', LANGUAGE)
+        return Translations.template('guess_limit_reached', lang)
     
     @staticmethod
-    def invalid_guess() -> str:
+    def invalid_guess(lang: str = LANGUAGE) -> str:
         """Format message for invalid guess."""
-        return Translations.get('invalid_guess', LANGUAGE)
+        return Translations.template('invalid_guess', lang)
     
     @staticmethod
-    def no_active_game() -> str:
+    def no_active_game(lang: str = LANGUAGE) -> str:
         """Format message when no game is active."""
-        return Translations.get('no_active_game', LANGUAGE)
+        return Translations.template('no_active_game', lang)
     
     @staticmethod
-    def not_accepting_guesses() -> str:
+    def not_accepting_guesses(lang: str = LANGUAGE) -> str:
         """Format message when round is not accepting guesses."""
-        return Translations.get('not_accepting_guesses', LANGUAGE)
+        return Translations.template('not_accepting_guesses', lang)
+    
+    @staticmethod
+    def guess_ruled_out(low: int, high: int, lang: str = LANGUAGE) -> str:
+        """Format message for a guess outside the interval the hints already allow."""
+        return Translations.formatter('guess_ruled_out', lang)(low=low, high=high)
+    
+    @staticmethod
+    def guess_hint(guess_value: int, target_number: int, lang: str = LANGUAGE) -> str:
+        """Format the short higher/lower reply to a guess."""
+        return Translations.template('guess_higher' if guess_value < target_number else 'guess_lower', lang)
     
     @staticmethod
     def status_message(
         game: Game,
         active_round: Optional[Round],
         total_rounds: int,
-        last_guess_value: Optional[int]
+        last_guess_value: Optional[int],
+        lang: str = LANGUAGE,
+        last_summary: Optional[RoundSummary] = None
     ) -> str:
         """Format status message."""
-        t = Translations.get
-        lang = LANGUAGE
+        t = Translations.template
+        f = Translations.formatter
         
         status_text = f"{t('status_title', lang)}\n\n"
-        status_text += f"{t('game_state', lang, state=game.status)}\n"
-        status_text += f"{t('total_rounds', lang, rounds=total_rounds)}\n\n"
+        status_text += f"{f('game_state', lang)(state=game.status)}\n"
+        status_text += f"{f('total_rounds', lang)(rounds=total_rounds)}\n\n"
         
         if active_round:
-            status_text += f"{t('active_round', lang, round=active_round.round_index)}\n"
-            status_text += f"{t('total_guesses', lang, guesses=active_round.total_guesses)}\n"
-            status_text += f"{t('suggested_cost', lang, cost=active_round.message_cost_hint)}\n"
+            status_text += f"{f('active_round', lang)(round=active_round.round_index)}\n"
+            status_text += f"{f('total_guesses', lang)(guesses=active_round.total_guesses)}\n"
+            status_text += f"{f('suggested_cost', lang)(cost=active_round.message_cost_hint)}\n"
+            
+            if active_round.range_low is not None:
+                status_text += f"{f('summary_range', lang)(low=active_round.range_low, high=active_round.range_high)}\n"
             
             if last_guess_value is not None:
-                status_text += f"{t('last_guess', lang, guess=last_guess_value)}\n"
+                status_text += f"{f('last_guess', lang)(guess=last_guess_value)}\n"
             
             # Calculate guesses until next hint
             guesses_to_hint = 10 - (active_round.total_guesses % 10)
             if guesses_to_hint < 10:
-                status_text += f"{t('next_hint', lang, guesses=guesses_to_hint)}\n"
+                status_text += f"{f('next_hint', lang)(guesses=guesses_to_hint)}\n"
+        elif last_summary:
+            status_text += f"{Announcer.round_summary(last_summary, lang)}\n"
         
         return status_text
     
     @staticmethod
-    def help_message() -> str:
-        """Format help/start message."""
-        t = Translations.get
-        lang = LANGUAGE
-        
-        return (
-            f"{t('help_title', lang)}\n\n"
-            f"{t('how_to_play', lang)}\n"
-            f"{t('help_step1', lang)}\n"
-            f"{t('help_step2', lang)}\n"
-            f"{t('help_step3', lang)}\n"
-            f"{t('help_step4', lang)}\n"
-            f"{t('help_step5', lang)}\n"
-            f"{t('help_step6', lang)}\n\n"
-            f"{t('loyalty_title', lang)}\n"
-            f"{t('loyalty_rule1', lang)}\n"
-            f"{t('loyalty_rule2', lang)}\n"
-            f"{t('loyalty_rule3', lang)}\n"
-            f"{t('loyalty_rule4', lang)}\n\n"
-            f"{t('commands_title', lang)}\n"
-            f"{t('cmd_start', lang)}\n"
-            f"{t('cmd_status', lang)}\n"
-            f"{t('cmd_newgame', lang)}\n"
-            f"{t('cmd_start_round', lang)}\n"
-            f"{t('cmd_pause_round', lang)}\n"
-            f"{t('cmd_resume_round', lang)}\n"
-            f"{t('cmd_close_round', lang)}\n"
-            f"{t('cmd_reveal', lang)}\n"
-            f"{t('cmd_cancel_game', lang)}\n"
-            f"{t('cmd_post_cost', lang)}\n\n"
-            f"{t('help_footer', lang)}"
+    def status(status: Dict[str, Any], lang: str = LANGUAGE) -> str:
+        """Format a chat's status as returned by ``GameEngine.get_status``."""
+        last_guess = status.get('last_guess')
+        return Announcer.status_message(
+            status['game'],
+            status.get('active_round'),
+            len(status['all_rounds']),
+            last_guess.value if last_guess else None,
+            lang,
+            status.get('last_summary')
         )
     
     @staticmethod
-    def manual_reveal(number: int, salt: str, target_hash: str) -> str:
+    def help_message(lang: str = LANGUAGE) -> str:
+        """Format help/start message."""
+        return Translations.block(_HELP_BLOCK, lang)
+    
+    @staticmethod
+    def manual_reveal(number: int, salt: str, target_hash: str, lang: str = LANGUAGE) -> str:
         """Format manual reveal message (no winner)."""
-        t = Translations.get
-        lang = LANGUAGE
-        
-        verification = verify(number, salt, target_hash)
-        verify_emoji = "✅" if verification else "❌"
-        verify_status = t('verification_valid', lang) if verification else t('verification_invalid', lang)
+        t = Translations.template
         
         return (
             f"{t('reveal_title', lang)}\n\n"
-            f"{t('secret_was', lang, number=number)}\n\n"
-            f"{t('proof_title', lang)}\n"
-            f"{t('proof_number', lang, number=number)}\n"
-            f"{t('proof_salt', lang, salt=salt)}\n"
-            f"{t('proof_hash', lang, hash=target_hash)}\n\n"
-            f"{t('verification', lang, emoji=verify_emoji, status=verify_status)}\n\n"
+            f"{Translations.formatter('secret_was', lang)(number=number)}\n\n"
+            f"{Announcer._proof_block(number, salt, target_hash, lang)}\n\n"
             f"{t('no_winner', lang)}"
         )
     
     @staticmethod
-    def cost_hint(round_index: int, cost: int) -> str:
+    def guess_log_proof(
+        round_index: int,
+        leaf: str,
+        index: int,
+        size: int,
+        root: bytes,
+        path: List[bytes],
+        lang: str = LANGUAGE
+    ) -> str:
+        """Format an inclusion proof of a guess in its round's Merkle log."""
+        t = Translations.template
+        f = Translations.formatter
+        
+        lines = [
+            t('log_proof_title', lang),
+            f('log_proof_position', lang)(round=round_index, index=index, size=size),
+            f('log_proof_leaf', lang)(leaf=leaf),
+            f('log_proof_root', lang)(root=root.hex()),
+        ]
+        if path:
+            lines.append(t('log_proof_path', lang))
+            lines.extend(f"<code>{sibling.hex()}</code>" for sibling in path)
+        return "\n".join(lines)
+    
+    @staticmethod
+    def db_stats(snapshot: Dict[str, Any], lang: str = LANGUAGE) -> str:
+        """Format a ``QueryTracer`` snapshot of the slowest database methods."""
+        f = Translations.formatter
+        
+        lines = [Translations.template('dbstats_title', lang)]
+        for method in snapshot["methods"]:
+            lines.append(f('dbstats_line', lang)(
+                name=method["name"],
+                p50=method["p50_ms"],
+                p95=method["p95_ms"],
+                p99=method["p99_ms"],
+                calls=method["calls"],
+                rows=method["avg_rows"],
+                wait=method["wait_p95_ms"]
+            ))
+        lines.append(f('dbstats_slow', lang)(count=snapshot["slow_queries"]))
+        return "\n".join(lines)
+    
+    @staticmethod
+    def profile_report(report: ProfileReport, lang: str = LANGUAGE) -> str:
+        """Format a profiling session's CPU split and busiest functions."""
+        f = Translations.formatter
+        
+        lines = [f('profile_title', lang)(seconds=report.seconds, samples=report.samples, cpu=report.cpu_seconds)]
+        for name, share, cpu in report.cpu_split():
+            lines.append(f('profile_split', lang)(name=name, share=share, cpu=cpu))
+        if report.top_functions:
+            lines.append("")
+            lines.append(Translations.template('profile_top', lang))
+            for name, samples in report.top_functions[:5]:
+                lines.append(f('profile_function', lang)(name=html.escape(name), samples=samples))
+        lines.append("")
+        lines.append(f('profile_files', lang)(path=html.escape(report.path), tasks_path=html.escape(report.tasks_path)))
+        return "\n".join(lines)
+    
+    @staticmethod
+    def analytics_report(report: AnalyticsReport, lang: str = LANGUAGE) -> str:
+        """Format a guess analytics report for the chat."""
+        t = Translations.template
+        f = Translations.formatter
+        
+        if not report.total_guesses:
+            return t('analytics_empty', lang)
+        
+        heatmap = "\n".join(heatmap_lines(report, bar_width=12))
+        hot = ", ".join(f"<b>{number}</b> ({count})" for number, count in report.top_numbers)
+        
+        text = (
+            f"{t('analytics_title', lang)}\n\n"
+            f"{f('analytics_totals', lang)(guesses=report.total_guesses, games=report.games, players=report.players)}\n"
+            f"{f('analytics_wasted', lang)(wasted=report.wasted_guesses)}\n"
+            f"{f('analytics_hot', lang)(numbers=hot)}\n\n"
+            f"{t('analytics_heatmap', lang)}\n"
+            f"<pre>{heatmap}</pre>\n\n"
+            f"{t('analytics_rounds', lang)}\n"
+        )
+        round_line = f('analytics_round_line', lang)
+        for round_index, guesses, left in report.rounds:
+            text += f"{round_line(round=round_index, guesses=guesses, left=left)}\n"
+        
+        if report.top_players:
+            text += f"\n{t('analytics_players', lang)}\n"
+            for user_id, guesses, bits, _ in report.top_players:
+                text += f'<a href="tg://user?id={user_id}">{user_id}</a>: {bits:.2f} ({guesses})\n'
+        
+        return text
+    
+    @staticmethod
+    def cost_hint(round_index: int, cost: int, lang: str = LANGUAGE) -> str:
         """Format cost hint message."""
-        t = Translations.get
-        lang = LANGUAGE
+        f = Translations.formatter
         
         return (
-            f"{t('cost_hint_title', lang, round=round_index)}\n\n"
-            f"{t('cost_suggested', lang, cost=cost)}\n\n"
-            f"{t('cost_warning', lang)}"
+            f"{f('cost_hint_title', lang)(round=round_index)}\n\n"
+            f"{f('cost_suggested', lang)(cost=cost)}\n\n"
+            f"{Translations.template('cost_warning', lang)}"
         )
@@ -0,0 +1,240 @@
+"""Bulk fairness audit of historical commit-reveal proofs.
+
+Finished games are streamed from the database in ID order, and each
+game's ``sha256(number:salt)`` is recomputed and compared with the hash
+committed when the game was created. Batches are verified across a
+process pool. Progress is checkpointed in ``audit_checkpoints`` after
+every batch, so an interrupted audit resumes from the last audited game.
+Games still running when the audit passes them are kept in
+``audit_pending`` and verified by a later run once they have finished;
+mismatches are stored as rows in ``audit_mismatches``.
+
+The result is a JSON report, signed with HMAC-SHA256 (``AUDIT_SIGNING_KEY``,
+or a key derived from the bot token), that lists every mismatch.
+
+Usage:
+    python -m bot.services.audit [--db PATH] [--out REPORT] [--name NAME]
+                                 [--workers N] [--batch-size N] [--restart]
+    python -m bot.services.audit --verify-report REPORT
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from bot.config import AUDIT_SIGNING_KEY, BOT_TOKEN, DATABASE_PATH
+from bot.services.commit_reveal import commit_hash
+from bot.storage.db import Database
+from bot.storage.models import GameStatus
+
+logger = logging.getLogger(__name__)
+
+REPORT_VERSION = 1
+
+# Explicit key if configured; otherwise derived from the bot token like other internal keys
+_KEY = (
+    AUDIT_SIGNING_KEY.encode() if AUDIT_SIGNING_KEY
+    else hashlib.sha256(b"audit-report:" + BOT_TOKEN.encode()).digest()
+)
+
+def verify_batch(games: Sequence[Tuple[int, int, int, str, str]]) -> List[Tuple[int, str]]:
+    """
+    Verify a batch of (id, chat_id, number, salt, target_hash) rows.
+    
+    Runs in worker processes, so it only takes and returns plain tuples.
+    
+    Returns:
+        (game_id, computed_hash) for every game whose proof doesn't match
+    """
+    mismatches = []
+    for game_id, _, number, salt, target_hash in games:
+        computed = commit_hash(number, salt) if number is not None else ""
+        if computed != target_hash:
+            mismatches.append((game_id, computed))
+    return mismatches
+
+def _canonical(report: Dict[str, Any]) -> bytes:
+    """Serialize a report deterministically for signing."""
+    unsigned = {key: value for key, value in report.items() if key != "signature"}
+    return json.dumps(unsigned, sort_keys=True, separators=(",", ":")).encode()
+
+def sign_report(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach an HMAC-SHA256 signature over the canonical report body."""
+    report["signature"] = {
+        "alg": "HMAC-SHA256",
+        "key_id": hashlib.sha256(_KEY).hexdigest()[:16],
+        "value": hmac.new(_KEY, _canonical(report), hashlib.sha256).hexdigest(),
+    }
+    return report
+
+def verify_report(report: Dict[str, Any]) -> bool:
+    """Check a report's signature against the configured key."""
+    signature = report.get("signature") or {}
+    expected = hmac.new(_KEY, _canonical(report), hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, str(signature.get("value", "")))
+
+class FairnessAuditor:
+    """
+    Streams finished games, verifies them in parallel and checkpoints progress.
+    
+    Batches are submitted to the executor with a bounded number in flight,
+    and their results are consumed in submission order so the checkpoint
+    only ever advances past fully verified games.
+    """
+    
+    def __init__(
+        self,
+        db: Database,
+        name: str = "default",
+        batch_size: int = 10000,
+        max_in_flight: int = 8
+    ):
+        self.db = db
+        self.name = name
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+    
+    async def run(self, executor: Optional[Executor] = None, restart: bool = False) -> Dict[str, Any]:
+        """
+        Audit every finished game after the last checkpoint, and pending games that have finished since.
+        
+        Args:
+            executor: Executor for verification batches; None verifies in-process
+            restart: Discard the checkpoint and audit from the first game
+        
+        Returns:
+            The signed report covering all games audited under this name
+        """
+        if restart:
+            await self.db.delete_audit_checkpoint(self.name)
+        checkpoint = await self.db.get_audit_checkpoint(self.name)
+        resumed_from = checkpoint['last_game_id'] if checkpoint else 0
+        last_game_id = resumed_from
+        audited = checkpoint['games_audited'] if checkpoint else 0
+        mismatches: List[Dict[str, Any]] = checkpoint['mismatches'] if checkpoint else []
+        pending = set(checkpoint['pending']) if checkpoint else set()
+        started_at = checkpoint['started_at'] if checkpoint else self.db.clock.time()
+        
+        loop = asyncio.get_running_loop()
+        in_flight: deque = deque()
+        
+        async def complete_oldest():
+            nonlocal last_game_id, audited
+            batch, future, batch_last_id, pending_added, pending_done = in_flight.popleft()
+            by_id = {row[0]: row for row in batch}
+            found = []
+            for game_id, computed in await future:
+                _, chat_id, _, _, target_hash = by_id[game_id]
+                found.append({
+                    "game_id": game_id,
+                    "chat_id": chat_id,
+                    "target_hash": target_hash,
+                    "computed_hash": computed,
+                })
+                logger.warning(f"Game {game_id} failed commit-reveal verification")
+            mismatches.extend(found)
+            last_game_id = max(last_game_id, batch_last_id)
+            audited += len(batch)
+            await self.db.save_audit_checkpoint(
+                self.name, last_game_id, audited, started_at, found, pending_added, pending_done
+            )
+        
+        async def submit(rows, batch_last_id: int, pending_done=()):
+            # Finished games are verified; running ones wait in audit_pending for a later run
+            batch = [row[:5] for row in rows if row[5] == GameStatus.GAME_FINISHED]
+            pending_added = [row[0] for row in rows if row[5] != GameStatus.GAME_FINISHED]
+            if executor is None:
+                future = loop.create_future()
+                future.set_result(verify_batch(batch))
+            else:
+                future = loop.run_in_executor(executor, verify_batch, batch)
+            in_flight.append((batch, future, batch_last_id, pending_added, pending_done))
+            if len(in_flight) >= self.max_in_flight:
+                await complete_oldest()
+        
+        # Games passed over earlier: audit those that finished since (canceled ones drop out)
+        pending_ids = sorted(pending)
+        for i in range(0, len(pending_ids), self.batch_size):
+            chunk = pending_ids[i:i + self.batch_size]
+            rows = await self.db.get_auditable_games(chunk)
+            finished = [row for row in rows if row[5] == GameStatus.GAME_FINISHED]
+            running = {row[0] for row in rows} - {row[0] for row in finished}
+            done = sorted(set(chunk) - running)
+            await submit(finished, last_game_id, done)
+            pending.difference_update(done)
+        
+        async for rows in self.db.iter_auditable_games(resumed_from, self.batch_size):
+            pending.update(row[0] for row in rows if row[5] != GameStatus.GAME_FINISHED)
+            await submit(rows, rows[-1][0])
+        while in_flight:
+            await complete_oldest()
+        
+        report = {
+            "version": REPORT_VERSION,
+            "audit": self.name,
+            "scheme": "sha256(number:salt) == target_hash",
+            "started_at": datetime.fromtimestamp(started_at, timezone.utc).isoformat(),
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "resumed_after_game_id": resumed_from,
+            "last_game_id": last_game_id,
+            "games_audited": audited,
+            "games_pending": sorted(pending),
+            "mismatch_count": len(mismatches),
+            "mismatches": mismatches,
+        }
+        return sign_report(report)
+
+async def _main(args: argparse.Namespace) -> int:
+    if args.verify_report:
+        with open(args.verify_report) as f:
+            report = json.load(f)
+        valid = verify_report(report)
+        print(f"Signature {'valid' if valid else 'INVALID'}: {report.get('games_audited')} games, "
+              f"{report.get('mismatch_count')} mismatches")
+        return 0 if valid else 2
+    
+    db = Database(args.db)
+    await db.init_db()
+    auditor = FairnessAuditor(db, args.name, args.batch_size, max(2 * args.workers, 2))
+    
+    started = time.perf_counter()
+    if args.workers > 0:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            report = await auditor.run(executor, args.restart)
+    else:
+        report = await auditor.run(None, args.restart)
+    elapsed = time.perf_counter() - started
+    
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(
+        f"Audited {report['games_audited']} games (up to #{report['last_game_id']}) in {elapsed:.2f}s: "
+        f"{report['mismatch_count']} mismatches. Signed report written to {args.out}"
+    )
+    return 1 if report['mismatch_count'] else 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Verify the commit-reveal proofs of all finished games")
+    parser.add_argument("--db", default=DATABASE_PATH, help="Database to audit (default: DATABASE_PATH)")
+    parser.add_argument("--out", default="fairness_audit.json", help="Signed report path")
+    parser.add_argument("--name", default="default", help="Audit name; each name keeps its own checkpoint")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Verification processes (0 = verify in-process)")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Games per verification batch")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and audit from the start")
+    parser.add_argument("--verify-report", metavar="REPORT", help="Check a report's signature and exit")
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(level=logging.WARNING)
+    return asyncio.run(_main(args))
+
+if __name__ == "__main__":
+    raise SystemExit(main())
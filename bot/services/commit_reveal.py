@@ -3,6 +3,10 @@ import hashlib
 import secrets
 from typing import Tuple
 
+def commit_hash(number: int, salt: str) -> str:
+    """Compute the committed hash of a number and salt: sha256("number:salt")."""
+    return hashlib.sha256(f"{number}:{salt}".encode()).hexdigest()
+
 def make_commit(number: int) -> Tuple[int, str, str]:
     """
     Generate a provably fair commitment.
@@ -14,11 +18,19 @@ def make_commit(number: int) -> Tuple[int, str, str]:
         Tuple of (number, salt, hash)
     """
     salt = secrets.token_hex(16)
-    hash_input = f"{number}:{salt}"
-    target_hash = hashlib.sha256(hash_input.encode()).hexdigest()
+    target_hash = commit_hash(number, salt)
     
     return (number, salt, target_hash)
 
+def generate_commit(low: int, high: int) -> Tuple[int, str, str]:
+    """
+    Draw a secret number in [low, high] with a CSPRNG and commit to it.
+    
+    Returns:
+        Tuple of (number, salt, hash)
+    """
+    return make_commit(low + secrets.randbelow(high - low + 1))
+
 def verify(number: int, salt: str, expected_hash: str) -> bool:
     """
     Verify that a number and salt produce the expected hash.
@@ -31,7 +43,4 @@ def verify(number: int, salt: str, expected_hash: str) -> bool:
     Returns:
         True if verification succeeds, False otherwise
     """
-    hash_input = f"{number}:{salt}"
-    computed_hash = hashlib.sha256(hash_input.encode()).hexdigest()
-    
-    return computed_hash == expected_hash
+    return commit_hash(number, salt) == expected_hash
@@ -0,0 +1,164 @@
+"""Commitment pool - secret numbers committed ahead of time for instant game creation.
+
+A background task keeps the ``commitment_pool`` table topped up with
+``(number, salt, hash)`` commitments drawn with ``secrets``. ``/newgame``
+then pops one instead of generating it inline.
+
+Pooled secrets are sealed at rest: the ``number:salt`` plaintext is
+encrypted with an HMAC-SHA256 keystream under a random nonce and
+authenticated with HMAC-SHA256 (encrypt-then-MAC), using keys derived from
+``COMMITMENT_POOL_KEY``. Only the public hash is stored in the clear.
+"""
+import asyncio
+import hashlib
+import hmac
+import logging
+import secrets
+from typing import Optional, Tuple
+from bot.config import COMMITMENT_POOL_KEY, BOT_TOKEN, MIN_NUMBER, MAX_NUMBER
+from bot.services.commit_reveal import commit_hash, generate_commit
+from bot.storage.db import Database
+
+logger = logging.getLogger(__name__)
+
+_NONCE_SIZE = 16
+_TAG_SIZE = 32
+
+# Explicit key if configured; otherwise derived from the bot token like other internal keys
+_KEY = (
+    COMMITMENT_POOL_KEY.encode() if COMMITMENT_POOL_KEY
+    else hashlib.sha256(b"commitment-pool:" + BOT_TOKEN.encode()).digest()
+)
+_ENC_KEY = hmac.new(_KEY, b"encrypt", hashlib.sha256).digest()
+_MAC_KEY = hmac.new(_KEY, b"authenticate", hashlib.sha256).digest()
+
+def _keystream(nonce: bytes, length: int) -> bytes:
+    """HMAC-SHA256 in counter mode, ``length`` bytes long."""
+    blocks = (length + 31) // 32
+    return b"".join(
+        hmac.new(_ENC_KEY, nonce + counter.to_bytes(4, "big"), hashlib.sha256).digest()
+        for counter in range(blocks)
+    )[:length]
+
+def seal(plaintext: str) -> str:
+    """Encrypt and authenticate a pooled secret; returns hex."""
+    data = plaintext.encode()
+    nonce = secrets.token_bytes(_NONCE_SIZE)
+    ciphertext = bytes(a ^ b for a, b in zip(data, _keystream(nonce, len(data))))
+    tag = hmac.new(_MAC_KEY, nonce + ciphertext, hashlib.sha256).digest()
+    return (nonce + ciphertext + tag).hex()
+
+def unseal(sealed: str) -> Optional[str]:
+    """Decrypt a sealed secret; None if it fails authentication (e.g. the key changed)."""
+    raw = bytes.fromhex(sealed)
+    nonce, ciphertext, tag = raw[:_NONCE_SIZE], raw[_NONCE_SIZE:-_TAG_SIZE], raw[-_TAG_SIZE:]
+    expected = hmac.new(_MAC_KEY, nonce + ciphertext, hashlib.sha256).digest()
+    if not hmac.compare_digest(expected, tag):
+        return None
+    return bytes(a ^ b for a, b in zip(ciphertext, _keystream(nonce, len(ciphertext)))).decode()
+
+class CommitmentPool:
+    """
+    Background task keeping a pool of sealed commitments filled.
+    
+    The pool is refilled up to ``size`` whenever it drops to
+    ``refill_at`` or below; ``take`` wakes the refill loop after every pop.
+    """
+    
+    def __init__(
+        self,
+        db: Database,
+        size: int = 100,
+        refill_at: int = 25,
+        poll_interval: float = 60.0
+    ):
+        self.db = db
+        self.size = size
+        self.refill_at = refill_at
+        self.poll_interval = poll_interval
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start the background refill loop (it fills the pool right away)."""
+        if self._task is None:
+            self._wake.set()
+            self._task = asyncio.create_task(self._run())
+            logger.info("Commitment pool started")
+    
+    async def stop(self):
+        """Stop the background refill loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Commitment pool stopped")
+    
+    async def take(self) -> Optional[Tuple[int, str, str]]:
+        """
+        Pop a commitment from the pool.
+        
+        Entries that fail authentication, don't match their hash or fall
+        outside the configured number range are discarded.
+        
+        Returns:
+            Tuple of (number, salt, hash), or None if the pool is empty
+        """
+        try:
+            while True:
+                row = await self.db.pop_commitment()
+                if row is None:
+                    logger.warning("Commitment pool is empty, generating inline")
+                    return None
+                target_hash, sealed = row
+                plaintext = unseal(sealed)
+                if plaintext is None:
+                    logger.warning("Discarding pooled commitment that failed authentication")
+                    continue
+                number_text, salt = plaintext.split(":", 1)
+                number = int(number_text)
+                if commit_hash(number, salt) != target_hash or not MIN_NUMBER <= number <= MAX_NUMBER:
+                    logger.warning("Discarding pooled commitment that is inconsistent or out of range")
+                    continue
+                return number, salt, target_hash
+        finally:
+            self._wake.set()
+    
+    async def refill(self) -> int:
+        """
+        Top the pool up to ``size`` if it is at or below the watermark.
+        
+        Returns:
+            Number of commitments added
+        """
+        available = await self.db.count_commitments()
+        if available > self.refill_at:
+            return 0
+        
+        commitments = []
+        for _ in range(self.size - available):
+            number, salt, target_hash = generate_commit(MIN_NUMBER, MAX_NUMBER)
+            commitments.append((target_hash, seal(f"{number}:{salt}")))
+        if commitments:
+            await self.db.add_commitments(commitments)
+            logger.info(f"Commitment pool refilled with {len(commitments)} commitment(s)")
+        return len(commitments)
+    
+    async def _run(self):
+        """Refill loop: check on wake-up or every poll interval."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            
+            try:
+                await self.refill()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Commitment pool refill failed: {e}", exc_info=True)
@@ -0,0 +1,329 @@
+"""In-process event bus for side effects of game state changes.
+
+``GameEngine`` publishes an event after each state transition has been
+written (game created, round started, paused, resumed or closed, guess
+registered, game finished, revealed or canceled). Side effects subscribe
+to the events instead of being called from the engine:
+
+- synchronous subscribers run inline, in subscription order, before
+  ``publish`` returns. They are for cheap, consistency-critical work such
+  as the status cache and waking the outbox.
+- async subscribers each get a bounded queue and a worker task, so slow
+  consumers (stats, leaderboards, notifications) stay off the guess path.
+  When a queue is full, the subscriber's ``Backpressure`` policy decides:
+  block the publisher, drop the new event or drop the oldest queued one.
+
+Subscriber errors are logged and counted, never raised to the publisher.
+Events are matched by type, so subscribing to ``Event`` receives them all.
+"""
+import asyncio
+import logging
+import time
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+from bot.storage.models import Game, Round, Guess, RoundSummary
+
+logger = logging.getLogger(__name__)
+
+class Event:
+    """Base of all engine events."""
+    __slots__ = ("game_id", "chat_id")
+    
+    def __init__(self, game_id: int, chat_id: Optional[int] = None):
+        self.game_id = game_id
+        self.chat_id = chat_id  # None when the engine didn't need to load the game
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}"
+            for cls in reversed(type(self).__mro__) for name in getattr(cls, "__slots__", ())
+        )
+        return f"{type(self).__name__}({fields})"
+
+class GameCreated(Event):
+    """A game was created and its commitment published."""
+    __slots__ = ("game",)
+    
+    def __init__(self, game: Game):
+        super().__init__(game.id, game.chat_id)
+        self.game = game
+
+class RoundStarted(Event):
+    """A round was created and its timer armed."""
+    __slots__ = ("round",)
+    
+    def __init__(self, round_obj: Round, chat_id: Optional[int] = None):
+        super().__init__(round_obj.game_id, chat_id)
+        self.round = round_obj
+
+class RoundPaused(Event):
+    """A round was paused."""
+    __slots__ = ("round",)
+    
+    def __init__(self, round_obj: Round):
+        super().__init__(round_obj.game_id)
+        self.round = round_obj
+
+class RoundResumed(Event):
+    """A paused round was resumed."""
+    __slots__ = ("round",)
+    
+    def __init__(self, round_obj: Round):
+        super().__init__(round_obj.game_id)
+        self.round = round_obj
+
+class RoundClosed(Event):
+    """A round was closed and its summary stored."""
+    __slots__ = ("round", "summary")
+    
+    def __init__(self, round_obj: Round, game: Game, summary: RoundSummary):
+        super().__init__(game.id, game.chat_id)
+        self.round = round_obj
+        self.summary = summary
+
+class GuessRegistered(Event):
+    """A guess was stored, logged and counted."""
+    __slots__ = ("guess", "bounds")
+    
+    def __init__(self, game: Game, guess: Guess, bounds: Tuple[int, int]):
+        super().__init__(game.id, game.chat_id)
+        self.guess = guess
+        self.bounds = bounds  # Known [low, high] interval after the guess
+
+class GameFinished(Event):
+    """A game was won."""
+    __slots__ = ("winner_user_id",)
+    
+    def __init__(self, game_id: int, chat_id: Optional[int], winner_user_id: int):
+        super().__init__(game_id, chat_id)
+        self.winner_user_id = winner_user_id
+
+class GameRevealed(Event):
+    """A game was finished without a winner by a manual reveal."""
+    __slots__ = ()
+
+class GameCanceled(Event):
+    """A game was canceled."""
+    __slots__ = ()
+
+class Backpressure(str, Enum):
+    """What an async subscriber does when its queue is full."""
+    BLOCK = "block"  # The publisher waits for room
+    DROP_NEWEST = "drop_newest"  # The new event is discarded
+    DROP_OLDEST = "drop_oldest"  # The oldest queued event is discarded
+
+class _Subscriber:
+    """One subscription and its delivery counters."""
+    __slots__ = (
+        "name", "handler", "event_types", "queue", "policy", "task",
+        "delivered", "dropped", "failed", "busy_seconds"
+    )
+    
+    def __init__(
+        self,
+        name: str,
+        handler: Callable,
+        event_types: Tuple[Type[Event], ...],
+        queue: Optional[asyncio.Queue] = None,
+        policy: Backpressure = Backpressure.DROP_OLDEST
+    ):
+        self.name = name
+        self.handler = handler
+        self.event_types = event_types
+        self.queue = queue  # None for synchronous subscribers
+        self.policy = policy
+        self.task: Optional[asyncio.Task] = None
+        self.delivered = 0
+        self.dropped = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+
+class EventBus:
+    """Typed publish/subscribe with inline and queued subscribers."""
+    
+    def __init__(self):
+        self.subscribers: List[_Subscriber] = []
+        self.published = 0
+        self._routes: Dict[Type[Event], List[_Subscriber]] = {}  # Resolved per concrete event type
+        self._running = False
+    
+    def subscribe_sync(self, handler: Callable[[Event], Any], *event_types: Type[Event], name: Optional[str] = None):
+        """
+        Run ``handler(event)`` inline whenever one of ``event_types`` is published.
+        
+        Args:
+            handler: Plain function; it must be quick and must not block
+            event_types: Event classes to receive (default: all)
+            name: Name in stats and logs (default: the handler's name)
+        """
+        self._add(_Subscriber(name or _name(handler), handler, event_types or (Event,)))
+    
+    def subscribe(
+        self,
+        handler: Callable[[Event], Awaitable[Any]],
+        *event_types: Type[Event],
+        queue_size: int = 1000,
+        policy: Backpressure = Backpressure.DROP_OLDEST,
+        name: Optional[str] = None
+    ):
+        """
+        Deliver ``event_types`` to ``await handler(event)`` from a worker task.
+        
+        Args:
+            handler: Coroutine function, called with one event at a time
+            event_types: Event classes to receive (default: all)
+            queue_size: Events buffered for this subscriber
+            policy: What happens when the buffer is full
+            name: Name in stats and logs (default: the handler's name)
+        """
+        subscriber = _Subscriber(
+            name or _name(handler),
+            handler,
+            event_types or (Event,),
+            asyncio.Queue(queue_size),
+            Backpressure(policy)
+        )
+        self._add(subscriber)
+        if self._running:
+            subscriber.task = asyncio.create_task(self._work(subscriber))
+    
+    def _add(self, subscriber: _Subscriber):
+        self.subscribers.append(subscriber)
+        self._routes.clear()
+    
+    def _route(self, event_type: Type[Event]) -> List[_Subscriber]:
+        route = self._routes.get(event_type)
+        if route is None:
+            route = self._routes[event_type] = [
+                s for s in self.subscribers if issubclass(event_type, s.event_types)
+            ]
+        return route
+    
+    async def publish(self, event: Event):
+        """
+        Publish an event to its subscribers.
+        
+        Synchronous subscribers have run when this returns; async ones have
+        the event queued (or dropped, by their policy). Only subscribers
+        with ``Backpressure.BLOCK`` and a full queue make this wait.
+        """
+        self.published += 1
+        for subscriber in self._route(type(event)):
+            if subscriber.queue is None:
+                self._call(subscriber, event)
+            else:
+                await self._enqueue(subscriber, event)
+    
+    def _call(self, subscriber: _Subscriber, event: Event):
+        started = time.perf_counter()
+        try:
+            subscriber.handler(event)
+            subscriber.delivered += 1
+        except Exception as e:
+            subscriber.failed += 1
+            logger.error(f"Event subscriber {subscriber.name} failed on {event!r}: {e}", exc_info=True)
+        subscriber.busy_seconds += time.perf_counter() - started
+    
+    async def _enqueue(self, subscriber: _Subscriber, event: Event):
+        queue = subscriber.queue
+        if not queue.full():
+            queue.put_nowait(event)
+        elif subscriber.policy is Backpressure.BLOCK:
+            await queue.put(event)
+        elif subscriber.policy is Backpressure.DROP_NEWEST:
+            self._dropped(subscriber, event)
+        else:
+            self._dropped(subscriber, queue.get_nowait())
+            queue.task_done()
+            queue.put_nowait(event)
+    
+    def _dropped(self, subscriber: _Subscriber, event: Event):
+        subscriber.dropped += 1
+        # Log the first drop and then every 1000th, not every event of a burst
+        if subscriber.dropped % 1000 == 1:
+            logger.warning(
+                f"Event subscriber {subscriber.name} is falling behind, dropped {event!r} "
+                f"({subscriber.dropped} dropped so far)"
+            )
+    
+    async def _work(self, subscriber: _Subscriber):
+        """Worker loop of one async subscriber."""
+        queue = subscriber.queue
+        while True:
+            event = await queue.get()
+            started = time.perf_counter()
+            try:
+                await subscriber.handler(event)
+                subscriber.delivered += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                subscriber.failed += 1
+                logger.error(f"Event subscriber {subscriber.name} failed on {event!r}: {e}", exc_info=True)
+            finally:
+                subscriber.busy_seconds += time.perf_counter() - started
+                queue.task_done()
+    
+    def start(self):
+        """Start the worker tasks of the async subscribers."""
+        if self._running:
+            return
+        self._running = True
+        for subscriber in self.subscribers:
+            if subscriber.queue is not None and subscriber.task is None:
+                subscriber.task = asyncio.create_task(self._work(subscriber))
+        logger.info(f"Event bus started with {len(self.subscribers)} subscriber(s)")
+    
+    async def drain(self):
+        """Wait until every async subscriber has handled its queued events, then stop the workers."""
+        if self._running:
+            await asyncio.gather(*(s.queue.join() for s in self.subscribers if s.task is not None))
+        await self.stop()
+    
+    async def stop(self):
+        """Stop the worker tasks; events still queued are discarded."""
+        self._running = False
+        tasks = [s.task for s in self.subscribers if s.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for subscriber in self.subscribers:
+            subscriber.task = None
+        if tasks:
+            left = sum(s.queue.qsize() for s in self.subscribers if s.queue is not None)
+            if left:
+                logger.warning(f"Event bus stopped with {left} event(s) not handled")
+            logger.info("Event bus stopped")
+    
+    def prometheus(self) -> str:
+        """Subscriber counters and queue depths in the Prometheus text exposition format."""
+        lines = [
+            "# HELP bot_events_published_total Engine events published",
+            "# TYPE bot_events_published_total counter",
+            f"bot_events_published_total {self.published}",
+        ]
+        metrics = (
+            ("delivered", "counter", "Events handled by the subscriber"),
+            ("dropped", "counter", "Events dropped because the subscriber's queue was full"),
+            ("failed", "counter", "Events whose handler raised"),
+            ("busy_seconds", "counter", "Time spent in the subscriber's handler"),
+        )
+        for field, kind, description in metrics:
+            lines.append(f"# HELP bot_event_subscriber_{field}_total {description}")
+            lines.append(f"# TYPE bot_event_subscriber_{field}_total {kind}")
+            for s in self.subscribers:
+                value = getattr(s, field)
+                value = f"{value:.6f}" if isinstance(value, float) else value
+                lines.append(f'bot_event_subscriber_{field}_total{{subscriber="{s.name}"}} {value}')
+        lines += [
+            "# HELP bot_event_subscriber_queue_depth Events waiting for an async subscriber",
+            "# TYPE bot_event_subscriber_queue_depth gauge",
+        ]
+        for s in self.subscribers:
+            if s.queue is not None:
+                lines.append(f'bot_event_subscriber_queue_depth{{subscriber="{s.name}"}} {s.queue.qsize()}')
+        return "\n".join(lines) + "\n"
+
+def _name(handler: Callable) -> str:
+    """Readable name of a handler (``Class.method`` for bound methods)."""
+    return getattr(handler, "__qualname__", None) or repr(handler)
@@ -1,12 +1,18 @@
 """Game engine - core business logic for the guessing game."""
-import random
 import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Tuple, Dict
-from bot.storage.db import Database
-from bot.storage.models import Game, Round, Guess, GameStatus, RoundStatus
-from bot.services.commit_reveal import make_commit, verify
+from typing import Optional, Tuple, Dict, Set, List
+from bot.storage.base import Storage
+from bot.storage.models import Game, Round, Guess, OutboxMessage, RoundSummary, GameStatus, RoundStatus
+from bot.services.commit_reveal import generate_commit, verify
+from bot.services.outbox import make_announcement
+from bot.services.merkle import MerkleLog, hash_leaf, leaf_data, inclusion_path, tree_root
+from bot.services.status_cache import StatusCache
+from bot.services.events import (
+    EventBus, GameCreated, RoundStarted, RoundPaused, RoundResumed, RoundClosed,
+    GuessRegistered, GameFinished, GameRevealed, GameCanceled
+)
+from bot.utils.clock import SystemClock
 from bot.config import MIN_NUMBER, MAX_NUMBER, get_round_cost, ROUND_DURATION_MINUTES, MIN_GUESSES_BEFORE_CLOSE
 
 logger = logging.getLogger(__name__)
@@ -14,10 +20,129 @@ logger = logging.getLogger(__name__)
 class GameEngine:
     """Main game engine handling all game logic."""
     
-    def __init__(self, db: Database, bot=None):
+    def __init__(
+        self,
+        db: Storage,
+        bot=None,
+        outbox=None,
+        clock=None,
+        commitments=None,
+        status_debounce: float = 0.0,
+        events: Optional[EventBus] = None
+    ):
         self.db = db
         self.bot = bot  # Store bot instance for sending messages
+        self.outbox = outbox  # OutboxDispatcher delivering queued announcements
+        self.clock = clock or SystemClock()  # Time source; a VirtualClock when replaying
+        self.commitments = commitments  # CommitmentPool of pre-generated secrets (optional)
         self.round_timers = {}  # Store active round timers {round_id: task}
+        self.active_round_chats: Set[int] = set()  # Chats with an active or paused round
+        self.game_ranges: Dict[int, Tuple[int, int]] = {}  # Known [low, high] interval per game
+        self.round_logs: Dict[int, MerkleLog] = {}  # Merkle log of guesses per open round
+        self.round_log_locks: Dict[int, asyncio.Lock] = {}  # Serializes appends to each round's log
+        self.won_rounds: Set[int] = set()  # Rounds whose winning guess is logged, until the game is finished
+        self.events = events or EventBus()  # Side effects of state changes subscribe here
+        self.status_cache = StatusCache(status_debounce, clock=self.clock)  # Rendered /status per chat
+        self.events.subscribe_sync(self.status_cache.on_event)
+        if outbox:
+            self.events.subscribe_sync(self._wake_outbox, RoundClosed, GameFinished, GameCanceled)
+    
+    async def load_active_round_chats(self):
+        """Load the set of chats that currently have an active or paused round."""
+        self.active_round_chats = set(await self.db.get_chats_with_active_round())
+    
+    def known_range(self, game_id: int, round_obj: Optional[Round] = None) -> Tuple[int, int]:
+        """
+        Get the interval the secret number is known to lie in, from the hints given so far.
+        
+        Falls back to the bounds persisted on ``round_obj`` (e.g. after a restart)
+        and then to the full number range.
+        
+        Args:
+            game_id: The game ID
+            round_obj: Optional round of the game carrying persisted bounds
+            
+        Returns:
+            Tuple of (low, high), both inclusive
+        """
+        bounds = self.game_ranges.get(game_id)
+        if bounds is None:
+            low, high = MIN_NUMBER, MAX_NUMBER
+            if round_obj is not None and round_obj.range_low is not None:
+                low, high = round_obj.range_low, round_obj.range_high
+            bounds = self.game_ranges[game_id] = (low, high)
+        return bounds
+    
+    def is_ruled_out(self, game_id: int, guess_value: int, round_obj: Optional[Round] = None) -> bool:
+        """Check whether a guess lies outside the known interval (no database access)."""
+        low, high = self.known_range(game_id, round_obj)
+        return not low <= guess_value <= high
+    
+    async def _initial_range(self, game_id: int) -> Tuple[int, int]:
+        """Get the known interval for a game, reading the last round's bounds if not cached."""
+        if game_id not in self.game_ranges:
+            rounds = await self.db.get_rounds_for_game(game_id)
+            return self.known_range(game_id, rounds[-1] if rounds else None)
+        return self.game_ranges[game_id]
+    
+    async def round_log(self, round_id: int) -> MerkleLog:
+        """Get a round's Merkle log, loading its stored frontier if not cached."""
+        log = self.round_logs.get(round_id)
+        if log is None:
+            round_obj = await self.db.get_round(round_id)
+            log = MerkleLog.from_state(round_obj.log_size, round_obj.log_frontier) if round_obj else MerkleLog()
+            self.round_logs[round_id] = log
+        return log
+    
+    async def _open_round_log(self, round_id: int, lock: asyncio.Lock) -> Optional[MerkleLog]:
+        """
+        Get the log of a round that still takes guesses, called holding ``lock``.
+        
+        Returns None if the round was forgotten while ``lock`` was awaited, if
+        it already has a winning guess, or if its stored status (or its game's)
+        no longer takes guesses.
+        """
+        if self.round_log_locks.get(round_id) is not lock or round_id in self.won_rounds:
+            return None
+        log = self.round_logs.get(round_id)
+        if log is None:
+            round_obj = await self.db.get_round(round_id)
+            game = await self.db.get_game(round_obj.game_id) if round_obj else None
+            if (
+                round_obj is None or round_obj.status != RoundStatus.ACTIVE
+                or game is None or game.status in (GameStatus.GAME_FINISHED, GameStatus.GAME_CANCELED)
+            ):
+                self.round_log_locks.pop(round_id, None)
+                return None
+            log = self.round_logs[round_id] = MerkleLog.from_state(round_obj.log_size, round_obj.log_frontier)
+        return log
+    
+    def _forget_round(self, round_id: int):
+        """Drop the cached log state of a round that takes no more guesses."""
+        self.round_logs.pop(round_id, None)
+        self.round_log_locks.pop(round_id, None)
+        self.won_rounds.discard(round_id)
+    
+    async def guess_proof(self, guess: Guess) -> Tuple[int, bytes, List[bytes]]:
+        """
+        Build an inclusion proof for a logged guess against its round's current log.
+        
+        Returns:
+            Tuple of (log size, log root, audit path)
+        """
+        leaves = [bytes.fromhex(h) for h in await self.db.get_round_leaves(guess.round_id)]
+        return len(leaves), tree_root(leaves), inclusion_path(leaves, guess.log_index)
+    
+    async def _track_active_chat(self, game_id: int, active: bool) -> Optional[int]:
+        """Add or remove a game's chat from the active round set; returns the chat ID."""
+        game = await self.db.get_game(game_id)
+        if not game:
+            return None
+        if active:
+            self.active_round_chats.add(game.chat_id)
+        else:
+            self.active_round_chats.discard(game.chat_id)
+        return game.chat_id
     
     async def create_game(
         self, 
@@ -40,9 +165,9 @@ class GameEngine:
         Returns:
             Tuple of (Game object, hash message for posting)
         """
-        # Generate random number and commitment
-        secret_number = random.randint(MIN_NUMBER, MAX_NUMBER)
-        number, salt, target_hash = make_commit(secret_number)
+        # Take a pre-generated commitment, or draw one now if the pool is empty
+        commitment = await self.commitments.take() if self.commitments else None
+        number, salt, target_hash = commitment or generate_commit(MIN_NUMBER, MAX_NUMBER)
         
         # Create game in database
         game = Game(
@@ -51,7 +176,7 @@ class GameEngine:
             target_hash=target_hash,
             salt=salt,
             number=number,
-            created_at=datetime.now(),
+            created_at=self.clock.now(),
             prize_amount=prize_amount,
             sponsor_name=sponsor_name,
             sponsor_start_message=sponsor_start_message,
@@ -59,6 +184,7 @@ class GameEngine:
         )
         
         game.id = await self.db.create_game(game)
+        await self.events.publish(GameCreated(game))
         
         return game, target_hash
     
@@ -77,37 +203,45 @@ class GameEngine:
         # Use provided Stars cost or get suggested cost for this round
         cost = stars_cost if stars_cost is not None else get_round_cost(round_index)
         
+        # The interval carries over from the previous rounds of the game
+        range_low, range_high = await self._initial_range(game_id)
+        
         # Create round
         round_obj = Round(
             game_id=game_id,
             round_index=round_index,
             status=RoundStatus.ACTIVE,
             message_cost_hint=cost,
-            started_at=datetime.now(),
-            total_guesses=0
+            started_at=self.clock.now(),
+            total_guesses=0,
+            range_low=range_low,
+            range_high=range_high,
+            timer_deadline=self.clock.time() + ROUND_DURATION_MINUTES * 60
         )
         
         round_obj.id = await self.db.create_round(round_obj)
         
         # Update game status
         await self.db.update_game_status(game_id, GameStatus.ROUND_ACTIVE)
+        chat_id = await self._track_active_chat(game_id, True)
         
         # Start the round timer
-        await self._start_round_timer(round_obj.id, game_id)
+        await self._start_round_timer(round_obj.id, game_id, ROUND_DURATION_MINUTES * 60)
+        await self.events.publish(RoundStarted(round_obj, chat_id))
         
         return round_obj
     
-    async def _start_round_timer(self, round_id: int, game_id: int):
+    async def _start_round_timer(self, round_id: int, game_id: int, delay: float):
         """
-        Start a timer for a round that will auto-close after duration.
+        Start a timer for a round that will auto-close after ``delay`` seconds.
         Round 1: Requires minimum 10 guesses before closing.
         Round 2+: Auto-closes after timer expires regardless of guess count.
         """
         async def timer_task():
             try:
-                logger.info(f"Round timer started for round {round_id}, will check after {ROUND_DURATION_MINUTES} minutes")
-                # Wait for the configured duration
-                await asyncio.sleep(ROUND_DURATION_MINUTES * 60)
+                logger.info(f"Round timer started for round {round_id}, will check after {delay:.0f} seconds")
+                # Wait until the round's deadline
+                await self.clock.sleep(delay)
                 
                 logger.info(f"Round timer expired for round {round_id}, checking status...")
                 # Check if round is still active
@@ -127,7 +261,7 @@ class GameEngine:
                         logger.info(f"Waiting for minimum guesses for round 1...")
                         # Wait until we reach minimum guesses - check every 30 seconds
                         while True:
-                            await asyncio.sleep(30)
+                            await self.clock.sleep(30)
                             round_obj = await self.db.get_round(round_id)
                             if not round_obj or round_obj.status != RoundStatus.ACTIVE:
                                 logger.info(f"Round 1 is no longer active during wait")
@@ -157,10 +291,7 @@ class GameEngine:
         self.round_timers[round_id] = task
     
     async def _auto_close_round(self, round_id: int, game_id: int):
-        """Auto-close a round and send announcement to chat."""
-        from bot.services.announcer import Announcer
-        from bot.keyboards.admin import AdminKeyboards
-        
+        """Auto-close a round and queue the announcement to the chat."""
         logger.info(f"_auto_close_round called for round {round_id}, game {game_id}")
         
         # Get round and game info
@@ -174,33 +305,72 @@ class GameEngine:
         logger.info(f"Closing round {round_id} for game {game_id} in chat {game.chat_id}")
         
         # Close the round (but don't cancel timer - we're IN the timer)
-        await self.db.close_round(round_id)
-        await self.db.update_game_status(game_id, GameStatus.GAME_COMMITTED)
+        await self._close_round_and_announce(round_obj, game)
+        logger.info(f"Auto-close announcement queued for chat {game.chat_id}")
+    
+    async def _close_round_and_announce(
+        self,
+        round_obj: Round,
+        game: Game,
+        reply_to_message_id: Optional[int] = None
+    ) -> Optional[RoundSummary]:
+        """
+        Close a round, storing its summary and queueing the close announcement.
         
-        # Send announcement if bot is available
-        if self.bot:
-            try:
-                # Calculate next round number
-                all_rounds = await self.db.get_rounds_for_game(game_id)
-                next_round = len(all_rounds) + 1
-                
-                logger.info(f"Sending auto-close announcement to chat {game.chat_id}, next round: {next_round}")
-                
-                # Send announcement with sponsor end message if available
-                announcement = Announcer.round_closed(round_obj.round_index, game.sponsor_end_message)
-                keyboard = AdminKeyboards.between_rounds_controls(next_round)
-                
-                await self.bot.send_message(
-                    chat_id=game.chat_id,
-                    text=announcement,
-                    reply_markup=keyboard,
-                    parse_mode="HTML"
-                )
-                logger.info(f"Auto-close announcement sent successfully to chat {game.chat_id}")
-            except Exception as e:
-                logger.error(f"Failed to send auto-close announcement: {e}", exc_info=True)
-        else:
-            logger.warning("Bot instance not available, cannot send auto-close announcement")
+        The summary, status changes and outbox message are written in one transaction.
+        It holds the round's log lock, so the published root covers every accepted
+        guess and guesses still waiting for the lock are rejected.
+        
+        A round that was closed meanwhile (by a racing close or with its game)
+        is not closed again: its stored summary is returned, if any, and
+        nothing is announced.
+        """
+        from bot.services.announcer import Announcer
+        from bot.keyboards.admin import AdminKeyboards
+        from bot.translations import Translations
+        
+        async with self.round_log_locks.setdefault(round_obj.id, asyncio.Lock()):
+            current = await self.db.get_round(round_obj.id)
+            if current is None or current.status not in (RoundStatus.ACTIVE, RoundStatus.PAUSED):
+                logger.info(f"Round {round_obj.id} is already closed")
+                return await self.db.get_round_summary(round_obj.id)
+            
+            summary = await self.db.compute_round_summary(round_obj.id, game.id, game.number)
+            log = await self.round_log(round_obj.id)
+            summary.log_size = log.size
+            summary.log_root = log.root().hex()
+            if summary.range_low is None:
+                summary.range_low = MIN_NUMBER
+            if summary.range_high is None:
+                summary.range_high = MAX_NUMBER
+            
+            # Calculate next round number
+            all_rounds = await self.db.get_rounds_for_game(game.id)
+            next_round = len(all_rounds) + 1
+            
+            # Announcement with summary and sponsor end message if available
+            announcement = make_announcement(
+                game.chat_id,
+                Announcer.round_closed(
+                    round_obj.round_index,
+                    game.sponsor_end_message,
+                    Translations.chat_language(game.chat_id),
+                    summary
+                ),
+                AdminKeyboards.between_rounds_controls(next_round),
+                reply_to_message_id
+            )
+            
+            await self.db.close_round(round_obj.id, game.id, [announcement], summary)
+            self._forget_round(round_obj.id)
+        self.active_round_chats.discard(game.chat_id)
+        await self.events.publish(RoundClosed(round_obj, game, summary))
+        return summary
+    
+    def _wake_outbox(self, event=None):
+        """Tell the outbox dispatcher that new announcements were committed."""
+        if self.outbox:
+            self.outbox.wake()
     
     async def pause_round(self, round_id: int):
         """Pause the current round."""
@@ -212,6 +382,7 @@ class GameEngine:
             if round_id in self.round_timers:
                 self.round_timers[round_id].cancel()
                 del self.round_timers[round_id]
+            await self.events.publish(RoundPaused(round_obj))
     
     async def resume_round(self, round_id: int):
         """Resume a paused round."""
@@ -219,26 +390,83 @@ class GameEngine:
         if round_obj:
             await self.db.update_round_status(round_id, RoundStatus.ACTIVE)
             await self.db.update_game_status(round_obj.game_id, GameStatus.ROUND_ACTIVE)
-            # Restart the timer with remaining time
-            await self._start_round_timer(round_id, round_obj.game_id)
+            # Restart the timer for a full round duration
+            duration = ROUND_DURATION_MINUTES * 60
+            await self.db.set_round_deadline(round_id, self.clock.time() + duration)
+            await self._start_round_timer(round_id, round_obj.game_id, duration)
+            await self.events.publish(RoundResumed(round_obj))
+    
+    async def restore_round_timers(self) -> int:
+        """
+        Re-arm the timers of active rounds after a restart.
+        
+        Each timer fires at its persisted deadline; rounds from before
+        deadlines were stored fall back to their start time plus the round
+        duration. Overdue timers fire right away.
+        
+        Returns:
+            Number of timers armed
+        """
+        armed = 0
+        for round_obj in await self.db.get_timed_rounds():
+            if round_obj.id in self.round_timers:
+                continue
+            deadline = round_obj.timer_deadline
+            if deadline is None:
+                started = round_obj.started_at.timestamp() if round_obj.started_at else self.clock.time()
+                deadline = started + ROUND_DURATION_MINUTES * 60
+            await self._start_round_timer(round_obj.id, round_obj.game_id, max(0.0, deadline - self.clock.time()))
+            armed += 1
+        if armed:
+            logger.info(f"Restored {armed} round timer(s)")
+        return armed
     
-    async def close_round(self, round_id: int):
-        """Close the current round."""
+    async def stop_round_timers(self) -> int:
+        """
+        Cancel every round timer without closing its round, e.g. on shutdown.
+        
+        Deadlines stay persisted, so ``restore_round_timers`` picks them up again.
+        
+        Returns:
+            Number of timers stopped
+        """
+        tasks = list(self.round_timers.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.round_timers.clear()
+        return len(tasks)
+    
+    async def close_round(self, round_id: int, reply_to_message_id: Optional[int] = None) -> Optional[RoundSummary]:
+        """
+        Close the current round and queue its summary announcement.
+        
+        Args:
+            round_id: The round ID
+            reply_to_message_id: Optional message the announcement replies to
+            
+        Returns:
+            The round summary, or None if the round doesn't exist or was
+            closed along with its game
+        """
         round_obj = await self.db.get_round(round_id)
-        if round_obj:
-            await self.db.close_round(round_id)
-            await self.db.update_game_status(round_obj.game_id, GameStatus.GAME_COMMITTED)
+        game = await self.db.get_game(round_obj.game_id) if round_obj else None
+        summary = None
+        if round_obj and game:
+            summary = await self._close_round_and_announce(round_obj, game, reply_to_message_id)
             # Cancel the timer if it exists
             if round_id in self.round_timers:
                 self.round_timers[round_id].cancel()
                 del self.round_timers[round_id]
+        return summary
     
     async def register_guess(
         self, 
         game_id: int, 
         round_id: int, 
         user_id: int, 
-        guess_value: int
+        guess_value: int,
+        message_id: Optional[int] = None
     ) -> Tuple[bool, Optional[Guess]]:
         """
         Register a player's guess.
@@ -248,9 +476,13 @@ class GameEngine:
             round_id: The round ID
             user_id: The user's Telegram ID
             guess_value: The guessed number
+            message_id: The Telegram message ID carrying the guess
             
         Returns:
-            Tuple of (is_correct, Guess object)
+            Tuple of (is_correct, Guess object); the Guess is None if the
+            game is gone, the round stopped taking guesses or the message
+            was already registered. Once a correct guess is registered the
+            round takes no more guesses, so only the first one wins.
         """
         # Get the game to check the secret number
         game = await self.db.get_game(game_id)
@@ -267,44 +499,107 @@ class GameEngine:
             user_id=user_id,
             value=guess_value,
             is_correct=is_correct,
-            created_at=datetime.now()
+            created_at=self.clock.now(),
+            message_id=message_id
         )
         
-        guess.id = await self.db.create_guess(guess)
+        # Append to the round's Merkle log; the lock makes log order the acceptance order
+        lock = self.round_log_locks.setdefault(round_id, asyncio.Lock())
+        async with lock:
+            log = await self._open_round_log(round_id, lock)
+            if log is None:
+                # The round was closed or won while this guess was on its way
+                return False, None
+            log = log.copy()
+            leaf = hash_leaf(leaf_data(round_id, user_id, guess_value, message_id))
+            guess.log_index = log.append(leaf)
+            guess.leaf_hash = leaf.hex()
+            
+            guess.id = await self.db.create_guess(guess, log.state())
+            if guess.id is None:
+                # Redelivered message: already counted, nothing to update
+                return False, None
+            self.round_logs[round_id] = log
+            if is_correct:
+                # The winner's log position is final: later guesses are rejected
+                self.won_rounds.add(round_id)
+        
+        # Narrow the known interval in O(1): every wrong guess gets a higher/lower hint.
+        # Starts from the persisted bounds if not cached (after a restart)
+        low, high = await self._initial_range(game_id)
+        if guess_value < game.number:
+            low = max(low, guess_value + 1)
+        elif guess_value > game.number:
+            high = min(high, guess_value - 1)
+        self.game_ranges[game_id] = (low, high)
         
         # Update participation
         await self.db.increment_participation(game_id, round_id, user_id)
         
-        # Increment round guess count
-        await self.db.increment_round_guesses(round_id)
+        # Increment round guess count and persist the interval with it
+        await self.db.increment_round_guesses(round_id, low, high)
+        await self.events.publish(GuessRegistered(game, guess, (low, high)))
         
         return is_correct, guess
     
-    async def finish_game(self, game_id: int, winner_user_id: int):
+    async def finish_game(
+        self,
+        game_id: int,
+        winner_user_id: int,
+        announcement: Optional[OutboxMessage] = None
+    ) -> bool:
         """
         Finish the game with a winner.
         
         Args:
             game_id: The game ID
             winner_user_id: The winning user's Telegram ID
+            announcement: Optional winner announcement, queued in the same transaction
+            
+        Returns:
+            True if the game was finished, False if it had already ended
+            (nothing is written or announced then)
         """
-        await self.db.finish_game(game_id, winner_user_id)
-        
-        # Cancel any active round timers
         active_round = await self.db.get_active_round(game_id)
-        if active_round and active_round.id in self.round_timers:
-            self.round_timers[active_round.id].cancel()
-            del self.round_timers[active_round.id]
+        if not await self.db.finish_game(game_id, winner_user_id, [announcement] if announcement else []):
+            logger.warning(f"Game {game_id} already ended, not recording winner {winner_user_id}")
+            return False
+        chat_id = await self._track_active_chat(game_id, False)
+        self.game_ranges.pop(game_id, None)
+        self._end_round(active_round)
+        await self.events.publish(GameFinished(game_id, chat_id, winner_user_id))
+        return True
+    
+    async def reveal_game(self, game_id: int):
+        """Finish the game without a winner after a manual reveal."""
+        active_round = await self.db.get_active_round(game_id)
+        await self.db.update_game_status(game_id, GameStatus.GAME_FINISHED)
+        chat_id = await self._track_active_chat(game_id, False)
+        self.game_ranges.pop(game_id, None)
+        self._end_round(active_round)
+        await self.events.publish(GameRevealed(game_id, chat_id))
     
-    async def cancel_game(self, game_id: int):
-        """Cancel the current game."""
-        await self.db.update_game_status(game_id, GameStatus.GAME_CANCELED)
-        
-        # Cancel any active round timers
+    async def cancel_game(self, game_id: int, announcement: Optional[OutboxMessage] = None):
+        """Cancel the current game, queueing an optional announcement with it."""
         active_round = await self.db.get_active_round(game_id)
-        if active_round and active_round.id in self.round_timers:
-            self.round_timers[active_round.id].cancel()
-            del self.round_timers[active_round.id]
+        await self.db.update_game_status(
+            game_id,
+            GameStatus.GAME_CANCELED,
+            [announcement] if announcement else []
+        )
+        chat_id = await self._track_active_chat(game_id, False)
+        self.game_ranges.pop(game_id, None)
+        self._end_round(active_round)
+        await self.events.publish(GameCanceled(game_id, chat_id))
+    
+    def _end_round(self, round_obj: Optional[Round]):
+        """Drop the log state and timer of a round closed together with its game."""
+        if round_obj is None:
+            return
+        self._forget_round(round_obj.id)
+        timer = self.round_timers.pop(round_obj.id, None)
+        if timer:
+            timer.cancel()
     
     async def compute_loyalty_for_winner(self, game_id: int, winner_user_id: int) -> int:
         """
@@ -369,9 +664,32 @@ class GameEngine:
         
         if active_round:
             status['last_guess'] = await self.db.get_last_guess(active_round.id)
+        elif status['all_rounds']:
+            # Between rounds: show the stored summary of the last closed round
+            status['last_summary'] = await self.db.get_round_summary(status['all_rounds'][-1].id)
         
         return status
     
+    async def status_text(self, chat_id: int, lang: str) -> Optional[str]:
+        """
+        Get the rendered /status of a chat from the status cache.
+        
+        Args:
+            chat_id: The Telegram chat ID
+            lang: Language to render in
+        
+        Returns:
+            The status message, or None if the chat has no active game
+        """
+        from bot.services.announcer import Announcer
+        
+        return await self.status_cache.text(
+            chat_id,
+            lang,
+            lambda: self.get_status(chat_id),
+            Announcer.status
+        )
+    
     async def verify_game(self, game_id: int) -> bool:
         """
         Verify the game's commitment (for revealing).
@@ -0,0 +1,244 @@
+"""Event loop watchdog and the local health/readiness HTTP endpoints.
+
+``LoopWatchdog`` measures how late the event loop wakes a periodic
+heartbeat (loop lag). A watchdog thread notices when the heartbeat stops
+arriving and records the loop thread's stack while it is still blocked,
+so a stall caught in sync logging, a slow handler or a blocking call shows
+where it happened.
+
+``HealthServer`` serves, on a local port:
+
+- ``/healthz``: liveness (the loop answers; current and worst lag)
+- ``/readyz``: readiness (not shutting down, database reachable, round
+  timers alive, outbox depth, age of the last update)
+- ``/metrics``: loop lag and any registered metrics, in the Prometheus
+  text format
+
+The probes return JSON, with status 200 when healthy and 503 otherwise.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+class LoopWatchdog:
+    """
+    Measures event loop lag and samples the loop's stack when it stalls.
+    
+    The heartbeat task sleeps ``interval`` seconds at a time; lag is how
+    much later than that it actually wakes. The watchdog thread checks the
+    heartbeat from outside the loop, and when it is more than ``threshold``
+    overdue, records the loop thread's current stack once per stall.
+    """
+    
+    def __init__(self, interval: float = 0.5, threshold: float = 0.25, max_samples: int = 20):
+        self.interval = interval
+        self.threshold = threshold
+        self.lag = 0.0  # Lag of the latest heartbeat, in seconds
+        self.max_lag = 0.0
+        self.stalls = 0
+        self.samples: Deque[Dict[str, Any]] = deque(maxlen=max_samples)
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+    
+    @property
+    def running(self) -> bool:
+        """Whether the heartbeat task is alive."""
+        return self._task is not None and not self._task.done()
+    
+    def heartbeat_age(self) -> float:
+        """Seconds since the heartbeat last ran."""
+        return time.monotonic() - self._last_beat
+    
+    def start(self):
+        """Start the heartbeat task and the watchdog thread (call from the loop)."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._beat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info("Loop watchdog started")
+    
+    async def stop(self):
+        """Stop the heartbeat task and the watchdog thread."""
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2)
+            self._thread = None
+        logger.info("Loop watchdog stopped")
+    
+    async def _beat(self):
+        """Heartbeat: sleep ``interval`` and record how late the wake-up was."""
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.lag = max(0.0, now - started - self.interval)
+            self.max_lag = max(self.max_lag, self.lag)
+            self._last_beat = now
+            if self.lag > self.threshold:
+                logger.warning(f"Event loop lag {self.lag * 1000:.0f} ms")
+    
+    def _watch(self):
+        """Watchdog thread: sample the loop thread's stack while the heartbeat is overdue."""
+        stalled = False
+        while not self._stopping.wait(self.threshold / 2):
+            overdue = self.heartbeat_age() - self.interval
+            if overdue <= self.threshold:
+                stalled = False
+                continue
+            if stalled:
+                continue
+            stalled = True
+            self.stalls += 1
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+            self.samples.append({"at": time.time(), "overdue_ms": round(overdue * 1000), "stack": stack})
+            logger.warning(f"Event loop blocked for {overdue * 1000:.0f} ms, stack of the loop thread:\n{stack}")
+
+class HealthServer:
+    """
+    Local HTTP server for liveness and readiness probes.
+    
+    Other diagnostics can add their own routes to ``app`` before ``start``.
+    """
+    
+    def __init__(
+        self,
+        engine,
+        watchdog: LoopWatchdog,
+        host: str = "127.0.0.1",
+        port: int = 8081,
+        max_outbox_depth: int = 500,
+        max_update_age: float = 0.0,
+        db_timeout: float = 2.0
+    ):
+        self.engine = engine
+        self.watchdog = watchdog
+        self.host = host
+        self.port = port
+        self.max_outbox_depth = max_outbox_depth
+        self.max_update_age = max_update_age  # 0 = report the age without failing on it
+        self.db_timeout = db_timeout
+        self.last_update_at: Optional[float] = None
+        self.draining = False  # Set on shutdown so the orchestrator stops routing here
+        self.metrics: List[Callable[[], str]] = []  # Extra Prometheus text sources
+        self.app = web.Application()
+        self.app.router.add_get("/healthz", self.handle_healthz)
+        self.app.router.add_get("/readyz", self.handle_readyz)
+        self.app.router.add_get("/metrics", self.handle_metrics)
+        self._runner: Optional[web.AppRunner] = None
+    
+    def add_metrics(self, source: Callable[[], str]):
+        """Register a callable returning Prometheus text to include in ``/metrics``."""
+        self.metrics.append(source)
+    
+    def mark_update(self):
+        """Record that an update from Telegram was just received."""
+        self.last_update_at = time.monotonic()
+    
+    async def start(self):
+        """Start serving on ``host:port``."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Health endpoints listening on http://{self.host}:{self.port}")
+    
+    async def stop(self):
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+    
+    def liveness(self) -> Tuple[bool, Dict[str, Any]]:
+        """The loop is answering; report its lag."""
+        watchdog = self.watchdog
+        return watchdog.running, {
+            "loop_lag_ms": round(watchdog.lag * 1000, 1),
+            "max_loop_lag_ms": round(watchdog.max_lag * 1000, 1),
+            "stalls": watchdog.stalls,
+        }
+    
+    async def readiness(self) -> Tuple[bool, Dict[str, Any]]:
+        """Run every readiness check; ready only if all pass."""
+        checks: Dict[str, Dict[str, Any]] = {"shutdown": {"ok": not self.draining}}
+        
+        # Database: a trivial query must complete in time
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.engine.db.ping(), self.db_timeout)
+            checks["database"] = {"ok": True, "ms": round((time.perf_counter() - started) * 1000, 1)}
+        except Exception as e:
+            checks["database"] = {"ok": False, "error": repr(e)}
+        
+        # Round timers: the loop still fires its timers on time, and no timer died unnoticed
+        timers = list(self.engine.round_timers.values())
+        dead = sum(1 for task in timers if task.done())
+        heartbeat_age = self.watchdog.heartbeat_age()
+        checks["timers"] = {
+            "ok": self.watchdog.running and dead == 0
+                  and heartbeat_age <= self.watchdog.interval + self.watchdog.threshold,
+            "running": len(timers) - dead,
+            "dead": dead,
+            "heartbeat_age_ms": round(heartbeat_age * 1000, 1),
+        }
+        
+        # Outbox: announcements are being delivered
+        try:
+            depth = await asyncio.wait_for(self.engine.db.count_pending_outbox(), self.db_timeout)
+            checks["outbox"] = {"ok": depth <= self.max_outbox_depth, "depth": depth}
+        except Exception as e:
+            checks["outbox"] = {"ok": False, "error": repr(e)}
+        
+        # Updates: how long since Telegram last delivered one
+        age = None if self.last_update_at is None else time.monotonic() - self.last_update_at
+        checks["updates"] = {
+            "ok": not self.max_update_age or (age is not None and age <= self.max_update_age),
+            "last_update_age_s": None if age is None else round(age, 1),
+        }
+        
+        return all(check["ok"] for check in checks.values()), checks
+    
+    async def handle_healthz(self, request: web.Request) -> web.Response:
+        """GET /healthz"""
+        ok, details = self.liveness()
+        return web.json_response({"status": "ok" if ok else "fail", **details}, status=200 if ok else 503)
+    
+    async def handle_readyz(self, request: web.Request) -> web.Response:
+        """GET /readyz"""
+        ok, checks = await self.readiness()
+        return web.json_response({"status": "ok" if ok else "fail", "checks": checks}, status=200 if ok else 503)
+    
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        """GET /metrics"""
+        watchdog = self.watchdog
+        text = (
+            "# HELP bot_loop_lag_seconds Event loop lag of the latest heartbeat\n"
+            "# TYPE bot_loop_lag_seconds gauge\n"
+            f"bot_loop_lag_seconds {watchdog.lag:.6f}\n"
+            "# HELP bot_loop_stalls_total Times the event loop was blocked past the threshold\n"
+            "# TYPE bot_loop_stalls_total counter\n"
+            f"bot_loop_stalls_total {watchdog.stalls}\n"
+        )
+        text += "".join(source() for source in self.metrics)
+        return web.Response(text=text, content_type="text/plain")
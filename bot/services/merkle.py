@@ -0,0 +1,149 @@
+"""Append-only Merkle log of the guesses in a round.
+
+Every registered guess becomes a leaf, in the order the bot accepted it, so
+"first correct guess wins" can be checked by anyone holding the published
+root. Hashing follows RFC 6962 (Certificate Transparency):
+``leaf = sha256(0x00 || data)`` and ``node = sha256(0x01 || left || right)``.
+
+The log only keeps the roots of its perfect subtrees (the frontier), so an
+append costs O(log n) hashes and at most log2(n) + 1 stored hashes, and the
+root is available at any time without rehashing earlier guesses.
+
+Usage (verify an inclusion proof posted by /proof):
+    python -m bot.services.merkle --leaf ROUND:USER:VALUE:MESSAGE --index I
+                                  --size N --root HEX [PATH_HEX ...]
+"""
+import argparse
+import hashlib
+import json
+from typing import List, Optional, Sequence
+
+_EMPTY_ROOT = hashlib.sha256(b"").digest()
+
+def leaf_data(round_id: int, user_id: int, value: int, message_id: Optional[int]) -> str:
+    """Canonical leaf content of a guess; everything a player can see for themselves."""
+    return f"{round_id}:{user_id}:{value}:{message_id or 0}"
+
+def hash_leaf(data: str) -> bytes:
+    """Hash leaf content (0x00 domain prefix)."""
+    return hashlib.sha256(b"\x00" + data.encode()).digest()
+
+def hash_node(left: bytes, right: bytes) -> bytes:
+    """Hash two child nodes (0x01 domain prefix)."""
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+class MerkleLog:
+    """
+    Incremental Merkle tree keeping only its frontier.
+    
+    ``frontier`` holds the roots of the perfect subtrees that make up the
+    tree, largest first; their sizes are the set bits of ``size``.
+    """
+    __slots__ = ("size", "frontier")
+    
+    def __init__(self, size: int = 0, frontier: Optional[List[bytes]] = None):
+        self.size = size
+        self.frontier = frontier or []
+    
+    @classmethod
+    def from_state(cls, size: Optional[int], frontier: Optional[str]) -> "MerkleLog":
+        """Rebuild a log from the state stored on a round."""
+        return cls(size or 0, [bytes.fromhex(h) for h in json.loads(frontier or "[]")])
+    
+    def state(self) -> str:
+        """Serialize the frontier for storage."""
+        return json.dumps([h.hex() for h in self.frontier])
+    
+    def copy(self) -> "MerkleLog":
+        """Copy the log; only the frontier is duplicated."""
+        return MerkleLog(self.size, list(self.frontier))
+    
+    def append(self, leaf: bytes) -> int:
+        """
+        Append a leaf hash in O(log n).
+        
+        Returns:
+            The leaf's index
+        """
+        index = self.size
+        node = leaf
+        # Merge with every complete subtree of the same size, like a binary carry
+        n = index
+        while n & 1:
+            node = hash_node(self.frontier.pop(), node)
+            n >>= 1
+        self.frontier.append(node)
+        self.size += 1
+        return index
+    
+    def root(self) -> bytes:
+        """Tree root, folding the frontier from the smallest subtree up."""
+        if not self.frontier:
+            return _EMPTY_ROOT
+        node = self.frontier[-1]
+        for left in reversed(self.frontier[:-1]):
+            node = hash_node(left, node)
+        return node
+
+def tree_root(leaves: Sequence[bytes]) -> bytes:
+    """Root of the tree over ``leaves``."""
+    log = MerkleLog()
+    for leaf in leaves:
+        log.append(leaf)
+    return log.root()
+
+def inclusion_path(leaves: Sequence[bytes], index: int) -> List[bytes]:
+    """
+    Audit path for ``leaves[index]`` in the tree over ``leaves`` (RFC 6962 PATH).
+    
+    Returns:
+        Sibling hashes from the leaf up to the root
+    """
+    if len(leaves) <= 1:
+        return []
+    split = 1 << ((len(leaves) - 1).bit_length() - 1)  # Largest power of two < n
+    if index < split:
+        return inclusion_path(leaves[:split], index) + [tree_root(leaves[split:])]
+    return inclusion_path(leaves[split:], index - split) + [tree_root(leaves[:split])]
+
+def verify_inclusion(leaf: bytes, index: int, size: int, path: Sequence[bytes], root: bytes) -> bool:
+    """Check an audit path against a root (RFC 9162, section 2.1.3.2)."""
+    if index >= size:
+        return False
+    fn, sn = index, size - 1
+    node = leaf
+    for sibling in path:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            node = hash_node(sibling, node)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            node = hash_node(node, sibling)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and node == root
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Verify a guess log inclusion proof")
+    parser.add_argument("--leaf", required=True, help="Leaf content, ROUND:USER:VALUE:MESSAGE")
+    parser.add_argument("--index", type=int, required=True, help="Position of the guess in the log")
+    parser.add_argument("--size", type=int, required=True, help="Number of guesses in the log")
+    parser.add_argument("--root", required=True, help="Published log root (hex)")
+    parser.add_argument("path", nargs="*", help="Audit path hashes (hex), leaf to root")
+    args = parser.parse_args(argv)
+    
+    valid = verify_inclusion(
+        hash_leaf(args.leaf),
+        args.index,
+        args.size,
+        [bytes.fromhex(h) for h in args.path],
+        bytes.fromhex(args.root)
+    )
+    print(f"Proof {'valid' if valid else 'INVALID'}: leaf {args.index} of a {args.size}-guess log")
+    return 0 if valid else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,183 @@
+"""Outbox dispatcher - reliable, at-least-once delivery of announcements."""
+import asyncio
+import logging
+from typing import Optional
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError, TelegramRetryAfter
+from aiogram.types import InlineKeyboardMarkup
+from bot.storage.db import Database
+from bot.storage.models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+def make_announcement(
+    chat_id: int,
+    text: str,
+    reply_markup: Optional[InlineKeyboardMarkup] = None,
+    reply_to_message_id: Optional[int] = None
+) -> OutboxMessage:
+    """
+    Build an outbox message for a chat announcement.
+    
+    Args:
+        chat_id: Target chat
+        text: HTML message text
+        reply_markup: Optional inline keyboard
+        reply_to_message_id: Optional message to reply to
+        
+    Returns:
+        OutboxMessage ready to be enqueued with a state change
+    """
+    markup_json = reply_markup.model_dump_json(exclude_none=True) if reply_markup else None
+    return OutboxMessage(
+        chat_id=chat_id,
+        text=text,
+        reply_markup=markup_json,
+        reply_to_message_id=reply_to_message_id
+    )
+
+class OutboxDispatcher:
+    """
+    Background task that drains the outbox table.
+    
+    Messages are fetched in batches, oldest first, and marked sent only
+    after Telegram accepted them (at-least-once). Failures are retried
+    with exponential backoff; a chat's later messages are not fetched
+    until its failed one is delivered or given up on, so per-chat order
+    is kept. Permanent errors (bot removed, chat gone) and messages past
+    ``max_attempts`` are given up on.
+    """
+    
+    def __init__(
+        self,
+        db: Database,
+        bot,
+        batch_size: int = 20,
+        poll_interval: float = 5.0,
+        max_attempts: int = 10,
+        base_backoff: float = 2.0,
+        max_backoff: float = 300.0
+    ):
+        self.db = db
+        self.bot = bot
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start the background dispatch loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Outbox dispatcher started")
+    
+    async def stop(self):
+        """Stop the background dispatch loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Outbox dispatcher stopped")
+    
+    async def drain(self):
+        """Stop the dispatch loop, then send every message that is due now."""
+        await self.stop()
+        while await self.flush():
+            pass
+    
+    def wake(self):
+        """Signal that new messages were committed and should be sent now."""
+        self._wake.set()
+    
+    async def _run(self):
+        """Dispatch loop: flush on wake-up or every poll interval."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            
+            try:
+                # Keep flushing while full batches come back
+                while await self.flush() >= self.batch_size:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Outbox flush failed: {e}", exc_info=True)
+    
+    async def flush(self) -> int:
+        """
+        Send one batch of due messages.
+        
+        Returns:
+            Number of messages attempted in this batch; messages skipped
+            behind a failure in the same chat are not counted
+        """
+        messages = await self.db.get_due_outbox(self.db.clock.time(), self.batch_size)
+        if not messages:
+            return 0
+        
+        sent_ids = []
+        blocked_chats = set()
+        skipped = 0
+        for message in messages:
+            if message.chat_id in blocked_chats:
+                skipped += 1
+                continue
+            try:
+                await self._send(message)
+                sent_ids.append(message.id)
+            except Exception as e:
+                blocked_chats.add(message.chat_id)
+                await self._record_failure(message, e)
+        
+        if sent_ids:
+            await self.db.mark_outbox_sent(sent_ids, self.db.clock.time())
+            logger.info(f"Outbox delivered {len(sent_ids)} message(s)")
+        
+        return len(messages) - skipped
+    
+    async def _send(self, message: OutboxMessage):
+        """Deliver a single outbox message."""
+        reply_markup = None
+        if message.reply_markup:
+            reply_markup = InlineKeyboardMarkup.model_validate_json(message.reply_markup)
+        
+        await self.bot.send_message(
+            chat_id=message.chat_id,
+            text=message.text,
+            reply_markup=reply_markup,
+            reply_to_message_id=message.reply_to_message_id,
+            allow_sending_without_reply=True,
+            parse_mode="HTML"
+        )
+    
+    async def _record_failure(self, message: OutboxMessage, error: Exception):
+        """Schedule a retry for a failed message, or give up on it."""
+        attempts = message.attempts + 1
+        
+        if isinstance(error, (TelegramForbiddenError, TelegramBadRequest)) or attempts >= self.max_attempts:
+            next_attempt_at = None
+            logger.error(
+                f"Giving up on outbox message {message.id} to chat {message.chat_id} "
+                f"after {attempts} attempt(s): {error}"
+            )
+        else:
+            if isinstance(error, TelegramRetryAfter):
+                delay = error.retry_after
+            else:
+                delay = min(self.max_backoff, self.base_backoff * (2 ** (attempts - 1)))
+            next_attempt_at = self.db.clock.time() + delay
+            logger.warning(
+                f"Outbox message {message.id} to chat {message.chat_id} failed "
+                f"(attempt {attempts}), retrying in {delay:.0f}s: {error}"
+            )
+        
+        await self.db.mark_outbox_failed(message.id, attempts, next_attempt_at, str(error))
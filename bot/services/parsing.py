@@ -1,10 +1,36 @@
 """Parsing utilities for handling multi-language input."""
 import re
 from typing import Optional
+from bot.config import MAX_NUMBER
 
-# Digit translation tables
-PERSIAN_TO_ENGLISH = str.maketrans('۰۱۲۳۴۵۶۷۸۹', '0123456789')
-ARABIC_TO_ENGLISH = str.maketrans('٠١٢٣٤٥٦٧٨٩', '0123456789')
+# Single translation table for Persian (۰-۹) and Arabic (٠-٩) digits
+DIGITS_TO_ENGLISH = str.maketrans('۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩', '01234567890123456789')
+
+# Longest digit run that can still be a valid guess
+MAX_GUESS_DIGITS = len(str(MAX_NUMBER))
+
+# First standalone number, including digit groups ("5,000", "5.000"). Only a
+# plain run of at most MAX_GUESS_DIGITS digits is a guess; longer runs (phone
+# numbers, IDs) reject the message and are never converted with int()
+GUESS_PATTERN = re.compile(r'\b[0-9]+(?:[,.٬][0-9]+)*\b')
+
+# Strict mode: the whole (stripped) message must be the number
+STRICT_GUESS_PATTERN = re.compile(rf'[0-9]{{1,{MAX_GUESS_DIGITS}}}')
+
+# Any digit in a supported script (English, Persian, Arabic)
+ANY_DIGIT_PATTERN = re.compile('[0-9۰-۹٠-٩]')
+
+def contains_digit(text: str) -> bool:
+    """
+    Check whether text contains at least one digit in a supported script.
+    
+    Args:
+        text: Input text
+        
+    Returns:
+        True if a digit is present, False otherwise
+    """
+    return ANY_DIGIT_PATTERN.search(text) is not None
 
 def normalize_digits(text: str) -> str:
     """
@@ -16,33 +42,31 @@ def normalize_digits(text: str) -> str:
     Returns:
         Text with all numerals converted to English
     """
-    # First convert Persian digits
-    text = text.translate(PERSIAN_TO_ENGLISH)
-    # Then convert Arabic digits
-    text = text.translate(ARABIC_TO_ENGLISH)
-    return text
+    return text.translate(DIGITS_TO_ENGLISH)
 
-def extract_guess(text: str) -> Optional[int]:
+def extract_guess(text: str, strict: bool = False) -> Optional[int]:
     """
     Extract a numeric guess from user message text.
     
     Args:
         text: User message text
+        strict: If True, the whole message must be the number
         
     Returns:
         Integer guess if found and valid, None otherwise
     """
-    # Normalize digits first
-    normalized = normalize_digits(text.strip())
-    
-    # Try to extract a number
-    # Look for standalone numbers (not part of a larger word)
-    match = re.search(r'\b(\d+)\b', normalized)
+    normalized = text.strip().translate(DIGITS_TO_ENGLISH)
     
-    if match:
-        try:
-            return int(match.group(1))
-        except ValueError:
-            return None
+    if strict:
+        match = STRICT_GUESS_PATTERN.fullmatch(normalized)
+    else:
+        # Look for standalone numbers (not part of a larger word)
+        match = GUESS_PATTERN.search(normalized)
     
-    return None
+    if match is None:
+        return None
+    number = match.group(0)
+    if not number.isdigit() or len(number) > MAX_GUESS_DIGITS:
+        # Digit-grouped or over-long: not a guess, and no later number is taken instead
+        return None
+    return int(number)
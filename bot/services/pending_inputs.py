@@ -0,0 +1,134 @@
+"""Bounded, expiring store for pending admin inputs (e.g. Stars cost prompts)."""
+import logging
+from collections import OrderedDict
+from typing import Optional
+from bot.utils.clock import SystemClock
+
+logger = logging.getLogger(__name__)
+
+class PendingInputStore:
+    """
+    Maps chat_id -> pending round index with TTL expiry and a size cap.
+    
+    Expired entries are removed lazily on access and by a periodic sweep
+    (every ``sweep_every`` writes). When the cap is reached the oldest
+    entry is evicted. If a database is attached, entries are persisted so
+    they survive restarts.
+    
+    With a database, ``lookup`` treats it as the source of truth: hits are
+    re-read, and misses are remembered for ``miss_ttl`` seconds (until the
+    next ``set`` for the chat) so chats with nothing pending cost no query
+    per message. Like the rest of the bot's in-process state, the store
+    assumes every chat is served by a single bot instance.
+    """
+    
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        sweep_every: int = 100,
+        clock=None,
+        miss_ttl: float = 2.0
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.sweep_every = sweep_every
+        self.miss_ttl = miss_ttl
+        self.db = None
+        self.clock = clock or SystemClock()
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()  # chat_id -> (round_index, expires_at)
+        self._misses: "OrderedDict[int, float]" = OrderedDict()  # chat_id -> negative cache expiry
+        self._writes = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def attach(self, db):
+        """Enable persistence to the given database."""
+        self.db = db
+    
+    async def load(self):
+        """Load unexpired entries from the attached database."""
+        if not self.db:
+            return
+        now = self.clock.time()
+        await self.db.delete_expired_pending_inputs(now)
+        for chat_id, round_index, expires_at in await self.db.get_pending_inputs(now):
+            self._entries[chat_id] = (round_index, expires_at)
+        logger.info(f"Loaded {len(self._entries)} pending admin inputs")
+    
+    def get(self, chat_id: int) -> Optional[int]:
+        """Get the pending round index for a chat from memory only."""
+        entry = self._entries.get(chat_id)
+        if entry is None:
+            return None
+        if entry[1] <= self.clock.time():
+            del self._entries[chat_id]
+            return None
+        return entry[0]
+    
+    async def lookup(self, chat_id: int) -> Optional[int]:
+        """Get the pending round index, from the database if one is attached."""
+        if not self.db:
+            return self.get(chat_id)
+        
+        now = self.clock.time()
+        miss_until = self._misses.get(chat_id)
+        if miss_until is not None:
+            if miss_until > now:
+                return None
+            del self._misses[chat_id]
+        
+        row = await self.db.get_pending_input(chat_id, now)
+        if row is None:
+            self._entries.pop(chat_id, None)
+            self._remember_miss(chat_id, now)
+            return None
+        round_index, expires_at = row
+        self._entries[chat_id] = (round_index, expires_at)
+        return round_index
+    
+    def _remember_miss(self, chat_id: int, now: float):
+        self._misses.pop(chat_id, None)
+        self._misses[chat_id] = now + self.miss_ttl
+        while len(self._misses) > self.max_entries:
+            self._misses.popitem(last=False)
+    
+    async def set(self, chat_id: int, round_index: int):
+        """Store a pending round index for a chat."""
+        expires_at = self.clock.time() + self.ttl_seconds
+        self._misses.pop(chat_id, None)
+        self._entries.pop(chat_id, None)
+        self._entries[chat_id] = (round_index, expires_at)
+        
+        self._writes += 1
+        if self._writes % self.sweep_every == 0:
+            self._sweep()
+        evicted = []
+        while len(self._entries) > self.max_entries:
+            evicted.append(self._entries.popitem(last=False)[0])
+        if evicted:
+            logger.warning(f"Pending input store full, evicted {len(evicted)} chat(s)")
+        
+        if self.db:
+            await self.db.set_pending_input(chat_id, round_index, expires_at)
+            for evicted_chat_id in evicted:
+                await self.db.delete_pending_input(evicted_chat_id)
+    
+    async def pop(self, chat_id: int) -> Optional[int]:
+        """Remove and return the pending round index for a chat."""
+        round_index = await self.lookup(chat_id)
+        self._entries.pop(chat_id, None)
+        if self.db and round_index is not None:
+            await self.db.delete_pending_input(chat_id)
+            self._remember_miss(chat_id, self.clock.time())
+        return round_index
+    
+    def _sweep(self):
+        """Drop all expired entries from memory."""
+        now = self.clock.time()
+        expired = [chat_id for chat_id, (_, expires_at) in self._entries.items() if expires_at <= now]
+        for chat_id in expired:
+            del self._entries[chat_id]
+        if expired:
+            logger.debug(f"Swept {len(expired)} expired pending inputs")
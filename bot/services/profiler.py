@@ -0,0 +1,279 @@
+"""On-demand, time-boxed sampling profiler for a running bot.
+
+Nothing is installed until a profile is requested (``/profile`` or the
+``/profile`` HTTP endpoint), so the profiler costs nothing while idle.
+During a profile:
+
+- a sampling thread reads the stacks of the event loop thread and the
+  aiosqlite worker threads every ``interval`` with ``sys._current_frames``
+- the loop samples every asyncio task's await chain every ``task_interval``
+
+Busy samples are attributed to ``handle_guess``, ``Database`` or
+``Announcer`` (the innermost matching frame wins), which splits the
+process CPU time used during the profile. Both sets of stacks are written
+in the collapsed format read by flamegraph.pl, speedscope and similar tools.
+"""
+import asyncio
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = ("handle_guess", "Database", "Announcer", "other")
+
+# Innermost frames in these files mean the thread is waiting, not running
+_IDLE_FILES = ("selectors.py", "queue.py", "threading.py")
+_DB_FILES = (os.path.join("bot", "storage", "db.py"), os.path.join("bot", "storage", "tracing.py"))
+_ANNOUNCER_FILE = os.path.join("bot", "services", "announcer.py")
+_AIOSQLITE_DIR = os.sep + "aiosqlite" + os.sep
+
+def _label(code) -> str:
+    """Collapsed-stack frame label: qualified function name and file."""
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({os.path.basename(code.co_filename)})"
+
+def _category(code) -> Optional[str]:
+    """Category a frame belongs to, if any."""
+    filename = code.co_filename
+    if code.co_name == "handle_guess":
+        return "handle_guess"
+    if filename.endswith(_DB_FILES) or _AIOSQLITE_DIR in filename:
+        return "Database"
+    if filename.endswith(_ANNOUNCER_FILE):
+        return "Announcer"
+    return None
+
+def _await_chain(coro) -> list:
+    """Frames of a coroutine and everything it is awaiting, outermost first."""
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None) or getattr(coro, "ag_await", None)
+    return frames
+
+class ProfileReport:
+    """Result of one profiling session."""
+    __slots__ = (
+        "seconds", "samples", "busy_samples", "cpu_seconds", "categories",
+        "top_functions", "path", "tasks_path"
+    )
+    
+    def __init__(
+        self,
+        seconds: float,
+        samples: int,
+        busy_samples: int,
+        cpu_seconds: float,
+        categories: Dict[str, int],
+        top_functions: List[Tuple[str, int]],
+        path: str,
+        tasks_path: str
+    ):
+        self.seconds = seconds
+        self.samples = samples  # Loop thread samples
+        self.busy_samples = busy_samples  # Samples of any thread doing work
+        self.cpu_seconds = cpu_seconds  # Process CPU time during the profile
+        self.categories = categories  # Busy samples per category
+        self.top_functions = top_functions  # (frame label, self samples), busiest first
+        self.path = path
+        self.tasks_path = tasks_path
+    
+    def cpu_split(self) -> List[Tuple[str, float, float]]:
+        """(category, share of busy samples, estimated CPU seconds) for every category."""
+        split = []
+        for category in CATEGORIES:
+            share = self.categories.get(category, 0) / self.busy_samples if self.busy_samples else 0.0
+            split.append((category, share, share * self.cpu_seconds))
+        return split
+
+class _Session:
+    """Counters filled by the sampling thread during one profile."""
+    
+    def __init__(self, loop_thread_id: int):
+        self.loop_thread_id = loop_thread_id
+        self.stacks: Counter = Counter()  # Collapsed stack -> samples
+        self.categories: Counter = Counter()
+        self.leaves: Counter = Counter()
+        self.samples = 0
+        self.busy_samples = 0
+        self.stop = threading.Event()
+
+class SamplingProfiler:
+    """
+    Time-boxed sampling profiler; one profile runs at a time.
+    
+    Profiles are written to ``output_dir`` as ``profile-<time>.folded``
+    (thread stacks) and ``profile-<time>.tasks.folded`` (task await chains).
+    """
+    
+    def __init__(
+        self,
+        output_dir: str = "profiles",
+        interval: float = 0.005,
+        task_interval: float = 0.1,
+        max_seconds: float = 60.0
+    ):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.task_interval = task_interval
+        self.max_seconds = max_seconds
+        self._running = False
+    
+    @property
+    def running(self) -> bool:
+        """Whether a profile is in progress."""
+        return self._running
+    
+    def clamp(self, seconds: float) -> float:
+        """
+        Limit a requested duration to (0, max_seconds].
+        
+        Raises:
+            ValueError: If ``seconds`` is NaN or infinite
+        """
+        if not math.isfinite(seconds):
+            raise ValueError("Profile duration must be a finite number of seconds")
+        return min(max(seconds, self.interval * 10), self.max_seconds)
+    
+    async def profile(self, seconds: float) -> ProfileReport:
+        """
+        Profile the running bot for ``seconds`` (clamped to ``max_seconds``).
+        
+        Raises:
+            ValueError: If ``seconds`` is NaN or infinite
+            RuntimeError: If a profile is already running
+        """
+        seconds = self.clamp(seconds)
+        if self._running:
+            raise RuntimeError("A profile is already running")
+        self._running = True
+        session = _Session(threading.get_ident())
+        task_stacks: Counter = Counter()
+        sampler = threading.Thread(target=self._sample, args=(session,), name="profiler", daemon=True)
+        
+        logger.info(f"Profiling for {seconds:.1f}s")
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            deadline = started + seconds
+            while True:
+                self._sample_tasks(task_stacks)
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(self.task_interval, remaining))
+        finally:
+            session.stop.set()
+            await asyncio.to_thread(sampler.join)
+            self._running = False
+        elapsed = time.perf_counter() - started
+        cpu_seconds = time.process_time() - cpu_started
+        
+        path, tasks_path = await asyncio.to_thread(self._write, session.stacks, task_stacks)
+        report = ProfileReport(
+            seconds=elapsed,
+            samples=session.samples,
+            busy_samples=session.busy_samples,
+            cpu_seconds=cpu_seconds,
+            categories=dict(session.categories),
+            top_functions=session.leaves.most_common(10),
+            path=path,
+            tasks_path=tasks_path
+        )
+        logger.info(
+            f"Profile done: {report.busy_samples}/{report.samples} busy samples, "
+            f"{cpu_seconds:.2f}s CPU, written to {path}"
+        )
+        return report
+    
+    def _sample(self, session: _Session):
+        """Sampling thread: record thread stacks until the session stops."""
+        own_id = threading.get_ident()
+        while not session.stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                is_loop = thread_id == session.loop_thread_id
+                
+                codes = []
+                while frame is not None:
+                    codes.append(frame.f_code)
+                    frame = frame.f_back
+                codes.reverse()
+                if not is_loop and not any(_AIOSQLITE_DIR in code.co_filename for code in codes):
+                    continue  # Only the loop and the database workers are interesting
+                
+                idle = not codes or codes[-1].co_filename.endswith(_IDLE_FILES)
+                if is_loop:
+                    session.samples += 1
+                elif idle:
+                    continue  # Idle worker threads would only bury the loop's stacks
+                
+                root = "event-loop" if is_loop else names.get(thread_id, f"thread-{thread_id}")
+                session.stacks[";".join([root] + [_label(code) for code in codes])] += 1
+                if idle:
+                    continue
+                
+                session.busy_samples += 1
+                session.leaves[_label(codes[-1])] += 1
+                category = "other"
+                for code in reversed(codes):
+                    found = _category(code)
+                    if found:
+                        category = found
+                        break
+                session.categories[category] += 1
+    
+    @staticmethod
+    def _sample_tasks(task_stacks: Counter):
+        """Record the await chain of every task (runs on the loop)."""
+        current = asyncio.current_task()
+        for task in asyncio.all_tasks():
+            if task is current:
+                continue
+            frames = _await_chain(task.get_coro())
+            if frames:
+                task_stacks[";".join(_label(frame.f_code) for frame in frames)] += 1
+    
+    def _write(self, stacks: Counter, task_stacks: Counter) -> Tuple[str, str]:
+        """Write both collapsed-stack files; returns their paths."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.output_dir, f"profile-{stamp}.folded")
+        tasks_path = os.path.join(self.output_dir, f"profile-{stamp}.tasks.folded")
+        for target, counts in ((path, stacks), (tasks_path, task_stacks)):
+            with open(target, "w") as f:
+                for stack, count in counts.most_common():
+                    f.write(f"{stack} {count}\n")
+        return path, tasks_path
+    
+    async def handle_profile(self, request: web.Request) -> web.Response:
+        """GET /profile?seconds=N - profile, then return the collapsed thread stacks."""
+        try:
+            seconds = float(request.query.get("seconds", "10"))
+        except ValueError:
+            return web.json_response({"error": "seconds must be a number"}, status=400)
+        if not math.isfinite(seconds):
+            return web.json_response({"error": "seconds must be finite"}, status=400)
+        if self._running:
+            return web.json_response({"error": "a profile is already running"}, status=409)
+        
+        report = await self.profile(seconds)
+        with open(report.path) as f:
+            body = f.read()
+        return web.Response(
+            text=body,
+            content_type="text/plain",
+            headers={"X-Profile-Path": report.path, "X-Profile-Tasks-Path": report.tasks_path}
+        )
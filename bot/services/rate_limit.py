@@ -0,0 +1,86 @@
+"""In-memory token bucket rate limiting."""
+from collections import OrderedDict
+from typing import Hashable, List, Tuple
+from bot.utils.clock import SystemClock
+
+class TokenBucketLimiter:
+    """
+    Per-key token bucket with a cooldown.
+    
+    Each key holds up to ``burst`` tokens, refilled at ``rate`` tokens per
+    second; every allowed event spends one. A key that runs out is muted
+    for ``cooldown`` seconds. Only the first rejection of a cooldown is
+    reported as warnable, so callers send at most one warning per cooldown.
+    
+    At most ``max_keys`` buckets are kept: buckets are ordered by last
+    refill, idle ones are swept every ``sweep_every`` new keys, and past the
+    cap the least recently used bucket is evicted.
+    """
+    
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        cooldown: float,
+        max_keys: int = 100000,
+        clock=None,
+        sweep_every: int = 1000
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.cooldown = cooldown
+        self.max_keys = max_keys
+        self.sweep_every = sweep_every
+        self.clock = clock or SystemClock()
+        self._buckets: "OrderedDict[Hashable, List[float]]" = OrderedDict()  # key -> [tokens, updated_at, muted_until]
+        self._inserts = 0
+    
+    def __len__(self) -> int:
+        return len(self._buckets)
+    
+    def check(self, key: Hashable) -> Tuple[bool, bool]:
+        """
+        Try to spend a token for a key.
+        
+        Args:
+            key: Bucket key, e.g. (chat_id, user_id)
+            
+        Returns:
+            Tuple of (allowed, should_warn)
+        """
+        now = self.clock.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._inserts += 1
+            if self._inserts % self.sweep_every == 0:
+                self._prune(now)
+            self._buckets[key] = [self.burst - 1, now, 0.0]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return True, False
+        
+        tokens, updated_at, muted_until = bucket
+        if now < muted_until:
+            return False, False
+        
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+        bucket[1] = now
+        self._buckets.move_to_end(key)  # Keeps buckets ordered by updated_at
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return True, False
+        
+        # Out of tokens: start a cooldown and warn once
+        bucket[0] = tokens
+        bucket[2] = now + self.cooldown
+        return False, True
+    
+    def _prune(self, now: float):
+        """Drop the oldest buckets while they are idle long enough to be full again."""
+        refill_time = self.burst / self.rate if self.rate > 0 else float("inf")
+        buckets = self._buckets
+        while buckets:
+            _, updated_at, muted_until = next(iter(buckets.values()))
+            if now < muted_until or now - updated_at < refill_time:
+                break
+            buckets.popitem(last=False)
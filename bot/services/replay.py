@@ -0,0 +1,410 @@
+"""Deterministic replay of recorded games at accelerated virtual time.
+
+A recorded game (its ``rounds`` and ``guesses`` rows) or a log of raw
+Telegram updates (one JSON object per line) is replayed into a fresh
+database. Updates go through the real dispatcher, so middlewares and
+handlers run as they would in production. The bot is backed by a session
+that records outgoing requests instead of calling Telegram. Round timers
+run on a ``VirtualClock``, so a two-minute round replays in milliseconds.
+
+The report covers per-update handling time and any divergence between the
+recorded and the replayed state.
+
+Usage:
+    python -m bot.services.replay --db game_bot.db --game 42
+    python -m bot.services.replay --log updates.jsonl
+
+The exit status is 1 if the replay diverged from the recording.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.base import BaseSession
+from aiogram.types import Chat, Message, Update, User
+
+from bot.config import (
+    DATABASE_PATH,
+    ROUND_DURATION_MINUTES,
+    GUESS_RATE_PER_SECOND,
+    GUESS_BURST,
+    GUESS_COOLDOWN_SECONDS
+)
+from bot.services.game_engine import GameEngine
+from bot.services.outbox import OutboxDispatcher
+from bot.services.pending_inputs import PendingInputStore
+from bot.services.rate_limit import TokenBucketLimiter
+from bot.storage.db import Database
+from bot.storage.models import Game, GameStatus, RoundStatus
+from bot.utils.clock import VirtualClock
+
+logger = logging.getLogger(__name__)
+
+# Syntactically valid token for the offline bot; it never reaches Telegram
+REPLAY_TOKEN = "42:REPLAY"
+
+class RecordingSession(BaseSession):
+    """Bot session that records API calls instead of sending them."""
+    
+    def __init__(self, clock: VirtualClock):
+        super().__init__()
+        self.clock = clock
+        self.requests: List[Tuple[datetime, str, Dict[str, Any]]] = []
+        self._message_ids = itertools.count(1)
+    
+    async def close(self):
+        pass
+    
+    async def make_request(self, bot: Bot, method, timeout: Optional[int] = None):
+        self.requests.append((self.clock.now(), type(method).__name__, method.model_dump(exclude_none=True)))
+        if method.__returning__ is Message:
+            return Message(
+                message_id=next(self._message_ids),
+                date=self.clock.now(),
+                chat=Chat(id=getattr(method, "chat_id", 0), type="supergroup"),
+                text=getattr(method, "text", None)
+            )
+        return True
+    
+    async def stream_content(self, url: str, headers=None, timeout: int = 30, chunk_size: int = 65536,
+                             raise_for_status: bool = True):
+        yield b""
+
+class ReplayResult:
+    """Timings and divergences collected during a replay."""
+    __slots__ = (
+        "updates", "latencies", "wall_seconds", "virtual_seconds",
+        "bot_requests", "divergences",
+    )
+    
+    def __init__(self):
+        self.updates = 0
+        self.latencies: List[float] = []  # Wall seconds per dispatched update
+        self.wall_seconds = 0.0
+        self.virtual_seconds = 0.0
+        self.bot_requests: Dict[str, int] = {}
+        self.divergences: List[str] = []
+    
+    def format(self) -> str:
+        """Format the result as a plain text report."""
+        lines = [
+            f"Updates replayed: {self.updates}",
+            f"Virtual time: {self.virtual_seconds:.1f}s in {self.wall_seconds:.2f}s wall "
+            f"({self.virtual_seconds / max(self.wall_seconds, 1e-9):.0f}x)",
+        ]
+        if self.latencies:
+            ordered = sorted(self.latencies)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            lines.append(
+                f"Update handling: p50 {statistics.median(ordered) * 1000:.2f} ms, "
+                f"p95 {p95 * 1000:.2f} ms, max {ordered[-1] * 1000:.2f} ms"
+            )
+        lines.append("Bot requests: " + (", ".join(f"{k}={v}" for k, v in sorted(self.bot_requests.items())) or "none"))
+        if self.divergences:
+            lines.append(f"Divergences ({len(self.divergences)}):")
+            lines.extend(f"  - {d}" for d in self.divergences)
+        else:
+            lines.append("No divergence from the recording")
+        return "\n".join(lines)
+
+class Replayer:
+    """Drives a ``GameEngine`` and the dispatcher on a virtual clock."""
+    
+    def __init__(self, db_path: str, start: datetime):
+        self.clock = VirtualClock(start)
+        self.db = Database(db_path, self.clock)
+        self.session = RecordingSession(self.clock)
+        self.bot = Bot(REPLAY_TOKEN, session=self.session)
+        self.outbox = OutboxDispatcher(self.db, self.bot)
+        self.engine = GameEngine(self.db, self.bot, self.outbox, self.clock)
+        self.dp = Dispatcher()
+        self.result = ReplayResult()
+        self._update_ids = itertools.count(1)
+        self._wall_started = 0.0
+        self._saved_pending_inputs: Optional[PendingInputStore] = None
+    
+    async def setup(self):
+        """Create the replay database and register handlers."""
+        from bot.main import setup_dispatcher
+        from bot.handlers import admin
+        
+        await self.db.init_db()
+        # Everything time-based runs on the virtual clock, including throttling; the
+        # handlers get their own pending input store until finish() puts the original back
+        production = admin.pending_round_starts
+        self._saved_pending_inputs = production
+        admin.pending_round_starts = PendingInputStore(
+            production.ttl_seconds,
+            production.max_entries,
+            production.sweep_every,
+            clock=self.clock
+        )
+        setup_dispatcher(
+            self.dp,
+            TokenBucketLimiter(GUESS_RATE_PER_SECOND, GUESS_BURST, GUESS_COOLDOWN_SECONDS, clock=self.clock)
+        )
+        self._wall_started = time.perf_counter()
+    
+    async def feed(self, update: Update):
+        """Dispatch one update at the current virtual time and flush announcements."""
+        started = time.perf_counter()
+        await self.dp.feed_update(self.bot, update, game_engine=self.engine)
+        self.result.latencies.append(time.perf_counter() - started)
+        self.result.updates += 1
+        await self.outbox.flush()
+    
+    async def advance_to(self, when: datetime):
+        """Advance virtual time, letting due round timers fire."""
+        await self.clock.advance_to(when)
+        await self.outbox.flush()
+    
+    def text_update(self, chat_id: int, user_id: int, text: str, message_id: int) -> Update:
+        """Build a group text message update sent now (virtual time)."""
+        return Update(
+            update_id=next(self._update_ids),
+            message=Message(
+                message_id=message_id,
+                date=self.clock.now(),
+                chat=Chat(id=chat_id, type="supergroup", title="replay"),
+                from_user=User(id=user_id, is_bot=False, first_name=str(user_id)),
+                text=text
+            )
+        )
+    
+    async def finish(self) -> ReplayResult:
+        """Let due round timers fire, cancel leftovers and fill in the totals."""
+        # Bounded: a round 1 short of its minimum guesses re-checks forever
+        await self.clock.run_until_idle(limit=self.clock.elapsed + ROUND_DURATION_MINUTES * 60)
+        for task in list(self.engine.round_timers.values()):
+            task.cancel()
+        await self.outbox.flush()
+        self._restore()
+        self.result.wall_seconds = time.perf_counter() - self._wall_started
+        self.result.virtual_seconds = self.clock.elapsed
+        for _, name, _ in self.session.requests:
+            self.result.bot_requests[name] = self.result.bot_requests.get(name, 0) + 1
+        return self.result
+
+    def _restore(self):
+        """Put back the pending input store the handlers had before ``setup``."""
+        from bot.handlers import admin
+        
+        if self._saved_pending_inputs is not None:
+            admin.pending_round_starts = self._saved_pending_inputs
+            self._saved_pending_inputs = None
+
+def _seconds(start: Optional[datetime], end: Optional[datetime]) -> Optional[float]:
+    if not isinstance(start, datetime) or not isinstance(end, datetime):
+        return None
+    return (end - start).total_seconds()
+
+async def replay_game(source: Database, game_id: int, db_path: str, tolerance: float = 1.0) -> ReplayResult:
+    """
+    Replay a recorded game and compare the outcome with the recording.
+    
+    Rounds start at their recorded times with their recorded cost, and every
+    guess is dispatched as a text message at its recorded time. A round that
+    is still open at its recorded end time is closed there, as the admin did;
+    one the timer closes earlier shows up as a timing divergence.
+    
+    Args:
+        source: Database holding the recording
+        game_id: The recorded game
+        db_path: Path for the scratch replay database
+        tolerance: Seconds of round duration difference that still count as equal
+    """
+    game = await source.get_game(game_id)
+    if not game:
+        raise ValueError(f"Game {game_id} not found")
+    rounds = await source.get_rounds_for_game(game_id)
+    guesses = await source.get_guesses_for_game(game_id)
+    
+    replayer = Replayer(db_path, game.created_at)
+    await replayer.setup()
+    engine = replayer.engine
+    
+    # Same secret and commitment, so hints and the winner can match
+    replay_game_id = await replayer.db.create_game(Game(
+        chat_id=game.chat_id,
+        status=GameStatus.GAME_COMMITTED,
+        target_hash=game.target_hash,
+        salt=game.salt,
+        number=game.number,
+        created_at=game.created_at,
+        prize_amount=game.prize_amount,
+        sponsor_name=game.sponsor_name,
+        sponsor_start_message=game.sponsor_start_message,
+        sponsor_end_message=game.sponsor_end_message
+    ))
+    
+    # Timeline: (time, order, kind, payload); order keeps starts before guesses before closes
+    events = []
+    for round_obj in rounds:
+        events.append((round_obj.started_at, 0, "start", round_obj))
+        if round_obj.status == RoundStatus.CLOSED and isinstance(round_obj.ended_at, datetime):
+            events.append((round_obj.ended_at, 2, "close", round_obj))
+    round_index_by_id = {round_obj.id: round_obj.round_index for round_obj in rounds}
+    for guess in guesses:
+        events.append((guess.created_at, 1, "guess", guess))
+    events.sort(key=lambda event: (event[0], event[1]))
+    
+    synthetic_ids = itertools.count(10 ** 9)
+    for when, _, kind, payload in events:
+        await replayer.advance_to(when)
+        if kind == "start":
+            await engine.start_round(replay_game_id, payload.round_index, payload.message_cost_hint)
+        elif kind == "guess":
+            message_id = payload.message_id or next(synthetic_ids)
+            await replayer.feed(replayer.text_update(game.chat_id, payload.user_id, str(payload.value), message_id))
+        else:
+            active_round = await replayer.db.get_active_round(replay_game_id)
+            if active_round and active_round.round_index == payload.round_index:
+                await engine.close_round(active_round.id)
+    
+    # Recorded end without a winner
+    replayed = await replayer.db.get_game(replay_game_id)
+    if game.status == GameStatus.GAME_CANCELED and replayed.status not in (GameStatus.GAME_FINISHED, GameStatus.GAME_CANCELED):
+        await engine.cancel_game(replay_game_id)
+    
+    result = await replayer.finish()
+    
+    # Compare final state
+    replayed = await replayer.db.get_game(replay_game_id)
+    if replayed.status != game.status:
+        result.divergences.append(f"game status: recorded {game.status}, replayed {replayed.status}")
+    if replayed.winner_user_id != game.winner_user_id:
+        result.divergences.append(f"winner: recorded {game.winner_user_id}, replayed {replayed.winner_user_id}")
+    
+    replayed_rounds = {r.round_index: r for r in await replayer.db.get_rounds_for_game(replay_game_id)}
+    for recorded in rounds:
+        label = f"round {recorded.round_index}"
+        replayed_round = replayed_rounds.get(recorded.round_index)
+        if not replayed_round:
+            result.divergences.append(f"{label}: not replayed")
+            continue
+        if replayed_round.total_guesses != recorded.total_guesses:
+            result.divergences.append(
+                f"{label} guesses: recorded {recorded.total_guesses}, replayed {replayed_round.total_guesses}"
+            )
+        recorded_status = recorded.status
+        if game.status in (GameStatus.GAME_FINISHED, GameStatus.GAME_CANCELED) and recorded_status in (
+            RoundStatus.ACTIVE, RoundStatus.PAUSED
+        ):
+            recorded_status = RoundStatus.CLOSED  # Recorded before ending a game closed its round
+        if replayed_round.status != recorded_status:
+            result.divergences.append(f"{label} status: recorded {recorded_status}, replayed {replayed_round.status}")
+        recorded_duration = _seconds(recorded.started_at, recorded.ended_at)
+        replayed_duration = _seconds(replayed_round.started_at, replayed_round.ended_at)
+        if recorded_duration is not None and replayed_duration is not None:
+            if abs(recorded_duration - replayed_duration) > tolerance:
+                result.divergences.append(
+                    f"{label} duration: recorded {recorded_duration:.1f}s, replayed {replayed_duration:.1f}s"
+                )
+    
+    # Per-guess outcome, in order
+    replayed_guesses = await replayer.db.get_guesses_for_game(replay_game_id)
+    if len(replayed_guesses) != len(guesses):
+        result.divergences.append(f"guesses stored: recorded {len(guesses)}, replayed {len(replayed_guesses)}")
+    for recorded, replayed_guess in zip(guesses, replayed_guesses):
+        same = (recorded.user_id, recorded.value, round_index_by_id.get(recorded.round_id)) == (
+            replayed_guess.user_id, replayed_guess.value,
+            next((i for i, r in replayed_rounds.items() if r.id == replayed_guess.round_id), None)
+        )
+        if not same:
+            result.divergences.append(
+                f"first differing guess: recorded #{recorded.id} {recorded.value} by {recorded.user_id}, "
+                f"replayed {replayed_guess.value} by {replayed_guess.user_id}"
+            )
+            break
+    
+    return result
+
+async def replay_update_log(path: str, db_path: str) -> ReplayResult:
+    """
+    Replay raw Telegram updates (one JSON object per line) in date order.
+    
+    Admin commands in the log are handled as usual, so ``ADMIN_IDS`` must
+    match the recording. A new game draws a new secret number, so outcomes
+    are reported but not compared.
+    """
+    with open(path) as f:
+        updates = [Update.model_validate(json.loads(line)) for line in f if line.strip()]
+    dated = [u for u in updates if u.message or u.callback_query]
+    dated.sort(key=lambda u: (u.message or u.callback_query.message).date)
+    if not dated:
+        raise ValueError(f"{path}: no message or callback updates")
+    
+    start = (dated[0].message or dated[0].callback_query.message).date.replace(tzinfo=None)
+    replayer = Replayer(db_path, start)
+    await replayer.setup()
+    for update in dated:
+        await replayer.advance_to((update.message or update.callback_query.message).date.replace(tzinfo=None))
+        await replayer.feed(update)
+    return await replayer.finish()
+
+def copy_recording(path: str, copy_path: str):
+    """
+    Copy a recording database, opening the original read-only.
+    
+    The replay migrates and reads the copy, so a production database
+    (or a copy of it that is still in use) is never written to.
+    """
+    try:
+        source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    except sqlite3.OperationalError as e:
+        raise SystemExit(f"Cannot open recording {path} read-only: {e}")
+    try:
+        with sqlite3.connect(copy_path) as target:
+            source.backup(target)
+    finally:
+        source.close()
+
+async def _main(args: argparse.Namespace) -> int:
+    fd, db_path = tempfile.mkstemp(suffix=".db", prefix="replay-")
+    os.close(fd)
+    fd, source_path = tempfile.mkstemp(suffix=".db", prefix="recording-")
+    os.close(fd)
+    try:
+        if args.log:
+            result = await replay_update_log(args.log, db_path)
+        else:
+            copy_recording(args.db, source_path)
+            source = Database(source_path)
+            await source.init_db()  # Bring recordings from older versions up to the current schema
+            result = await replay_game(source, args.game, db_path, args.tolerance)
+        print(result.format())
+        return 1 if result.divergences else 0
+    finally:
+        os.unlink(source_path)
+        if args.keep:
+            print(f"Replay database kept at {db_path}")
+        else:
+            os.unlink(db_path)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a recorded game at virtual time")
+    parser.add_argument("--db", default=DATABASE_PATH, help="Database holding the recording (default: DATABASE_PATH)")
+    parser.add_argument("--game", type=int, help="Recorded game ID")
+    parser.add_argument("--log", help="JSONL file of Telegram updates to replay instead of a game")
+    parser.add_argument("--tolerance", type=float, default=1.0, help="Allowed round duration difference (s)")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch replay database")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show engine and handler logs")
+    args = parser.parse_args(argv)
+    if not args.log and args.game is None:
+        parser.error("either --game or --log is required")
+    
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    return asyncio.run(_main(args))
+
+if __name__ == "__main__":
+    raise SystemExit(main())
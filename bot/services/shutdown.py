@@ -0,0 +1,96 @@
+"""Graceful shutdown: drain in-flight work before the process exits.
+
+When polling stops (SIGTERM/SIGINT from the orchestrator), the
+``ShutdownCoordinator`` runs these steps, all within one deadline:
+
+1. Report not-ready on ``/readyz``, so traffic moves to the new instance
+2. Wait for the updates already being handled (guesses, admin commands)
+3. Stop the round timers; their deadlines are persisted on the rounds and
+   re-armed by ``GameEngine.restore_round_timers`` at the next start
+4. Let the async event subscribers handle the events already queued
+5. Flush every announcement that is due from the outbox
+
+Whatever is left when the deadline passes stays in the database (timers
+and undelivered announcements) and is picked up by the next instance.
+"""
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class ShutdownCoordinator:
+    """Tracks in-flight updates and drains the bot's work on shutdown."""
+    
+    def __init__(self, engine, outbox=None, health=None, timeout: float = 25.0):
+        self.engine = engine
+        self.outbox = outbox
+        self.health = health
+        self.timeout = timeout
+        self.in_flight: Counter = Counter()  # chat_id -> updates being handled
+        self._idle = asyncio.Event()
+        self._idle.set()
+    
+    def update_started(self, chat_id: Optional[int]):
+        """Record that handling of an update began."""
+        self.in_flight[chat_id] += 1
+        self._idle.clear()
+    
+    def update_finished(self, chat_id: Optional[int]):
+        """Record that handling of an update ended."""
+        self.in_flight[chat_id] -= 1
+        if self.in_flight[chat_id] <= 0:
+            del self.in_flight[chat_id]
+        if not self.in_flight:
+            self._idle.set()
+    
+    async def shutdown(self):
+        """Drain in-flight updates, stop timers and flush the outbox within ``timeout``."""
+        deadline = time.monotonic() + self.timeout
+        
+        def remaining() -> float:
+            return max(0.0, deadline - time.monotonic())
+        
+        logger.info(f"Shutting down, draining for up to {self.timeout:.0f}s")
+        
+        if self.health:
+            self.health.draining = True
+        
+        # Updates already taken from Telegram are acknowledged: finish them or they're lost
+        if self.in_flight:
+            logger.info(f"Waiting for {sum(self.in_flight.values())} update(s) in {len(self.in_flight)} chat(s)")
+        try:
+            await asyncio.wait_for(self._idle.wait(), remaining())
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Shutdown deadline reached with {sum(self.in_flight.values())} update(s) "
+                f"still in flight in chats {sorted(chat for chat in self.in_flight if chat is not None)}"
+            )
+        
+        stopped = await self.engine.stop_round_timers()
+        if stopped:
+            logger.info(f"Stopped {stopped} round timer(s), deadlines kept for the next start")
+        
+        try:
+            await asyncio.wait_for(self.engine.events.drain(), remaining())
+        except asyncio.TimeoutError:
+            logger.warning("Shutdown deadline reached while draining event subscribers")
+            await self.engine.events.stop()
+        
+        if self.outbox:
+            try:
+                await asyncio.wait_for(self.outbox.drain(), remaining())
+            except asyncio.TimeoutError:
+                logger.warning("Shutdown deadline reached while flushing the outbox")
+            except Exception as e:
+                logger.error(f"Outbox flush on shutdown failed: {e}", exc_info=True)
+            try:
+                pending = await self.engine.db.count_pending_outbox()
+                if pending:
+                    logger.warning(f"{pending} announcement(s) left in the outbox for the next start")
+            except Exception as e:
+                logger.error(f"Could not count pending announcements: {e}")
+        
+        logger.info(f"Shutdown drain finished in {self.timeout - remaining():.1f}s")
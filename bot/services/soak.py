@@ -0,0 +1,249 @@
+"""Soak and load simulation of many concurrent games on virtual time.
+
+Every simulated game is a task that starts rounds and sends guesses at
+random virtual intervals, while the real ``GameEngine`` and ``Database``
+handle them. Round timers and every stored timestamp run on a shared
+``VirtualClock``, so two-minute rounds cost only their database work:
+hours of play, including the round 1 minimum-guess rule, complete in
+seconds to minutes of wall time.
+
+Usage:
+    python -m bot.services.soak [--games N] [--rounds R] [--players P]
+                                [--guesses-per-round G] [--seed S] [--db PATH | --memory]
+
+The run is reproducible for a given seed with ``--resolution 0``, which
+wakes games strictly one at a time. The default resolution lets games due
+in the same virtual second run concurrently, so database contention is
+exercised as well.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from bot.config import MIN_NUMBER, MAX_NUMBER, ROUND_DURATION_MINUTES, MIN_GUESSES_BEFORE_CLOSE
+from bot.services.commit_reveal import make_commit
+from bot.services.game_engine import GameEngine
+from bot.storage.db import Database
+from bot.storage.memory import MemoryDatabase
+from bot.storage.models import RoundStatus
+from bot.utils.clock import VirtualClock
+
+logger = logging.getLogger(__name__)
+
+class SoakStats:
+    """Counters and latencies collected during a soak run."""
+    __slots__ = (
+        "games", "rounds", "guesses", "winners", "errors", "violations",
+        "guess_latencies", "wall_seconds", "virtual_seconds", "round_durations",
+    )
+    
+    def __init__(self):
+        self.games = 0
+        self.rounds = 0
+        self.guesses = 0
+        self.winners = 0
+        self.errors = 0
+        self.violations: List[str] = []  # Timer rule breaches found after the run
+        self.guess_latencies: List[float] = []  # Wall seconds per register_guess
+        self.wall_seconds = 0.0
+        self.virtual_seconds = 0.0
+        self.round_durations: Dict[int, List[float]] = {}  # round_index -> virtual seconds
+    
+    def format(self) -> str:
+        """Format the stats as a plain text report."""
+        lines = [
+            f"Games: {self.games}  Rounds: {self.rounds}  Guesses: {self.guesses}  "
+            f"Winners: {self.winners}  Errors: {self.errors}",
+            f"Virtual time: {self.virtual_seconds / 3600:.2f}h in {self.wall_seconds:.2f}s wall",
+            f"Throughput: {self.guesses / max(self.wall_seconds, 1e-9):.0f} guesses/s",
+        ]
+        if self.guess_latencies:
+            ordered = sorted(self.guess_latencies)
+            pick = lambda q: ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000
+            lines.append(
+                f"register_guess: p50 {pick(0.5):.2f} ms, p95 {pick(0.95):.2f} ms, "
+                f"p99 {pick(0.99):.2f} ms, max {ordered[-1] * 1000:.2f} ms"
+            )
+        for round_index in sorted(self.round_durations):
+            durations = self.round_durations[round_index]
+            lines.append(
+                f"Round {round_index}: {len(durations)} closed, median {statistics.median(durations):.0f}s, "
+                f"max {max(durations):.0f}s"
+            )
+        if self.violations:
+            lines.append(f"Timer rule violations ({len(self.violations)}):")
+            lines.extend(f"  - {v}" for v in self.violations[:20])
+        return "\n".join(lines)
+
+class SeededCommitments:
+    """Commitment source drawing secrets from a seeded generator, so runs are reproducible."""
+    
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+    
+    async def take(self):
+        """Commit to the next seeded number."""
+        return make_commit(self.rng.randint(MIN_NUMBER, MAX_NUMBER))
+
+async def play_game(
+    engine: GameEngine,
+    rng: random.Random,
+    chat_id: int,
+    rounds: int,
+    players: int,
+    guesses_per_round: int,
+    stats: SoakStats
+) -> int:
+    """
+    Play one game: rounds of guesses until a winner or the last round closes.
+    
+    Returns:
+        The game ID
+    """
+    clock = engine.clock
+    round_seconds = ROUND_DURATION_MINUTES * 60
+    mean_gap = round_seconds / max(guesses_per_round, 1)
+    
+    game, _ = await engine.create_game(chat_id, prize_amount=100.0)
+    stats.games += 1
+    
+    for round_index in range(1, rounds + 1):
+        round_obj = await engine.start_round(game.id, round_index)
+        stats.rounds += 1
+        
+        # Guesses keep arriving until the round's timer closes it
+        while chat_id in engine.active_round_chats:
+            await clock.sleep(rng.expovariate(1 / mean_gap))
+            if chat_id not in engine.active_round_chats:
+                break
+            user_id = rng.randint(1, players)
+            # Half the players follow the hints, the rest guess anywhere
+            low, high = engine.known_range(game.id)
+            if rng.random() < 0.5:
+                low, high = MIN_NUMBER, MAX_NUMBER
+            value = rng.randint(low, high)
+            
+            started = time.perf_counter()
+            is_correct, guess = await engine.register_guess(game.id, round_obj.id, user_id, value)
+            stats.guess_latencies.append(time.perf_counter() - started)
+            stats.guesses += 1
+            
+            if is_correct:
+                await engine.finish_game(game.id, user_id)
+                stats.winners += 1
+                return game.id
+        
+        # Short break before the admin starts the next round
+        await clock.sleep(rng.uniform(5, 60))
+    
+    await engine.cancel_game(game.id)
+    return game.id
+
+async def run_soak(
+    db_path: Optional[str],
+    games: int,
+    rounds: int,
+    players: int,
+    guesses_per_round: int,
+    seed: int,
+    resolution: float
+) -> SoakStats:
+    """
+    Simulate ``games`` concurrent games on a virtual clock.
+    
+    Games start staggered over the first round duration. Each game is run
+    through the real engine and database until it has a winner or all
+    rounds are played. Without ``db_path`` the in-memory backend is used.
+    """
+    rng = random.Random(seed)
+    clock = VirtualClock(datetime(2025, 1, 1), resolution=resolution)
+    db = Database(db_path, clock) if db_path else MemoryDatabase(clock=clock)
+    await db.init_db()
+    engine = GameEngine(db, None, None, clock, SeededCommitments(random.Random(rng.random())))
+    stats = SoakStats()
+    game_ids: List[int] = []
+    
+    async def staggered(chat_id: int, game_rng: random.Random):
+        try:
+            await clock.sleep(game_rng.uniform(0, ROUND_DURATION_MINUTES * 60))
+            game_ids.append(
+                await play_game(engine, game_rng, chat_id, rounds, players, guesses_per_round, stats)
+            )
+        except Exception as e:
+            stats.errors += 1
+            logger.error(f"Simulated game in chat {chat_id} failed: {e}", exc_info=True)
+    
+    wall_started = time.perf_counter()
+    tasks = [
+        await clock.spawn(staggered(-(index + 1), random.Random(rng.random())))
+        for index in range(games)
+    ]
+    while not all(task.done() for task in tasks):
+        deadline = clock.next_deadline()
+        if deadline is None:
+            break
+        await clock.advance_to_elapsed(deadline)
+    for task in engine.round_timers.values():
+        task.cancel()
+    stats.wall_seconds = time.perf_counter() - wall_started
+    stats.virtual_seconds = clock.elapsed
+    
+    # Round durations as recorded by the database (virtual time), and the timer rules
+    for game_id in game_ids:
+        # Rounds closed along with their game (won or canceled) have no summary and no timer rule
+        summarized = {summary.round_id for summary in await db.get_round_summaries(game_id)}
+        for round_obj in await db.get_rounds_for_game(game_id):
+            if round_obj.status != RoundStatus.CLOSED or round_obj.id not in summarized:
+                continue
+            duration = (round_obj.ended_at - round_obj.started_at).total_seconds()
+            stats.round_durations.setdefault(round_obj.round_index, []).append(duration)
+            if duration < ROUND_DURATION_MINUTES * 60:
+                stats.violations.append(f"game {game_id} round {round_obj.round_index} closed after {duration:.0f}s")
+            if round_obj.round_index == 1 and round_obj.total_guesses < MIN_GUESSES_BEFORE_CLOSE:
+                stats.violations.append(
+                    f"game {game_id} round 1 closed with {round_obj.total_guesses} guesses"
+                )
+    return stats
+
+async def _main(args: argparse.Namespace) -> int:
+    db_path: Optional[str] = args.db
+    if not db_path and not args.memory:
+        fd, db_path = tempfile.mkstemp(suffix=".db", prefix="soak-")
+        os.close(fd)
+    try:
+        stats = await run_soak(
+            db_path, args.games, args.rounds, args.players,
+            args.guesses_per_round, args.seed, args.resolution
+        )
+        print(stats.format())
+        return 1 if stats.errors or stats.violations else 0
+    finally:
+        if not args.db and db_path:
+            os.unlink(db_path)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Soak-test the game engine on virtual time")
+    parser.add_argument("--games", type=int, default=200, help="Concurrent games")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds per game")
+    parser.add_argument("--players", type=int, default=50, help="Players per game")
+    parser.add_argument("--guesses-per-round", type=int, default=8, help="Average guesses per round duration")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--resolution", type=float, default=1.0,
+                        help="Seconds within which due games run concurrently (0 = strictly sequential)")
+    storage = parser.add_mutually_exclusive_group()
+    storage.add_argument("--db", help="Database to write to (default: a temporary file)")
+    storage.add_argument("--memory", action="store_true", help="Use the in-memory storage backend")
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(level=logging.WARNING)
+    return asyncio.run(_main(args))
+
+if __name__ == "__main__":
+    raise SystemExit(main())
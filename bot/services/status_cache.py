@@ -0,0 +1,180 @@
+"""Per-chat cache of /status, kept current by game engine events.
+
+The first /status in a chat loads the status from the database (game,
+active round, round count, last guess or last summary); after that it
+costs no reads. ``on_event`` subscribes to the engine's event bus:
+
+- state changes (game created, round started, paused, resumed or closed,
+  game finished, revealed or canceled) drop the chat's entry
+- registered guesses patch the cached round in place: guess count,
+  narrowed interval and last guess
+
+Rendered texts are kept per language. After a guess they are re-rendered
+at most every ``debounce`` seconds, so a chat spamming /status while
+guesses pour in doesn't re-render on every call.
+
+Concurrent loads for one chat share a single database read, and a load
+that races with an event is not stored. The cache only sees events of its
+own process, so every chat must be served by a single bot instance.
+"""
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from bot.storage.models import Guess
+from bot.services.events import Event, GuessRegistered
+from bot.utils.clock import SystemClock
+
+class _Entry:
+    """Cached status of one chat."""
+    __slots__ = ("status", "texts", "rendered_at", "dirty")
+    
+    def __init__(self, status: Optional[Dict[str, Any]]):
+        self.status = status  # As returned by GameEngine.get_status; None = no active game
+        self.texts: Dict[str, str] = {}  # lang -> rendered text
+        self.rendered_at = 0.0
+        self.dirty = False  # Patched since the texts were rendered
+
+class StatusCache:
+    """
+    Bounded per-chat status cache; the oldest chat is evicted when full.
+    
+    ``debounce`` is in seconds on ``clock``'s monotonic time (0 re-renders
+    after every guess).
+    """
+    
+    def __init__(self, debounce: float = 0.0, max_entries: int = 10000, clock=None):
+        self.debounce = debounce
+        self.max_entries = max_entries
+        self.clock = clock or SystemClock()
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._chat_by_game: Dict[int, int] = {}
+        self._versions: Dict[int, int] = {}  # Bumped by every event, so racing loads are discarded
+        self._loading: Dict[int, asyncio.Future] = {}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    async def text(
+        self,
+        chat_id: int,
+        lang: str,
+        load: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+        render: Callable[[Dict[str, Any], str], str]
+    ) -> Optional[str]:
+        """
+        Get a chat's rendered status, loading it on a miss.
+        
+        Args:
+            chat_id: The chat
+            lang: Language to render in
+            load: Loads the status from storage (``GameEngine.get_status``)
+            render: Formats a loaded status
+        
+        Returns:
+            The status text, or None if the chat has no active game
+        """
+        entry = self._entries.get(chat_id)
+        if entry is None:
+            self.misses += 1
+            entry = await self._load(chat_id, load)
+        else:
+            self.hits += 1
+        if entry.status is None:
+            return None
+        
+        now = self.clock.monotonic()
+        if entry.dirty and now - entry.rendered_at >= self.debounce:
+            entry.texts.clear()
+            entry.dirty = False
+        text = entry.texts.get(lang)
+        if text is None:
+            text = entry.texts[lang] = render(entry.status, lang)
+            entry.rendered_at = now
+        return text
+    
+    async def _load(self, chat_id: int, load) -> _Entry:
+        """Load a chat's status once, however many callers are waiting for it."""
+        pending = self._loading.get(chat_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._loading[chat_id] = future
+        version = self._versions.get(chat_id, 0)
+        try:
+            entry = _Entry(await load())
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved even if nobody else was waiting
+            raise
+        finally:
+            del self._loading[chat_id]
+        
+        # An event during the load may have changed what was read: serve it, don't keep it
+        if self._versions.get(chat_id, 0) == version:
+            self._store(chat_id, entry)
+        future.set_result(entry)
+        return entry
+    
+    def _store(self, chat_id: int, entry: _Entry):
+        self._entries.pop(chat_id, None)
+        self._entries[chat_id] = entry
+        if entry.status is not None:
+            self._chat_by_game[entry.status['game'].id] = chat_id
+        while len(self._entries) > self.max_entries:
+            evicted_chat, evicted = self._entries.popitem(last=False)
+            self._forget(evicted_chat, evicted)
+    
+    def _forget(self, chat_id: int, entry: Optional[_Entry]):
+        if entry is not None and entry.status is not None:
+            self._chat_by_game.pop(entry.status['game'].id, None)
+    
+    def invalidate(self, chat_id: int):
+        """Drop a chat's cached status after a state change."""
+        self._versions[chat_id] = self._versions.get(chat_id, 0) + 1
+        self._forget(chat_id, self._entries.pop(chat_id, None))
+    
+    def invalidate_game(self, game_id: int):
+        """Drop the cached status of the chat showing this game, if any."""
+        chat_id = self._chat_by_game.get(game_id)
+        if chat_id is not None:
+            self.invalidate(chat_id)
+    
+    def on_event(self, event: Event):
+        """Event bus subscriber: patch the chat's entry on guesses, drop it on any other change."""
+        if isinstance(event, GuessRegistered):
+            self.guess_registered(event.chat_id, event.guess, event.bounds)
+        elif event.chat_id is not None:
+            self.invalidate(event.chat_id)
+        else:
+            self.invalidate_game(event.game_id)
+    
+    def guess_registered(self, chat_id: int, guess: Guess, bounds: Tuple[int, int]):
+        """
+        Patch a chat's cached round with a newly registered guess.
+        
+        The patch is a merge rather than an increment (the count comes from
+        the guess's position in the round log), so an entry that was loaded
+        while the guess was being written doesn't count it twice.
+        """
+        entry = self._entries.get(chat_id)
+        active_round = entry.status.get('active_round') if entry and entry.status else None
+        if active_round is None or active_round.id != guess.round_id:
+            # Nothing to patch (or a load is in flight): make sure no stale load is kept
+            self.invalidate(chat_id)
+            return
+        
+        if guess.log_index is not None:
+            active_round.total_guesses = max(active_round.total_guesses, guess.log_index + 1)
+        else:
+            active_round.total_guesses += 1
+        low, high = bounds
+        if active_round.range_low is not None:
+            low, high = max(low, active_round.range_low), min(high, active_round.range_high)
+        active_round.range_low, active_round.range_high = low, high
+        last_guess = entry.status.get('last_guess')
+        if last_guess is None or (guess.created_at, guess.id) >= (last_guess.created_at, last_guess.id):
+            entry.status['last_guess'] = guess
+        entry.dirty = True
@@ -0,0 +1,106 @@
+"""Storage interface of the game engine.
+
+``Storage`` is the set of operations ``GameEngine`` needs on games, rounds,
+guesses and participations. ``Database`` (aiosqlite) and ``MemoryDatabase``
+(dicts and lists, with optional snapshots) both implement it. They also
+provide the outbox, pending input, chat setting, commitment pool and audit
+operations used by the other services, so either one can back the whole bot.
+"""
+from typing import List, Optional, Protocol, Sequence, runtime_checkable
+from bot.storage.models import Game, Round, Guess, OutboxMessage, RoundSummary
+
+@runtime_checkable
+class Storage(Protocol):
+    """Operations on games, rounds, guesses and participations."""
+    
+    clock: object  # Source of every timestamp written (SystemClock or VirtualClock)
+    
+    async def init_db(self):
+        """Prepare the storage (create the schema, load a snapshot)."""
+    
+    async def ping(self):
+        """Check the storage is reachable."""
+    
+    # Games
+    async def create_game(self, game: Game) -> int:
+        """Create a game; returns its ID."""
+    
+    async def get_game(self, game_id: int) -> Optional[Game]:
+        """Get a game by ID."""
+    
+    async def get_active_game(self, chat_id: int) -> Optional[Game]:
+        """Get the newest unfinished game of a chat."""
+    
+    async def get_chats_with_active_round(self) -> List[int]:
+        """Get chat IDs whose current game has an active or paused round."""
+    
+    async def update_game_status(self, game_id: int, status: str, announcements: Sequence[OutboxMessage] = ()):
+        """Update a game's status, enqueueing announcements atomically with it."""
+    
+    async def finish_game(self, game_id: int, winner_user_id: int, announcements: Sequence[OutboxMessage] = ()) -> bool:
+        """Finish a game with a winner, enqueueing announcements atomically with it; False if it already ended."""
+    
+    # Rounds
+    async def create_round(self, round_obj: Round) -> int:
+        """Create a round; returns its ID."""
+    
+    async def get_round(self, round_id: int) -> Optional[Round]:
+        """Get a round by ID."""
+    
+    async def get_active_round(self, game_id: int) -> Optional[Round]:
+        """Get a game's active or paused round."""
+    
+    async def get_rounds_for_game(self, game_id: int) -> List[Round]:
+        """Get a game's rounds in round order."""
+    
+    async def get_timed_rounds(self) -> List[Round]:
+        """Get the active rounds of running games."""
+    
+    async def set_round_deadline(self, round_id: int, deadline: Optional[float]):
+        """Persist when a round's timer fires."""
+    
+    async def update_round_status(self, round_id: int, status: str):
+        """Update a round's status."""
+    
+    async def close_round(
+        self,
+        round_id: int,
+        game_id: Optional[int] = None,
+        announcements: Sequence[OutboxMessage] = (),
+        summary: Optional[RoundSummary] = None
+    ):
+        """Close a round, storing its summary and announcements atomically with it."""
+    
+    async def increment_round_guesses(
+        self,
+        round_id: int,
+        range_low: Optional[int] = None,
+        range_high: Optional[int] = None
+    ):
+        """Count a guess in a round and narrow its stored interval."""
+    
+    async def compute_round_summary(self, round_id: int, game_id: int, target_number: int, top_n: int = 3) -> RoundSummary:
+        """Compute a round's summary from its guesses."""
+    
+    async def get_round_summary(self, round_id: int) -> Optional[RoundSummary]:
+        """Get the stored summary of a closed round."""
+    
+    # Guesses
+    async def create_guess(self, guess: Guess, log_frontier: Optional[str] = None) -> Optional[int]:
+        """Store a guess (and the round's log state); None if the message was already a guess."""
+    
+    async def get_last_guess(self, round_id: int) -> Optional[Guess]:
+        """Get the latest guess of a round."""
+    
+    async def get_user_guesses_in_round(self, round_id: int, user_id: int) -> List[Guess]:
+        """Get a user's guesses in a round."""
+    
+    async def get_round_leaves(self, round_id: int) -> List[str]:
+        """Get the leaf hashes of a round's guess log in log order."""
+    
+    # Participations
+    async def increment_participation(self, game_id: int, round_id: int, user_id: int):
+        """Count a guess towards a user's participation in a round."""
+    
+    async def get_user_participated_rounds(self, game_id: int, user_id: int) -> List[int]:
+        """Get the round indices a user guessed in."""
@@ -1,19 +1,63 @@
 """Database module for SQLite operations."""
+import json
 import aiosqlite
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-from datetime import datetime
-from bot.storage.models import Game, Round, Guess, Participation, GameStatus, RoundStatus
+from typing import Optional, List, Dict, Any, Tuple, Sequence, AsyncIterator
+from bot.storage.models import (
+    Game,
+    Round,
+    Guess,
+    Participation,
+    OutboxMessage,
+    RoundSummary,
+    GameStatus,
+    RoundStatus
+)
+from bot.storage.tracing import QueryTracer, traced_methods
+from bot.utils.clock import SystemClock
 
+# Explicit column lists in model constructor order, so rows map positionally
+GAME_COLUMNS = (
+    "id, chat_id, status, target_hash, salt, number, created_at, finished_at, "
+    "winner_user_id, prize_amount, sponsor_name, sponsor_start_message, sponsor_end_message"
+)
+ROUND_COLUMNS = (
+    "id, game_id, round_index, status, message_cost_hint, started_at, ended_at, "
+    "total_guesses, range_low, range_high, log_size, log_frontier, timer_deadline"
+)
+GUESS_COLUMNS = (
+    "id, game_id, round_id, user_id, value, is_correct, created_at, message_id, log_index, leaf_hash"
+)
+PARTICIPATION_COLUMNS = "id, game_id, round_id, user_id, guesses_count"
+SUMMARY_COLUMNS = (
+    "round_id, game_id, guess_count, unique_players, closest_value, "
+    "closest_user_id, range_low, range_high, log_size, log_root, top_guessers"
+)
+# Flat guess columns for analytics, joined with the round index and the game's secret number
+ANALYTICS_COLUMNS = "g.id, g.game_id, g.round_id, r.round_index, g.user_id, g.value, gm.number"
+OUTBOX_COLUMNS = (
+    "id, chat_id, text, reply_markup, reply_to_message_id, attempts, "
+    "next_attempt_at, created_at, sent_at, last_error"
+)
+
+@traced_methods
 class Database:
     """Database handler for the game bot."""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, clock=None, tracer: Optional[QueryTracer] = None):
         self.db_path = db_path
-        
+        self.clock = clock or SystemClock()  # Source of every timestamp written here
+        self.tracer = tracer  # Records method and query timings when set
+    
+    def _connect(self):
+        """Open a connection, traced if a tracer is attached."""
+        if self.tracer is not None:
+            return self.tracer.connect(self.db_path)
+        return aiosqlite.connect(self.db_path)
+    
     async def init_db(self):
         """Initialize the database schema."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             # Create games table
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS games (
@@ -44,6 +88,11 @@ class Database:
                     started_at TIMESTAMP,
                     ended_at TIMESTAMP,
                     total_guesses INTEGER DEFAULT 0,
+                    range_low INTEGER,
+                    range_high INTEGER,
+                    log_size INTEGER DEFAULT 0,
+                    log_frontier TEXT,
+                    timer_deadline REAL,
                     FOREIGN KEY (game_id) REFERENCES games(id)
                 )
             """)
@@ -58,6 +107,9 @@ class Database:
                     value INTEGER NOT NULL,
                     is_correct BOOLEAN DEFAULT 0,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    message_id INTEGER,
+                    log_index INTEGER,
+                    leaf_hash TEXT,
                     FOREIGN KEY (game_id) REFERENCES games(id),
                     FOREIGN KEY (round_id) REFERENCES rounds(id)
                 )
@@ -77,18 +129,144 @@ class Database:
                 )
             """)
             
+            # Create chat settings table (per-chat preferences such as language)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS chat_settings (
+                    chat_id INTEGER PRIMARY KEY,
+                    language TEXT NOT NULL
+                )
+            """)
+            
+            # Create pending admin inputs table (e.g. awaiting Stars cost)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS pending_inputs (
+                    chat_id INTEGER PRIMARY KEY,
+                    round_index INTEGER NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            
+            # Create outbox table (announcements committed with the state change they describe)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    chat_id INTEGER NOT NULL,
+                    text TEXT NOT NULL,
+                    reply_markup TEXT,
+                    reply_to_message_id INTEGER,
+                    attempts INTEGER DEFAULT 0,
+                    next_attempt_at REAL,
+                    created_at REAL NOT NULL,
+                    sent_at REAL,
+                    last_error TEXT
+                )
+            """)
+            
+            # Create round summaries table (written once when a round closes)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS round_summaries (
+                    round_id INTEGER PRIMARY KEY,
+                    game_id INTEGER NOT NULL,
+                    guess_count INTEGER NOT NULL,
+                    unique_players INTEGER NOT NULL,
+                    closest_value INTEGER,
+                    closest_user_id INTEGER,
+                    range_low INTEGER,
+                    range_high INTEGER,
+                    log_size INTEGER DEFAULT 0,
+                    log_root TEXT,
+                    top_guessers TEXT,
+                    FOREIGN KEY (game_id) REFERENCES games(id),
+                    FOREIGN KEY (round_id) REFERENCES rounds(id)
+                )
+            """)
+            
+            # Create commitment pool table (pre-generated secrets, sealed at rest)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS commitment_pool (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    target_hash TEXT NOT NULL,
+                    sealed TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            
+            # Create audit checkpoints table (resumable fairness audits)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS audit_checkpoints (
+                    name TEXT PRIMARY KEY,
+                    last_game_id INTEGER NOT NULL,
+                    games_audited INTEGER NOT NULL,
+                    mismatches TEXT NOT NULL,
+                    started_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            
+            # Mismatches found by each audit (one row per game, appended batch by batch)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS audit_mismatches (
+                    name TEXT NOT NULL,
+                    game_id INTEGER NOT NULL,
+                    chat_id INTEGER NOT NULL,
+                    target_hash TEXT NOT NULL,
+                    computed_hash TEXT NOT NULL,
+                    PRIMARY KEY (name, game_id)
+                )
+            """)
+            
+            # Games an audit passed while they were still running, audited once they finish
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS audit_pending (
+                    name TEXT NOT NULL,
+                    game_id INTEGER NOT NULL,
+                    PRIMARY KEY (name, game_id)
+                )
+            """)
+            
+            # Migrate databases created before these columns existed
+            await self._add_column_if_missing(db, "guesses", "message_id", "INTEGER")
+            await self._add_column_if_missing(db, "rounds", "range_low", "INTEGER")
+            await self._add_column_if_missing(db, "rounds", "range_high", "INTEGER")
+            await self._add_column_if_missing(db, "rounds", "log_size", "INTEGER DEFAULT 0")
+            await self._add_column_if_missing(db, "rounds", "log_frontier", "TEXT")
+            await self._add_column_if_missing(db, "rounds", "timer_deadline", "REAL")
+            await self._add_column_if_missing(db, "guesses", "log_index", "INTEGER")
+            await self._add_column_if_missing(db, "guesses", "leaf_hash", "TEXT")
+            await self._add_column_if_missing(db, "round_summaries", "log_size", "INTEGER DEFAULT 0")
+            await self._add_column_if_missing(db, "round_summaries", "log_root", "TEXT")
+            
             # Create indices for better performance
             await db.execute("CREATE INDEX IF NOT EXISTS idx_games_chat ON games(chat_id)")
             await db.execute("CREATE INDEX IF NOT EXISTS idx_rounds_game ON rounds(game_id)")
             await db.execute("CREATE INDEX IF NOT EXISTS idx_guesses_round ON guesses(round_id)")
             await db.execute("CREATE INDEX IF NOT EXISTS idx_participations_game ON participations(game_id)")
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox(next_attempt_at)")
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_outbox_chat ON outbox(chat_id, id)")
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_summaries_game ON round_summaries(game_id)")
+            # A Telegram message can only ever be one guess (NULL message IDs never conflict)
+            await db.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_guesses_message ON guesses(game_id, message_id)"
+            )
             
             await db.commit()
     
+    async def ping(self):
+        """Run a trivial query, to check the database is reachable."""
+        async with self._connect() as db:
+            await db.execute("SELECT 1")
+    
+    async def _add_column_if_missing(self, db, table: str, column: str, definition: str):
+        """Add a column to an existing table if it isn't there yet."""
+        cursor = await db.execute(f"PRAGMA table_info({table})")
+        columns = {row[1] for row in await cursor.fetchall()}
+        if column not in columns:
+            await db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    
     # Game operations
     async def create_game(self, game: Game) -> int:
         """Create a new game."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             cursor = await db.execute(
                 """INSERT INTO games (chat_id, status, target_hash, salt, number, created_at, prize_amount, 
                    sponsor_name, sponsor_start_message, sponsor_end_message)
@@ -101,169 +279,448 @@ class Database:
     
     async def get_active_game(self, chat_id: int) -> Optional[Game]:
         """Get the active game for a chat."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._connect() as db:
             cursor = await db.execute(
-                """SELECT * FROM games 
+                f"""SELECT {GAME_COLUMNS} FROM games 
                    WHERE chat_id = ? AND status NOT IN (?, ?) 
                    ORDER BY created_at DESC LIMIT 1""",
                 (chat_id, GameStatus.GAME_FINISHED, GameStatus.GAME_CANCELED)
             )
             row = await cursor.fetchone()
             if row:
-                return self._row_to_game(row)
+                return Game.from_row(row)
             return None
     
     async def get_game(self, game_id: int) -> Optional[Game]:
         """Get a game by ID."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute("SELECT * FROM games WHERE id = ?", (game_id,))
+        async with self._connect() as db:
+            cursor = await db.execute(f"SELECT {GAME_COLUMNS} FROM games WHERE id = ?", (game_id,))
             row = await cursor.fetchone()
             if row:
-                return self._row_to_game(row)
+                return Game.from_row(row)
             return None
     
-    async def update_game_status(self, game_id: int, status: str):
-        """Update game status."""
-        async with aiosqlite.connect(self.db_path) as db:
+    async def get_chats_with_active_round(self) -> List[int]:
+        """Get chat IDs whose current game has an active or paused round."""
+        async with self._connect() as db:
+            cursor = await db.execute(
+                """SELECT DISTINCT g.chat_id
+                   FROM games g
+                   JOIN rounds r ON r.game_id = g.id
+                   WHERE r.status IN (?, ?) AND g.status NOT IN (?, ?)""",
+                (RoundStatus.ACTIVE, RoundStatus.PAUSED,
+                 GameStatus.GAME_FINISHED, GameStatus.GAME_CANCELED)
+            )
+            rows = await cursor.fetchall()
+            return [row[0] for row in rows]
+    
+    async def update_game_status(
+        self,
+        game_id: int,
+        status: str,
+        announcements: Sequence[OutboxMessage] = ()
+    ):
+        """
+        Update game status, enqueueing any announcements in the same transaction.
+        
+        Ending the game (finished or canceled) closes its open round with it.
+        """
+        async with self._connect() as db:
             await db.execute(
                 "UPDATE games SET status = ? WHERE id = ?",
                 (status, game_id)
             )
+            if status in (GameStatus.GAME_FINISHED, GameStatus.GAME_CANCELED):
+                await self._close_open_rounds(db, game_id)
+            await self._insert_outbox(db, announcements)
             await db.commit()
     
-    async def finish_game(self, game_id: int, winner_user_id: int):
-        """Mark game as finished with winner."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
+    async def finish_game(
+        self,
+        game_id: int,
+        winner_user_id: int,
+        announcements: Sequence[OutboxMessage] = ()
+    ) -> bool:
+        """
+        Mark game as finished with winner, enqueueing any announcements in the same transaction.
+        
+        The game's open round is closed with it. A game that already ended
+        is left as is and nothing is enqueued.
+        
+        Returns:
+            True if the game was finished by this call
+        """
+        async with self._connect() as db:
+            cursor = await db.execute(
                 """UPDATE games SET status = ?, finished_at = ?, winner_user_id = ? 
-                   WHERE id = ?""",
-                (GameStatus.GAME_FINISHED, datetime.now(), winner_user_id, game_id)
+                   WHERE id = ? AND status NOT IN (?, ?)""",
+                (GameStatus.GAME_FINISHED, self.clock.now(), winner_user_id, game_id,
+                 GameStatus.GAME_FINISHED, GameStatus.GAME_CANCELED)
             )
+            if cursor.rowcount == 0:
+                return False
+            await self._close_open_rounds(db, game_id)
+            await self._insert_outbox(db, announcements)
             await db.commit()
+            return True
+    
+    async def _close_open_rounds(self, db, game_id: int):
+        """Close a game's active or paused round on an open connection, without committing."""
+        await db.execute(
+            "UPDATE rounds SET status = ?, ended_at = ? WHERE game_id = ? AND status IN (?, ?)",
+            (RoundStatus.CLOSED, self.clock.now(), game_id, RoundStatus.ACTIVE, RoundStatus.PAUSED)
+        )
     
     # Round operations
     async def create_round(self, round_obj: Round) -> int:
         """Create a new round."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             cursor = await db.execute(
-                """INSERT INTO rounds (game_id, round_index, status, message_cost_hint, started_at, total_guesses)
-                   VALUES (?, ?, ?, ?, ?, ?)""",
+                """INSERT INTO rounds (game_id, round_index, status, message_cost_hint, started_at, total_guesses,
+                                       range_low, range_high, timer_deadline)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
                 (round_obj.game_id, round_obj.round_index, round_obj.status, 
-                 round_obj.message_cost_hint, round_obj.started_at, round_obj.total_guesses)
+                 round_obj.message_cost_hint, round_obj.started_at, round_obj.total_guesses,
+                 round_obj.range_low, round_obj.range_high, round_obj.timer_deadline)
             )
             await db.commit()
             return cursor.lastrowid
     
     async def get_active_round(self, game_id: int) -> Optional[Round]:
         """Get the active round for a game."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._connect() as db:
             cursor = await db.execute(
-                """SELECT * FROM rounds 
+                f"""SELECT {ROUND_COLUMNS} FROM rounds 
                    WHERE game_id = ? AND status IN (?, ?) 
                    ORDER BY round_index DESC LIMIT 1""",
                 (game_id, RoundStatus.ACTIVE, RoundStatus.PAUSED)
             )
             row = await cursor.fetchone()
             if row:
-                return self._row_to_round(row)
+                return Round.from_row(row)
             return None
     
     async def get_round(self, round_id: int) -> Optional[Round]:
         """Get a round by ID."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            cursor = await db.execute("SELECT * FROM rounds WHERE id = ?", (round_id,))
+        async with self._connect() as db:
+            cursor = await db.execute(f"SELECT {ROUND_COLUMNS} FROM rounds WHERE id = ?", (round_id,))
             row = await cursor.fetchone()
             if row:
-                return self._row_to_round(row)
+                return Round.from_row(row)
             return None
     
     async def get_rounds_for_game(self, game_id: int) -> List[Round]:
         """Get all rounds for a game."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._connect() as db:
             cursor = await db.execute(
-                "SELECT * FROM rounds WHERE game_id = ? ORDER BY round_index",
+                f"SELECT {ROUND_COLUMNS} FROM rounds WHERE game_id = ? ORDER BY round_index",
                 (game_id,)
             )
             rows = await cursor.fetchall()
-            return [self._row_to_round(row) for row in rows]
+            return [Round.from_row(row) for row in rows]
+    
+    async def get_timed_rounds(self) -> List[Round]:
+        """Get the active rounds of running games, whose timers must be armed."""
+        async with self._connect() as db:
+            cursor = await db.execute(
+                f"""SELECT {', '.join('r.' + column for column in ROUND_COLUMNS.split(', '))}
+                   FROM rounds r
+                   JOIN games g ON g.id = r.game_id
+                   WHERE r.status = ? AND g.status NOT IN (?, ?)""",
+                (RoundStatus.ACTIVE, GameStatus.GAME_FINISHED, GameStatus.GAME_CANCELED)
+            )
+            rows = await cursor.fetchall()
+            return [Round.from_row(row) for row in rows]
+    
+    async def set_round_deadline(self, round_id: int, deadline: Optional[float]):
+        """Persist when a round's timer fires (None when it has no running timer)."""
+        async with self._connect() as db:
+            await db.execute(
+                "UPDATE rounds SET timer_deadline = ? WHERE id = ?",
+                (deadline, round_id)
+            )
+            await db.commit()
     
     async def update_round_status(self, round_id: int, status: str):
         """Update round status."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute(
                 "UPDATE rounds SET status = ? WHERE id = ?",
                 (status, round_id)
             )
             await db.commit()
     
-    async def close_round(self, round_id: int):
-        """Close a round."""
-        async with aiosqlite.connect(self.db_path) as db:
+    async def close_round(
+        self,
+        round_id: int,
+        game_id: Optional[int] = None,
+        announcements: Sequence[OutboxMessage] = (),
+        summary: Optional[RoundSummary] = None
+    ):
+        """
+        Close a round.
+        
+        If game_id is given, the game goes back to GAME_COMMITTED in the same
+        transaction; the round summary and announcements are written in that
+        transaction too.
+        """
+        async with self._connect() as db:
             await db.execute(
                 "UPDATE rounds SET status = ?, ended_at = ? WHERE id = ?",
-                (RoundStatus.CLOSED, datetime.now(), round_id)
+                (RoundStatus.CLOSED, self.clock.now(), round_id)
             )
+            if game_id is not None:
+                await db.execute(
+                    "UPDATE games SET status = ? WHERE id = ?",
+                    (GameStatus.GAME_COMMITTED, game_id)
+                )
+            if summary is not None:
+                await db.execute(
+                    f"INSERT OR REPLACE INTO round_summaries ({SUMMARY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (summary.round_id, summary.game_id, summary.guess_count, summary.unique_players,
+                     summary.closest_value, summary.closest_user_id, summary.range_low,
+                     summary.range_high, summary.log_size, summary.log_root,
+                     json.dumps(summary.top_guessers))
+                )
+            await self._insert_outbox(db, announcements)
             await db.commit()
     
-    async def increment_round_guesses(self, round_id: int):
-        """Increment total guesses for a round."""
-        async with aiosqlite.connect(self.db_path) as db:
+    async def increment_round_guesses(
+        self,
+        round_id: int,
+        range_low: Optional[int] = None,
+        range_high: Optional[int] = None
+    ):
+        """
+        Increment total guesses for a round, narrowing its stored interval.
+        
+        The interval only ever shrinks, so concurrent updates landing out of
+        order still leave the tightest bounds.
+        """
+        async with self._connect() as db:
             await db.execute(
-                "UPDATE rounds SET total_guesses = total_guesses + 1 WHERE id = ?",
-                (round_id,)
+                """UPDATE rounds SET total_guesses = total_guesses + 1,
+                       range_low = MAX(COALESCE(range_low, ?1), COALESCE(?1, range_low)),
+                       range_high = MIN(COALESCE(range_high, ?2), COALESCE(?2, range_high))
+                   WHERE id = ?3""",
+                (range_low, range_high, round_id)
             )
             await db.commit()
     
+    async def compute_round_summary(
+        self,
+        round_id: int,
+        game_id: int,
+        target_number: int,
+        top_n: int = 3
+    ) -> RoundSummary:
+        """
+        Compute a round's summary in a single aggregate query.
+        
+        The narrowed interval covers every guess of the game up to and
+        including this round; range bounds are None while unconstrained.
+        """
+        async with self._connect() as db:
+            cursor = await db.execute(
+                """WITH round_guesses AS (
+                       SELECT id, user_id, value FROM guesses WHERE round_id = :round_id
+                   ),
+                   bounds AS (
+                       SELECT MAX(CASE WHEN value < :target THEN value END) AS below,
+                              MIN(CASE WHEN value > :target THEN value END) AS above
+                       FROM guesses WHERE game_id = :game_id AND round_id <= :round_id
+                   ),
+                   closest AS (
+                       SELECT value, user_id FROM round_guesses
+                       ORDER BY ABS(value - :target), id LIMIT 1
+                   ),
+                   top AS (
+                       SELECT user_id, COUNT(*) AS n FROM round_guesses
+                       GROUP BY user_id ORDER BY n DESC, MIN(id) LIMIT :top_n
+                   )
+                   SELECT (SELECT COUNT(*) FROM round_guesses),
+                          (SELECT COUNT(DISTINCT user_id) FROM round_guesses),
+                          (SELECT value FROM closest),
+                          (SELECT user_id FROM closest),
+                          bounds.below,
+                          bounds.above,
+                          (SELECT json_group_array(json_array(user_id, n)) FROM top)
+                   FROM bounds""",
+                {"round_id": round_id, "game_id": game_id, "target": target_number, "top_n": top_n}
+            )
+            count, players, closest_value, closest_user_id, below, above, top = await cursor.fetchone()
+            return RoundSummary(
+                round_id=round_id,
+                game_id=game_id,
+                guess_count=count,
+                unique_players=players,
+                closest_value=closest_value,
+                closest_user_id=closest_user_id,
+                range_low=below + 1 if below is not None else None,
+                range_high=above - 1 if above is not None else None,
+                top_guessers=[tuple(pair) for pair in json.loads(top or "[]")]
+            )
+    
+    async def get_round_summary(self, round_id: int) -> Optional[RoundSummary]:
+        """Get the stored summary of a closed round."""
+        async with self._connect() as db:
+            cursor = await db.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM round_summaries WHERE round_id = ?",
+                (round_id,)
+            )
+            row = await cursor.fetchone()
+            return RoundSummary.from_row(row) if row else None
+    
+    async def get_round_summaries(self, game_id: int) -> List[RoundSummary]:
+        """Get the stored summaries of a game's closed rounds, oldest first."""
+        async with self._connect() as db:
+            cursor = await db.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM round_summaries WHERE game_id = ? ORDER BY round_id",
+                (game_id,)
+            )
+            rows = await cursor.fetchall()
+            return [RoundSummary.from_row(row) for row in rows]
+    
     # Guess operations
-    async def create_guess(self, guess: Guess) -> int:
-        """Create a new guess."""
-        async with aiosqlite.connect(self.db_path) as db:
+    async def create_guess(self, guess: Guess, log_frontier: Optional[str] = None) -> Optional[int]:
+        """
+        Create a new guess. Returns None if the message was already recorded as a guess.
+        
+        If ``log_frontier`` is given, the round's Merkle log state (size
+        ``guess.log_index + 1``) is stored in the same transaction.
+        """
+        async with self._connect() as db:
             cursor = await db.execute(
-                """INSERT INTO guesses (game_id, round_id, user_id, value, is_correct, created_at)
-                   VALUES (?, ?, ?, ?, ?, ?)""",
+                """INSERT INTO guesses (game_id, round_id, user_id, value, is_correct, created_at, message_id,
+                                        log_index, leaf_hash)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(game_id, message_id) DO NOTHING""",
                 (guess.game_id, guess.round_id, guess.user_id, guess.value, 
-                 guess.is_correct, guess.created_at)
+                 guess.is_correct, guess.created_at, guess.message_id,
+                 guess.log_index, guess.leaf_hash)
             )
+            if cursor.rowcount == 0:
+                return None
+            if log_frontier is not None:
+                await db.execute(
+                    "UPDATE rounds SET log_size = ?, log_frontier = ? WHERE id = ?",
+                    (guess.log_index + 1, log_frontier, guess.round_id)
+                )
             await db.commit()
             return cursor.lastrowid
     
     async def get_user_guesses_in_round(self, round_id: int, user_id: int) -> List[Guess]:
         """Get all guesses by a user in a round."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._connect() as db:
             cursor = await db.execute(
-                """SELECT * FROM guesses 
+                f"""SELECT {GUESS_COLUMNS} FROM guesses 
                    WHERE round_id = ? AND user_id = ? 
                    ORDER BY created_at""",
                 (round_id, user_id)
             )
             rows = await cursor.fetchall()
-            return [self._row_to_guess(row) for row in rows]
+            return [Guess.from_row(row) for row in rows]
+    
+    async def get_guesses_for_game(self, game_id: int) -> List[Guess]:
+        """Get all guesses of a game in the order they were made."""
+        async with self._connect() as db:
+            cursor = await db.execute(
+                f"SELECT {GUESS_COLUMNS} FROM guesses WHERE game_id = ? ORDER BY id",
+                (game_id,)
+            )
+            rows = await cursor.fetchall()
+            return [Guess.from_row(row) for row in rows]
+    
+    async def get_logged_guess(
+        self,
+        chat_id: int,
+        user_id: int,
+        message_id: Optional[int] = None
+    ) -> Optional[Guess]:
+        """Get a user's logged guess in a chat: the one sent as ``message_id``, or their latest."""
+        query = (
+            f"SELECT {GUESS_COLUMNS} FROM guesses "
+            "WHERE game_id IN (SELECT id FROM games WHERE chat_id = ?) AND user_id = ? AND log_index IS NOT NULL"
+        )
+        params: List[Any] = [chat_id, user_id]
+        if message_id is not None:
+            query += " AND message_id = ?"
+            params.append(message_id)
+        async with self._connect() as db:
+            cursor = await db.execute(query + " ORDER BY id DESC LIMIT 1", params)
+            row = await cursor.fetchone()
+            return Guess.from_row(row) if row else None
+    
+    async def get_round_leaves(self, round_id: int) -> List[str]:
+        """Get the leaf hashes of a round's Merkle log in log order."""
+        async with self._connect() as db:
+            cursor = await db.execute(
+                "SELECT leaf_hash FROM guesses WHERE round_id = ? AND log_index IS NOT NULL ORDER BY log_index",
+                (round_id,)
+            )
+            return [row[0] for row in await cursor.fetchall()]
     
     async def get_last_guess(self, round_id: int) -> Optional[Guess]:
         """Get the last guess in a round."""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._connect() as db:
             cursor = await db.execute(
-                """SELECT * FROM guesses 
+                f"""SELECT {GUESS_COLUMNS} FROM guesses 
                    WHERE round_id = ? 
                    ORDER BY created_at DESC LIMIT 1""",
                 (round_id,)
             )
             row = await cursor.fetchone()
             if row:
-                return self._row_to_guess(row)
+                return Guess.from_row(row)
             return None
     
+    async def iter_guess_rows(
+        self,
+        chat_id: Optional[int] = None,
+        game_id: Optional[int] = None,
+        chunk_size: int = 50000
+    ) -> AsyncIterator[List[Tuple]]:
+        """
+        Stream guesses as ``ANALYTICS_COLUMNS`` tuples in chunks, ordered by ID.
+        
+        Uses keyset pagination on the guess ID so each chunk is an index range
+        scan and memory stays bounded regardless of table size.
+        
+        Args:
+            chat_id: Optional chat to restrict to
+            game_id: Optional game to restrict to
+            chunk_size: Maximum rows per yielded chunk
+        """
+        conditions = ["g.id > ?"]
+        params: List[Any] = []
+        if chat_id is not None:
+            conditions.append("gm.chat_id = ?")
+            params.append(chat_id)
+        if game_id is not None:
+            conditions.append("g.game_id = ?")
+            params.append(game_id)
+        query = f"""SELECT {ANALYTICS_COLUMNS} FROM guesses g
+                    JOIN rounds r ON r.id = g.round_id
+                    JOIN games gm ON gm.id = g.game_id
+                    WHERE {" AND ".join(conditions)}
+                    ORDER BY g.id LIMIT ?"""
+        
+        last_id = 0
+        async with self._connect() as db:
+            while True:
+                cursor = await db.execute(query, (last_id, *params, chunk_size))
+                rows = await cursor.fetchall()
+                if not rows:
+                    return
+                yield rows
+                if len(rows) < chunk_size:
+                    return
+                last_id = rows[-1][0]
+    
     # Participation operations
     async def increment_participation(self, game_id: int, round_id: int, user_id: int):
         """Increment or create participation record."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute(
                 """INSERT INTO participations (game_id, round_id, user_id, guesses_count)
                    VALUES (?, ?, ?, 1)
@@ -275,7 +732,7 @@ class Database:
     
     async def get_user_participated_rounds(self, game_id: int, user_id: int) -> List[int]:
         """Get list of round indices where user participated."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             cursor = await db.execute(
                 """SELECT DISTINCT r.round_index 
                    FROM participations p
@@ -287,46 +744,304 @@ class Database:
             rows = await cursor.fetchall()
             return [row[0] for row in rows]
     
-    # Helper methods to convert rows to objects
-    def _row_to_game(self, row) -> Game:
-        """Convert database row to Game object."""
-        return Game(
-            id=row['id'],
-            chat_id=row['chat_id'],
-            status=row['status'],
-            target_hash=row['target_hash'],
-            salt=row['salt'],
-            number=row['number'],
-            created_at=row['created_at'],
-            finished_at=row['finished_at'],
-            winner_user_id=row['winner_user_id'],
-            prize_amount=row['prize_amount'],
-            sponsor_name=row['sponsor_name'],
-            sponsor_start_message=row['sponsor_start_message'],
-            sponsor_end_message=row['sponsor_end_message']
-        )
+    # Commitment pool operations
+    async def add_commitments(self, commitments: Sequence[Tuple[str, str]]):
+        """Add (target_hash, sealed) commitments to the pool."""
+        async with self._connect() as db:
+            now = self.clock.time()
+            await db.executemany(
+                "INSERT INTO commitment_pool (target_hash, sealed, created_at) VALUES (?, ?, ?)",
+                [(target_hash, sealed, now) for target_hash, sealed in commitments]
+            )
+            await db.commit()
     
-    def _row_to_round(self, row) -> Round:
-        """Convert database row to Round object."""
-        return Round(
-            id=row['id'],
-            game_id=row['game_id'],
-            round_index=row['round_index'],
-            status=row['status'],
-            message_cost_hint=row['message_cost_hint'],
-            started_at=row['started_at'],
-            ended_at=row['ended_at'],
-            total_guesses=row['total_guesses']
-        )
+    async def pop_commitment(self) -> Optional[Tuple[str, str]]:
+        """Remove and return the oldest pooled (target_hash, sealed) commitment, if any."""
+        async with self._connect() as db:
+            # One statement, so concurrent workers never get the same commitment
+            cursor = await db.execute(
+                """DELETE FROM commitment_pool
+                   WHERE id = (SELECT MIN(id) FROM commitment_pool)
+                   RETURNING target_hash, sealed"""
+            )
+            row = await cursor.fetchone()
+            await cursor.close()
+            await db.commit()
+            return tuple(row) if row else None
+    
+    async def count_commitments(self) -> int:
+        """Count the commitments left in the pool."""
+        async with self._connect() as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM commitment_pool")
+            row = await cursor.fetchone()
+            return row[0]
+    
+    # Audit operations
+    async def iter_auditable_games(self, after_id: int = 0, chunk_size: int = 10000) -> AsyncIterator[List[Tuple]]:
+        """
+        Stream games that aren't canceled as (id, chat_id, number, salt, target_hash, status) in ID order.
+        
+        Running games are included so an audit can note them and come back
+        once they finish. Keyset pagination keeps each chunk an index range scan.
+        
+        Args:
+            after_id: Only games with a greater ID
+            chunk_size: Maximum rows per yielded chunk
+        """
+        last_id = after_id
+        async with self._connect() as db:
+            while True:
+                cursor = await db.execute(
+                    """SELECT id, chat_id, number, salt, target_hash, status FROM games
+                       WHERE id > ? AND status != ?
+                       ORDER BY id LIMIT ?""",
+                    (last_id, GameStatus.GAME_CANCELED, chunk_size)
+                )
+                rows = await cursor.fetchall()
+                if not rows:
+                    return
+                yield rows
+                if len(rows) < chunk_size:
+                    return
+                last_id = rows[-1][0]
     
-    def _row_to_guess(self, row) -> Guess:
-        """Convert database row to Guess object."""
-        return Guess(
-            id=row['id'],
-            game_id=row['game_id'],
-            round_id=row['round_id'],
-            user_id=row['user_id'],
-            value=row['value'],
-            is_correct=row['is_correct'],
-            created_at=row['created_at']
+    async def get_auditable_games(self, game_ids: Sequence[int]) -> List[Tuple]:
+        """Get the listed games that aren't canceled, in the ``iter_auditable_games`` row shape."""
+        rows = []
+        async with self._connect() as db:
+            # Chunked to stay under SQLite's bound parameter limit
+            for i in range(0, len(game_ids), 500):
+                chunk = list(game_ids[i:i + 500])
+                placeholders = ",".join("?" * len(chunk))
+                cursor = await db.execute(
+                    f"""SELECT id, chat_id, number, salt, target_hash, status FROM games
+                        WHERE id IN ({placeholders}) AND status != ? ORDER BY id""",
+                    (*chunk, GameStatus.GAME_CANCELED)
+                )
+                rows += await cursor.fetchall()
+        return rows
+    
+    async def get_audit_checkpoint(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get the progress of a named audit (with its mismatches and pending games), if it has been started."""
+        async with self._connect() as db:
+            cursor = await db.execute(
+                """SELECT last_game_id, games_audited, mismatches, started_at, updated_at
+                   FROM audit_checkpoints WHERE name = ?""",
+                (name,)
+            )
+            row = await cursor.fetchone()
+            if not row:
+                return None
+            # Checkpoints saved before mismatches got their own table kept them as JSON
+            mismatches = json.loads(row[2])
+            cursor = await db.execute(
+                """SELECT game_id, chat_id, target_hash, computed_hash FROM audit_mismatches
+                   WHERE name = ? ORDER BY game_id""",
+                (name,)
+            )
+            mismatches += [
+                {'game_id': m[0], 'chat_id': m[1], 'target_hash': m[2], 'computed_hash': m[3]}
+                for m in await cursor.fetchall()
+            ]
+            cursor = await db.execute(
+                "SELECT game_id FROM audit_pending WHERE name = ? ORDER BY game_id",
+                (name,)
+            )
+            pending = [p[0] for p in await cursor.fetchall()]
+            return {
+                'last_game_id': row[0],
+                'games_audited': row[1],
+                'mismatches': mismatches,
+                'pending': pending,
+                'started_at': row[3],
+                'updated_at': row[4],
+            }
+    
+    async def save_audit_checkpoint(
+        self,
+        name: str,
+        last_game_id: int,
+        games_audited: int,
+        started_at: float,
+        mismatches: Sequence[Dict[str, Any]] = (),
+        pending_added: Sequence[int] = (),
+        pending_done: Sequence[int] = ()
+    ):
+        """
+        Record how far a named audit has got, in one transaction.
+        
+        Args:
+            name: Audit name
+            last_game_id: Highest game ID the audit has passed
+            games_audited: Total games verified so far
+            started_at: When the audit started
+            mismatches: Mismatches found since the last save (only these are written)
+            pending_added: Running games passed since the last save
+            pending_done: Pending games that were audited or canceled since the last save
+        """
+        async with self._connect() as db:
+            await db.execute(
+                """INSERT INTO audit_checkpoints
+                   (name, last_game_id, games_audited, mismatches, started_at, updated_at)
+                   VALUES (?, ?, ?, '[]', ?, ?)
+                   ON CONFLICT(name) DO UPDATE SET
+                       last_game_id = excluded.last_game_id,
+                       games_audited = excluded.games_audited,
+                       updated_at = excluded.updated_at""",
+                (name, last_game_id, games_audited, started_at, self.clock.time())
+            )
+            await db.executemany(
+                """INSERT OR REPLACE INTO audit_mismatches (name, game_id, chat_id, target_hash, computed_hash)
+                   VALUES (?, ?, ?, ?, ?)""",
+                [(name, m['game_id'], m['chat_id'], m['target_hash'], m['computed_hash']) for m in mismatches]
+            )
+            await db.executemany(
+                "INSERT OR IGNORE INTO audit_pending (name, game_id) VALUES (?, ?)",
+                [(name, game_id) for game_id in pending_added]
+            )
+            await db.executemany(
+                "DELETE FROM audit_pending WHERE name = ? AND game_id = ?",
+                [(name, game_id) for game_id in pending_done]
+            )
+            await db.commit()
+    
+    async def delete_audit_checkpoint(self, name: str):
+        """Forget a named audit so the next run starts from the first game."""
+        async with self._connect() as db:
+            await db.execute("DELETE FROM audit_checkpoints WHERE name = ?", (name,))
+            await db.execute("DELETE FROM audit_mismatches WHERE name = ?", (name,))
+            await db.execute("DELETE FROM audit_pending WHERE name = ?", (name,))
+            await db.commit()
+    
+    # Outbox operations
+    async def _insert_outbox(self, db, messages: Sequence[OutboxMessage]):
+        """Insert outbox messages on an open connection (caller commits)."""
+        if not messages:
+            return
+        now = self.clock.time()
+        await db.executemany(
+            """INSERT INTO outbox (chat_id, text, reply_markup, reply_to_message_id, 
+               attempts, next_attempt_at, created_at)
+               VALUES (?, ?, ?, ?, 0, ?, ?)""",
+            [(m.chat_id, m.text, m.reply_markup, m.reply_to_message_id, now, now) for m in messages]
         )
+    
+    async def enqueue_outbox(self, messages: Sequence[OutboxMessage]):
+        """Enqueue outbox messages on their own."""
+        async with self._connect() as db:
+            await self._insert_outbox(db, messages)
+            await db.commit()
+    
+    async def get_due_outbox(self, now: float, limit: int) -> List[OutboxMessage]:
+        """
+        Get undelivered outbox messages that are due, oldest first.
+        
+        A message waits while an older one to the same chat is undelivered
+        (e.g. in backoff), so each chat gets its messages in order.
+        """
+        async with self._connect() as db:
+            cursor = await db.execute(
+                f"""SELECT {OUTBOX_COLUMNS} FROM outbox 
+                   WHERE next_attempt_at IS NOT NULL AND next_attempt_at <= ? 
+                   AND NOT EXISTS (
+                       SELECT 1 FROM outbox o2 
+                       WHERE o2.chat_id = outbox.chat_id AND o2.id < outbox.id 
+                       AND o2.next_attempt_at IS NOT NULL
+                   )
+                   ORDER BY id LIMIT ?""",
+                (now, limit)
+            )
+            rows = await cursor.fetchall()
+            return [OutboxMessage.from_row(row) for row in rows]
+    
+    async def mark_outbox_sent(self, message_ids: Sequence[int], sent_at: float):
+        """Mark outbox messages as delivered."""
+        async with self._connect() as db:
+            await db.executemany(
+                "UPDATE outbox SET sent_at = ?, next_attempt_at = NULL, attempts = attempts + 1 WHERE id = ?",
+                [(sent_at, message_id) for message_id in message_ids]
+            )
+            await db.commit()
+    
+    async def mark_outbox_failed(
+        self,
+        message_id: int,
+        attempts: int,
+        next_attempt_at: Optional[float],
+        error: str
+    ):
+        """Record a failed delivery; next_attempt_at None means give up."""
+        async with self._connect() as db:
+            await db.execute(
+                "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (attempts, next_attempt_at, error, message_id)
+            )
+            await db.commit()
+    
+    async def count_pending_outbox(self) -> int:
+        """Count outbox messages still waiting for delivery."""
+        async with self._connect() as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM outbox WHERE next_attempt_at IS NOT NULL")
+            row = await cursor.fetchone()
+            return row[0]
+    
+    # Pending input operations
+    async def set_pending_input(self, chat_id: int, round_index: int, expires_at: float):
+        """Store or replace a pending admin input for a chat."""
+        async with self._connect() as db:
+            await db.execute(
+                """INSERT INTO pending_inputs (chat_id, round_index, expires_at) VALUES (?, ?, ?)
+                   ON CONFLICT(chat_id) DO UPDATE SET
+                   round_index = excluded.round_index, expires_at = excluded.expires_at""",
+                (chat_id, round_index, expires_at)
+            )
+            await db.commit()
+    
+    async def get_pending_input(self, chat_id: int, now: float) -> Optional[Tuple[int, float]]:
+        """Get an unexpired pending input as (round_index, expires_at)."""
+        async with self._connect() as db:
+            cursor = await db.execute(
+                "SELECT round_index, expires_at FROM pending_inputs WHERE chat_id = ? AND expires_at > ?",
+                (chat_id, now)
+            )
+            row = await cursor.fetchone()
+            return (row[0], row[1]) if row else None
+    
+    async def get_pending_inputs(self, now: float) -> List[Tuple[int, int, float]]:
+        """Get all unexpired pending inputs as (chat_id, round_index, expires_at)."""
+        async with self._connect() as db:
+            cursor = await db.execute(
+                "SELECT chat_id, round_index, expires_at FROM pending_inputs WHERE expires_at > ?",
+                (now,)
+            )
+            return [tuple(row) for row in await cursor.fetchall()]
+    
+    async def delete_pending_input(self, chat_id: int):
+        """Delete the pending input for a chat."""
+        async with self._connect() as db:
+            await db.execute("DELETE FROM pending_inputs WHERE chat_id = ?", (chat_id,))
+            await db.commit()
+    
+    async def delete_expired_pending_inputs(self, now: float):
+        """Delete all expired pending inputs."""
+        async with self._connect() as db:
+            await db.execute("DELETE FROM pending_inputs WHERE expires_at <= ?", (now,))
+            await db.commit()
+    
+    # Chat settings operations
+    async def get_chat_languages(self) -> Dict[int, str]:
+        """Get the language setting of every chat that has one."""
+        async with self._connect() as db:
+            cursor = await db.execute("SELECT chat_id, language FROM chat_settings")
+            rows = await cursor.fetchall()
+            return {row[0]: row[1] for row in rows}
+    
+    async def set_chat_language(self, chat_id: int, language: str):
+        """Set the language for a chat."""
+        async with self._connect() as db:
+            await db.execute(
+                """INSERT INTO chat_settings (chat_id, language) VALUES (?, ?)
+                   ON CONFLICT(chat_id) DO UPDATE SET language = excluded.language""",
+                (chat_id, language)
+            )
+            await db.commit()
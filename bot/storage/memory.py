@@ -0,0 +1,615 @@
+"""In-memory storage backend, with optional periodic snapshots to disk.
+
+``MemoryDatabase`` implements the same operations as ``Database`` on
+plain dicts and lists: guesses live in an array indexed by ID, with
+per-round and per-game lists for lookups. Nothing blocks on disk, so it
+suits ephemeral or high-throughput deployments, tests and benchmarks.
+
+Durability is optional. With a ``snapshot_path``, the whole state is
+pickled to that file every ``snapshot_interval`` seconds and on ``stop``,
+and ``init_db`` loads it again. Guesses made after the last snapshot are
+lost on a crash. The snapshot is a trusted local file: it is unpickled.
+"""
+import asyncio
+import copy
+import logging
+import os
+import pickle
+from collections import deque
+from typing import Optional, List, Dict, Any, Tuple, Sequence, AsyncIterator
+from bot.storage.models import (
+    Game,
+    Round,
+    Guess,
+    OutboxMessage,
+    RoundSummary,
+    GameStatus,
+    RoundStatus
+)
+from bot.utils.clock import SystemClock
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+_ENDED_GAME = (GameStatus.GAME_FINISHED, GameStatus.GAME_CANCELED)
+_OPEN_ROUND = (RoundStatus.ACTIVE, RoundStatus.PAUSED)
+
+class MemoryDatabase:
+    """Storage held in memory; see the module docstring."""
+    
+    def __init__(self, snapshot_path: Optional[str] = None, snapshot_interval: float = 60.0, clock=None):
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self.clock = clock or SystemClock()
+        self.tracer = None  # Query tracing only applies to SQLite
+        self._task: Optional[asyncio.Task] = None
+        self._reset()
+    
+    def _reset(self):
+        """Empty every table."""
+        self.games: Dict[int, Game] = {}
+        self.games_by_chat: Dict[int, List[int]] = {}
+        self.rounds: Dict[int, Round] = {}
+        self.rounds_by_game: Dict[int, List[int]] = {}
+        self.guesses: List[Guess] = []  # Guess ID n is at index n - 1
+        self.guesses_by_round: Dict[int, List[Guess]] = {}
+        self.guesses_by_game: Dict[int, List[Guess]] = {}
+        self.guess_messages: set = set()  # (game_id, message_id) of every guess with a message
+        self.participations: Dict[int, Dict[Tuple[int, int], int]] = {}  # game -> (round, user) -> guesses
+        self.summaries: Dict[int, RoundSummary] = {}
+        self.outbox: Dict[int, OutboxMessage] = {}  # Insertion (ID) order
+        self.pending_inputs: Dict[int, Tuple[int, float]] = {}
+        self.chat_languages: Dict[int, str] = {}
+        self.commitments: deque = deque()
+        self.audit_checkpoints: Dict[str, Dict[str, Any]] = {}
+        self._next_game_id = 1
+        self._next_round_id = 1
+        self._next_outbox_id = 1
+    
+    async def init_db(self):
+        """Load the snapshot, if one is configured and exists."""
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "rb") as f:
+                state = pickle.load(f)
+            if state.get("version") != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported snapshot version in {self.snapshot_path}")
+            self.__dict__.update(state["tables"])
+            logger.info(
+                f"Loaded snapshot {self.snapshot_path}: {len(self.games)} games, {len(self.guesses)} guesses"
+            )
+    
+    async def ping(self):
+        """Always reachable."""
+    
+    # Snapshots
+    def _state(self) -> bytes:
+        """Pickle every table (on the loop, so the state is consistent)."""
+        names = (
+            "games", "games_by_chat", "rounds", "rounds_by_game",
+            "guesses", "guesses_by_round", "guesses_by_game", "guess_messages", "participations", "summaries", "outbox", "pending_inputs",
+            "chat_languages", "commitments", "audit_checkpoints",
+            "_next_game_id", "_next_round_id", "_next_outbox_id",
+        )
+        tables = {name: getattr(self, name) for name in names}
+        return pickle.dumps({"version": SNAPSHOT_VERSION, "tables": tables}, pickle.HIGHEST_PROTOCOL)
+    
+    def _write_snapshot(self, data: bytes):
+        """Write a snapshot atomically: a crash mid-write keeps the previous one."""
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+    
+    async def snapshot(self):
+        """Write the current state to ``snapshot_path``."""
+        if not self.snapshot_path:
+            return
+        data = self._state()
+        await asyncio.to_thread(self._write_snapshot, data)
+        logger.debug(f"Snapshot written to {self.snapshot_path} ({len(data)} bytes)")
+    
+    def start(self):
+        """Start periodic snapshots (if a path and interval are configured)."""
+        if self._task is None and self.snapshot_path and self.snapshot_interval > 0:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Snapshotting to {self.snapshot_path} every {self.snapshot_interval:.0f}s")
+    
+    async def stop(self):
+        """Stop periodic snapshots and write a final one."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.snapshot()
+    
+    async def _run(self):
+        """Snapshot loop."""
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            try:
+                await self.snapshot()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Snapshot failed: {e}", exc_info=True)
+    
+    # Game operations
+    async def create_game(self, game: Game) -> int:
+        """Create a new game."""
+        stored = copy.copy(game)
+        stored.id = self._next_game_id
+        self._next_game_id += 1
+        self.games[stored.id] = stored
+        self.games_by_chat.setdefault(stored.chat_id, []).append(stored.id)
+        return stored.id
+    
+    async def get_active_game(self, chat_id: int) -> Optional[Game]:
+        """Get the active game for a chat."""
+        active = [
+            self.games[game_id] for game_id in self.games_by_chat.get(chat_id, ())
+            if self.games[game_id].status not in _ENDED_GAME
+        ]
+        if not active:
+            return None
+        return copy.copy(max(active, key=lambda game: (game.created_at, game.id)))
+    
+    async def get_game(self, game_id: int) -> Optional[Game]:
+        """Get a game by ID."""
+        game = self.games.get(game_id)
+        return copy.copy(game) if game else None
+    
+    async def get_chats_with_active_round(self) -> List[int]:
+        """Get chat IDs whose current game has an active or paused round."""
+        chats = {
+            self.games[round_obj.game_id].chat_id
+            for round_obj in self.rounds.values()
+            if round_obj.status in _OPEN_ROUND and self.games[round_obj.game_id].status not in _ENDED_GAME
+        }
+        return list(chats)
+    
+    async def update_game_status(
+        self,
+        game_id: int,
+        status: str,
+        announcements: Sequence[OutboxMessage] = ()
+    ):
+        """Update game status, enqueueing any announcements with it; ending the game closes its open round."""
+        if game_id in self.games:
+            self.games[game_id].status = status
+            if status in _ENDED_GAME:
+                self._close_open_rounds(game_id)
+        self._insert_outbox(announcements)
+    
+    async def finish_game(
+        self,
+        game_id: int,
+        winner_user_id: int,
+        announcements: Sequence[OutboxMessage] = ()
+    ) -> bool:
+        """Mark game as finished with winner, enqueueing any announcements with it; False if it already ended."""
+        game = self.games.get(game_id)
+        if game is None or game.status in _ENDED_GAME:
+            return False
+        game.status = GameStatus.GAME_FINISHED
+        game.finished_at = self.clock.now()
+        game.winner_user_id = winner_user_id
+        self._close_open_rounds(game_id)
+        self._insert_outbox(announcements)
+        return True
+    
+    def _close_open_rounds(self, game_id: int):
+        """Close a game's active or paused round."""
+        for round_id in self.rounds_by_game.get(game_id, ()):
+            round_obj = self.rounds[round_id]
+            if round_obj.status in _OPEN_ROUND:
+                round_obj.status = RoundStatus.CLOSED
+                round_obj.ended_at = self.clock.now()
+    
+    # Round operations
+    async def create_round(self, round_obj: Round) -> int:
+        """Create a new round."""
+        stored = copy.copy(round_obj)
+        stored.id = self._next_round_id
+        self._next_round_id += 1
+        stored.log_size = 0
+        stored.log_frontier = None
+        self.rounds[stored.id] = stored
+        self.rounds_by_game.setdefault(stored.game_id, []).append(stored.id)
+        return stored.id
+    
+    async def get_active_round(self, game_id: int) -> Optional[Round]:
+        """Get the active round for a game."""
+        open_rounds = [
+            self.rounds[round_id] for round_id in self.rounds_by_game.get(game_id, ())
+            if self.rounds[round_id].status in _OPEN_ROUND
+        ]
+        if not open_rounds:
+            return None
+        return copy.copy(max(open_rounds, key=lambda round_obj: round_obj.round_index))
+    
+    async def get_round(self, round_id: int) -> Optional[Round]:
+        """Get a round by ID."""
+        round_obj = self.rounds.get(round_id)
+        return copy.copy(round_obj) if round_obj else None
+    
+    async def get_rounds_for_game(self, game_id: int) -> List[Round]:
+        """Get all rounds for a game."""
+        rounds = [copy.copy(self.rounds[round_id]) for round_id in self.rounds_by_game.get(game_id, ())]
+        rounds.sort(key=lambda round_obj: round_obj.round_index)
+        return rounds
+    
+    async def get_timed_rounds(self) -> List[Round]:
+        """Get the active rounds of running games, whose timers must be armed."""
+        return [
+            copy.copy(round_obj) for round_obj in self.rounds.values()
+            if round_obj.status == RoundStatus.ACTIVE and self.games[round_obj.game_id].status not in _ENDED_GAME
+        ]
+    
+    async def set_round_deadline(self, round_id: int, deadline: Optional[float]):
+        """Persist when a round's timer fires (None when it has no running timer)."""
+        if round_id in self.rounds:
+            self.rounds[round_id].timer_deadline = deadline
+    
+    async def update_round_status(self, round_id: int, status: str):
+        """Update round status."""
+        if round_id in self.rounds:
+            self.rounds[round_id].status = status
+    
+    async def close_round(
+        self,
+        round_id: int,
+        game_id: Optional[int] = None,
+        announcements: Sequence[OutboxMessage] = (),
+        summary: Optional[RoundSummary] = None
+    ):
+        """Close a round, storing its summary and announcements with it."""
+        round_obj = self.rounds.get(round_id)
+        if round_obj:
+            round_obj.status = RoundStatus.CLOSED
+            round_obj.ended_at = self.clock.now()
+        if game_id is not None and game_id in self.games:
+            self.games[game_id].status = GameStatus.GAME_COMMITTED
+        if summary is not None:
+            self.summaries[summary.round_id] = copy.deepcopy(summary)
+        self._insert_outbox(announcements)
+    
+    async def increment_round_guesses(
+        self,
+        round_id: int,
+        range_low: Optional[int] = None,
+        range_high: Optional[int] = None
+    ):
+        """Increment total guesses for a round, narrowing its stored interval."""
+        round_obj = self.rounds.get(round_id)
+        if not round_obj:
+            return
+        round_obj.total_guesses += 1
+        if range_low is not None:
+            round_obj.range_low = range_low if round_obj.range_low is None else max(round_obj.range_low, range_low)
+        if range_high is not None:
+            round_obj.range_high = range_high if round_obj.range_high is None else min(round_obj.range_high, range_high)
+    
+    async def compute_round_summary(
+        self,
+        round_id: int,
+        game_id: int,
+        target_number: int,
+        top_n: int = 3
+    ) -> RoundSummary:
+        """Compute a round's summary in one pass over its guesses."""
+        round_guesses = self.guesses_by_round.get(round_id, [])
+        below = above = None
+        for guess in self.guesses_by_game.get(game_id, ()):
+            if guess.round_id > round_id:
+                continue
+            if guess.value < target_number and (below is None or guess.value > below):
+                below = guess.value
+            elif guess.value > target_number and (above is None or guess.value < above):
+                above = guess.value
+        
+        closest = min(round_guesses, key=lambda guess: (abs(guess.value - target_number), guess.id), default=None)
+        counts: Dict[int, int] = {}
+        first_id: Dict[int, int] = {}
+        for guess in round_guesses:
+            counts[guess.user_id] = counts.get(guess.user_id, 0) + 1
+            first_id.setdefault(guess.user_id, guess.id)
+        top = sorted(counts, key=lambda user_id: (-counts[user_id], first_id[user_id]))[:top_n]
+        
+        return RoundSummary(
+            round_id=round_id,
+            game_id=game_id,
+            guess_count=len(round_guesses),
+            unique_players=len(counts),
+            closest_value=closest.value if closest else None,
+            closest_user_id=closest.user_id if closest else None,
+            range_low=below + 1 if below is not None else None,
+            range_high=above - 1 if above is not None else None,
+            top_guessers=[(user_id, counts[user_id]) for user_id in top]
+        )
+    
+    async def get_round_summary(self, round_id: int) -> Optional[RoundSummary]:
+        """Get the stored summary of a closed round."""
+        summary = self.summaries.get(round_id)
+        return copy.deepcopy(summary) if summary else None
+    
+    async def get_round_summaries(self, game_id: int) -> List[RoundSummary]:
+        """Get the stored summaries of a game's closed rounds, oldest first."""
+        summaries = [summary for summary in self.summaries.values() if summary.game_id == game_id]
+        summaries.sort(key=lambda summary: summary.round_id)
+        return [copy.deepcopy(summary) for summary in summaries]
+    
+    # Guess operations
+    async def create_guess(self, guess: Guess, log_frontier: Optional[str] = None) -> Optional[int]:
+        """Create a new guess. Returns None if the message was already recorded as a guess."""
+        if guess.message_id is not None:
+            key = (guess.game_id, guess.message_id)
+            if key in self.guess_messages:
+                return None
+            self.guess_messages.add(key)
+        stored = copy.copy(guess)
+        self.guesses.append(stored)
+        stored.id = len(self.guesses)
+        self.guesses_by_round.setdefault(stored.round_id, []).append(stored)
+        self.guesses_by_game.setdefault(stored.game_id, []).append(stored)
+        if log_frontier is not None and stored.round_id in self.rounds:
+            round_obj = self.rounds[stored.round_id]
+            round_obj.log_size = stored.log_index + 1
+            round_obj.log_frontier = log_frontier
+        return stored.id
+    
+    async def get_user_guesses_in_round(self, round_id: int, user_id: int) -> List[Guess]:
+        """Get all guesses by a user in a round."""
+        return [
+            copy.copy(guess) for guess in self.guesses_by_round.get(round_id, ())
+            if guess.user_id == user_id
+        ]
+    
+    async def get_guesses_for_game(self, game_id: int) -> List[Guess]:
+        """Get all guesses of a game in the order they were made."""
+        return [copy.copy(guess) for guess in self.guesses_by_game.get(game_id, ())]
+    
+    async def get_logged_guess(
+        self,
+        chat_id: int,
+        user_id: int,
+        message_id: Optional[int] = None
+    ) -> Optional[Guess]:
+        """Get a user's logged guess in a chat: the one sent as ``message_id``, or their latest."""
+        for game_id in reversed(self.games_by_chat.get(chat_id, [])):
+            for guess in reversed(self.guesses_by_game.get(game_id, [])):
+                if (
+                    guess.user_id == user_id
+                    and guess.log_index is not None
+                    and (message_id is None or guess.message_id == message_id)
+                ):
+                    return copy.copy(guess)
+        return None
+    
+    async def get_round_leaves(self, round_id: int) -> List[str]:
+        """Get the leaf hashes of a round's Merkle log in log order."""
+        logged = [guess for guess in self.guesses_by_round.get(round_id, ()) if guess.log_index is not None]
+        logged.sort(key=lambda guess: guess.log_index)
+        return [guess.leaf_hash for guess in logged]
+    
+    async def get_last_guess(self, round_id: int) -> Optional[Guess]:
+        """Get the last guess in a round."""
+        round_guesses = self.guesses_by_round.get(round_id)
+        if not round_guesses:
+            return None
+        return copy.copy(max(round_guesses, key=lambda guess: (guess.created_at, guess.id)))
+    
+    async def iter_guess_rows(
+        self,
+        chat_id: Optional[int] = None,
+        game_id: Optional[int] = None,
+        chunk_size: int = 50000
+    ) -> AsyncIterator[List[Tuple]]:
+        """Stream guesses as ``ANALYTICS_COLUMNS`` tuples in chunks, ordered by ID."""
+        source = self.guesses_by_game.get(game_id, []) if game_id is not None else self.guesses
+        chunk: List[Tuple] = []
+        for guess in source:
+            game = self.games[guess.game_id]
+            if chat_id is not None and game.chat_id != chat_id:
+                continue
+            chunk.append((
+                guess.id, guess.game_id, guess.round_id, self.rounds[guess.round_id].round_index,
+                guess.user_id, guess.value, game.number
+            ))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    # Participation operations
+    async def increment_participation(self, game_id: int, round_id: int, user_id: int):
+        """Increment or create participation record."""
+        counts = self.participations.setdefault(game_id, {})
+        counts[(round_id, user_id)] = counts.get((round_id, user_id), 0) + 1
+    
+    async def get_user_participated_rounds(self, game_id: int, user_id: int) -> List[int]:
+        """Get list of round indices where user participated."""
+        return sorted({
+            self.rounds[round_id].round_index
+            for round_id, p_user_id in self.participations.get(game_id, {})
+            if p_user_id == user_id
+        })
+    
+    # Commitment pool operations
+    async def add_commitments(self, commitments: Sequence[Tuple[str, str]]):
+        """Add (target_hash, sealed) commitments to the pool."""
+        self.commitments.extend(tuple(commitment) for commitment in commitments)
+    
+    async def pop_commitment(self) -> Optional[Tuple[str, str]]:
+        """Remove and return the oldest pooled (target_hash, sealed) commitment, if any."""
+        return self.commitments.popleft() if self.commitments else None
+    
+    async def count_commitments(self) -> int:
+        """Count the commitments left in the pool."""
+        return len(self.commitments)
+    
+    # Audit operations
+    async def iter_auditable_games(self, after_id: int = 0, chunk_size: int = 10000) -> AsyncIterator[List[Tuple]]:
+        """Stream games that aren't canceled as (id, chat_id, number, salt, target_hash, status) in ID order."""
+        chunk: List[Tuple] = []
+        for game_id in sorted(self.games):
+            if game_id <= after_id:
+                continue
+            row = self._audit_row(self.games[game_id])
+            if row is None:
+                continue
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    async def get_auditable_games(self, game_ids: Sequence[int]) -> List[Tuple]:
+        """Get the listed games that aren't canceled, in the ``iter_auditable_games`` row shape."""
+        rows = (self._audit_row(self.games[game_id]) for game_id in sorted(game_ids) if game_id in self.games)
+        return [row for row in rows if row is not None]
+    
+    @staticmethod
+    def _audit_row(game: Game) -> Optional[Tuple]:
+        if game.status == GameStatus.GAME_CANCELED:
+            return None
+        return (game.id, game.chat_id, game.number, game.salt, game.target_hash, game.status)
+    
+    async def get_audit_checkpoint(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get the progress of a named audit (with its mismatches and pending games), if it has been started."""
+        checkpoint = self.audit_checkpoints.get(name)
+        if not checkpoint:
+            return None
+        result = copy.deepcopy(checkpoint)
+        result['pending'] = sorted(result.get('pending', ()))
+        return result
+    
+    async def save_audit_checkpoint(
+        self,
+        name: str,
+        last_game_id: int,
+        games_audited: int,
+        started_at: float,
+        mismatches: Sequence[Dict[str, Any]] = (),
+        pending_added: Sequence[int] = (),
+        pending_done: Sequence[int] = ()
+    ):
+        """Record how far a named audit has got; only the new mismatches and pending changes are passed."""
+        checkpoint = self.audit_checkpoints.setdefault(name, {'mismatches': [], 'pending': set()})
+        checkpoint.update({
+            'last_game_id': last_game_id,
+            'games_audited': games_audited,
+            'started_at': checkpoint.get('started_at', started_at),
+            'updated_at': self.clock.time(),
+        })
+        checkpoint['mismatches'].extend(copy.deepcopy(list(mismatches)))
+        pending = checkpoint.setdefault('pending', set())
+        pending.update(pending_added)
+        pending.difference_update(pending_done)
+    
+    async def delete_audit_checkpoint(self, name: str):
+        """Forget a named audit so the next run starts from the first game."""
+        self.audit_checkpoints.pop(name, None)
+    
+    # Outbox operations
+    def _insert_outbox(self, messages: Sequence[OutboxMessage]):
+        """Queue outbox messages, due now."""
+        now = self.clock.time()
+        for message in messages:
+            self.outbox[self._next_outbox_id] = OutboxMessage(
+                id=self._next_outbox_id,
+                chat_id=message.chat_id,
+                text=message.text,
+                reply_markup=message.reply_markup,
+                reply_to_message_id=message.reply_to_message_id,
+                next_attempt_at=now,
+                created_at=now
+            )
+            self._next_outbox_id += 1
+    
+    async def enqueue_outbox(self, messages: Sequence[OutboxMessage]):
+        """Enqueue outbox messages on their own."""
+        self._insert_outbox(messages)
+    
+    async def get_due_outbox(self, now: float, limit: int) -> List[OutboxMessage]:
+        """Get undelivered outbox messages that are due, oldest first; a chat's later messages wait for its older ones."""
+        due = []
+        waiting_chats = set()  # Chats with an older undelivered message
+        for message in self.outbox.values():
+            if message.next_attempt_at is None:
+                continue
+            if message.chat_id not in waiting_chats and message.next_attempt_at <= now:
+                due.append(copy.copy(message))
+                if len(due) == limit:
+                    break
+            waiting_chats.add(message.chat_id)
+        return due
+    
+    async def mark_outbox_sent(self, message_ids: Sequence[int], sent_at: float):
+        """Mark outbox messages as delivered; they are dropped from memory."""
+        for message_id in message_ids:
+            self.outbox.pop(message_id, None)
+    
+    async def mark_outbox_failed(
+        self,
+        message_id: int,
+        attempts: int,
+        next_attempt_at: Optional[float],
+        error: str
+    ):
+        """Record a failed delivery; next_attempt_at None means give up."""
+        if next_attempt_at is None:
+            self.outbox.pop(message_id, None)
+            return
+        message = self.outbox.get(message_id)
+        if message:
+            message.attempts = attempts
+            message.next_attempt_at = next_attempt_at
+            message.last_error = error
+    
+    async def count_pending_outbox(self) -> int:
+        """Count outbox messages still waiting for delivery."""
+        return len(self.outbox)
+    
+    # Pending input operations
+    async def set_pending_input(self, chat_id: int, round_index: int, expires_at: float):
+        """Store or replace a pending admin input for a chat."""
+        self.pending_inputs[chat_id] = (round_index, expires_at)
+    
+    async def get_pending_input(self, chat_id: int, now: float) -> Optional[Tuple[int, float]]:
+        """Get an unexpired pending input as (round_index, expires_at)."""
+        entry = self.pending_inputs.get(chat_id)
+        return entry if entry and entry[1] > now else None
+    
+    async def get_pending_inputs(self, now: float) -> List[Tuple[int, int, float]]:
+        """Get all unexpired pending inputs as (chat_id, round_index, expires_at)."""
+        return [
+            (chat_id, round_index, expires_at)
+            for chat_id, (round_index, expires_at) in self.pending_inputs.items()
+            if expires_at > now
+        ]
+    
+    async def delete_pending_input(self, chat_id: int):
+        """Delete the pending input for a chat."""
+        self.pending_inputs.pop(chat_id, None)
+    
+    async def delete_expired_pending_inputs(self, now: float):
+        """Delete all expired pending inputs."""
+        for chat_id in [chat_id for chat_id, (_, expires_at) in self.pending_inputs.items() if expires_at <= now]:
+            del self.pending_inputs[chat_id]
+    
+    # Chat settings operations
+    async def get_chat_languages(self) -> Dict[int, str]:
+        """Get the language setting of every chat that has one."""
+        return dict(self.chat_languages)
+    
+    async def set_chat_language(self, chat_id: int, language: str):
+        """Set the language for a chat."""
+        self.chat_languages[chat_id] = language
@@ -1,7 +1,8 @@
 """Data models for the game bot."""
+import json
 from enum import Enum
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional, Sequence, Tuple, Union
 
 class GameStatus(str, Enum):
     """Game status enumeration."""
@@ -19,8 +20,44 @@ class RoundStatus(str, Enum):
     PAUSED = "PAUSED"
     CLOSED = "CLOSED"
 
+class _Timestamp:
+    """
+    Slot-backed timestamp attribute that parses SQLite text lazily.
+    
+    Rows store timestamps as ISO strings; they are only converted to
+    ``datetime`` the first time the attribute is read, and the parsed
+    value is cached back into the slot.
+    """
+    
+    def __set_name__(self, owner, name):
+        self.slot = f"_{name}"
+    
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.slot)
+        if isinstance(value, str):
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                return value
+            setattr(obj, self.slot, value)
+        return value
+    
+    def __set__(self, obj, value: Union[datetime, str, None]):
+        setattr(obj, self.slot, value)
+
 class Game:
     """Represents a game instance."""
+    __slots__ = (
+        "id", "chat_id", "status", "target_hash", "salt", "number",
+        "_created_at", "_finished_at", "winner_user_id", "prize_amount",
+        "sponsor_name", "sponsor_start_message", "sponsor_end_message",
+    )
+    
+    created_at = _Timestamp()
+    finished_at = _Timestamp()
+    
     def __init__(
         self,
         id: Optional[int] = None,
@@ -50,9 +87,23 @@ class Game:
         self.sponsor_name = sponsor_name
         self.sponsor_start_message = sponsor_start_message
         self.sponsor_end_message = sponsor_end_message
+    
+    @classmethod
+    def from_row(cls, row: Sequence) -> "Game":
+        """Build a Game from a row selected with ``GAME_COLUMNS``."""
+        return cls(*row)
 
 class Round:
     """Represents a game round."""
+    __slots__ = (
+        "id", "game_id", "round_index", "status", "message_cost_hint",
+        "_started_at", "_ended_at", "total_guesses", "range_low", "range_high",
+        "log_size", "log_frontier", "timer_deadline",
+    )
+    
+    started_at = _Timestamp()
+    ended_at = _Timestamp()
+    
     def __init__(
         self,
         id: Optional[int] = None,
@@ -63,6 +114,11 @@ class Round:
         started_at: Optional[datetime] = None,
         ended_at: Optional[datetime] = None,
         total_guesses: int = 0,
+        range_low: Optional[int] = None,
+        range_high: Optional[int] = None,
+        log_size: int = 0,
+        log_frontier: Optional[str] = None,
+        timer_deadline: Optional[float] = None,
     ):
         self.id = id
         self.game_id = game_id
@@ -72,9 +128,29 @@ class Round:
         self.started_at = started_at
         self.ended_at = ended_at
         self.total_guesses = total_guesses
+        # Interval still consistent with every hint given so far in the game
+        self.range_low = range_low
+        self.range_high = range_high
+        # Merkle log of the round's guesses: leaf count and serialized frontier
+        self.log_size = log_size
+        self.log_frontier = log_frontier
+        # When the round timer fires (epoch seconds), so it can be re-armed after a restart
+        self.timer_deadline = timer_deadline
+    
+    @classmethod
+    def from_row(cls, row: Sequence) -> "Round":
+        """Build a Round from a row selected with ``ROUND_COLUMNS``."""
+        return cls(*row)
 
 class Guess:
     """Represents a player's guess."""
+    __slots__ = (
+        "id", "game_id", "round_id", "user_id", "value", "is_correct", "_created_at", "message_id",
+        "log_index", "leaf_hash",
+    )
+    
+    created_at = _Timestamp()
+    
     def __init__(
         self,
         id: Optional[int] = None,
@@ -84,6 +160,9 @@ class Guess:
         value: int = 0,
         is_correct: bool = False,
         created_at: Optional[datetime] = None,
+        message_id: Optional[int] = None,
+        log_index: Optional[int] = None,
+        leaf_hash: Optional[str] = None,
     ):
         self.id = id
         self.game_id = game_id
@@ -92,9 +171,19 @@ class Guess:
         self.value = value
         self.is_correct = is_correct
         self.created_at = created_at or datetime.now()
+        self.message_id = message_id  # Telegram message ID, used to reject redelivered updates
+        self.log_index = log_index  # Position in the round's Merkle log (None for unlogged guesses)
+        self.leaf_hash = leaf_hash
+    
+    @classmethod
+    def from_row(cls, row: Sequence) -> "Guess":
+        """Build a Guess from a row selected with ``GUESS_COLUMNS``."""
+        return cls(*row)
 
 class Participation:
     """Represents a player's participation in a round."""
+    __slots__ = ("id", "game_id", "round_id", "user_id", "guesses_count")
+    
     def __init__(
         self,
         id: Optional[int] = None,
@@ -108,3 +197,83 @@ class Participation:
         self.round_id = round_id
         self.user_id = user_id
         self.guesses_count = guesses_count
+    
+    @classmethod
+    def from_row(cls, row: Sequence) -> "Participation":
+        """Build a Participation from a row selected with ``PARTICIPATION_COLUMNS``."""
+        return cls(*row)
+
+class OutboxMessage:
+    """Represents an announcement queued for delivery to a chat."""
+    __slots__ = (
+        "id", "chat_id", "text", "reply_markup", "reply_to_message_id",
+        "attempts", "next_attempt_at", "created_at", "sent_at", "last_error",
+    )
+    
+    def __init__(
+        self,
+        id: Optional[int] = None,
+        chat_id: int = 0,
+        text: str = "",
+        reply_markup: Optional[str] = None,
+        reply_to_message_id: Optional[int] = None,
+        attempts: int = 0,
+        next_attempt_at: Optional[float] = None,
+        created_at: Optional[float] = None,
+        sent_at: Optional[float] = None,
+        last_error: Optional[str] = None,
+    ):
+        self.id = id
+        self.chat_id = chat_id
+        self.text = text
+        self.reply_markup = reply_markup  # Serialized InlineKeyboardMarkup JSON
+        self.reply_to_message_id = reply_to_message_id
+        self.attempts = attempts
+        self.next_attempt_at = next_attempt_at  # Epoch seconds; None once sent or given up
+        self.created_at = created_at
+        self.sent_at = sent_at
+        self.last_error = last_error
+    
+    @classmethod
+    def from_row(cls, row: Sequence) -> "OutboxMessage":
+        """Build an OutboxMessage from a row selected with ``OUTBOX_COLUMNS``."""
+        return cls(*row)
+
+class RoundSummary:
+    """Aggregate statistics of a closed round, computed once at close time."""
+    __slots__ = (
+        "round_id", "game_id", "guess_count", "unique_players", "closest_value",
+        "closest_user_id", "range_low", "range_high", "log_size", "log_root", "top_guessers",
+    )
+    
+    def __init__(
+        self,
+        round_id: int = 0,
+        game_id: int = 0,
+        guess_count: int = 0,
+        unique_players: int = 0,
+        closest_value: Optional[int] = None,
+        closest_user_id: Optional[int] = None,
+        range_low: Optional[int] = None,
+        range_high: Optional[int] = None,
+        log_size: int = 0,
+        log_root: Optional[str] = None,
+        top_guessers: Optional[List[Tuple[int, int]]] = None,
+    ):
+        self.round_id = round_id
+        self.game_id = game_id
+        self.guess_count = guess_count
+        self.unique_players = unique_players
+        self.closest_value = closest_value
+        self.closest_user_id = closest_user_id
+        self.range_low = range_low  # Narrowed interval for the secret after this round
+        self.range_high = range_high
+        self.log_size = log_size  # Guess log size and root published at close
+        self.log_root = log_root
+        self.top_guessers = top_guessers or []  # [(user_id, guess_count), ...]
+    
+    @classmethod
+    def from_row(cls, row: Sequence) -> "RoundSummary":
+        """Build a RoundSummary from a row selected with ``SUMMARY_COLUMNS``."""
+        *fields, top_guessers = row
+        return cls(*fields, top_guessers=[tuple(pair) for pair in json.loads(top_guessers or "[]")])
@@ -0,0 +1,302 @@
+"""Timing and slow-query logging for ``Database`` operations.
+
+``traced_methods`` wraps every public ``Database`` coroutine (and async
+generator). When the database has a ``QueryTracer``, each call records:
+
+- total time of the method
+- connection wait: time spent opening the aiosqlite connection
+- every statement's execution time (including fetching) and rows returned
+
+Statements slower than the threshold are logged once with their
+``EXPLAIN QUERY PLAN``. Rolling windows keep per-method and per-statement
+percentiles for ``/dbstats`` and the ``/metrics`` endpoint. Without a
+tracer, the wrappers only check ``self.tracer`` and call straight through.
+"""
+import functools
+import inspect
+import logging
+import re
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional, Sequence
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+class RollingStats:
+    """Bounded window of recent samples with percentile queries."""
+    __slots__ = ("calls", "total", "samples", "rows", "waits")
+    
+    def __init__(self, window: int):
+        self.calls = 0
+        self.total = 0.0
+        self.samples: Deque[float] = deque(maxlen=window)  # Seconds per call
+        self.rows: Deque[int] = deque(maxlen=window)
+        self.waits: Deque[float] = deque(maxlen=window)  # Connection wait, seconds
+    
+    def add(self, seconds: float, rows: int = 0, wait: float = 0.0):
+        """Record one sample."""
+        self.calls += 1
+        self.total += seconds
+        self.samples.append(seconds)
+        self.rows.append(rows)
+        self.waits.append(wait)
+    
+    @staticmethod
+    def percentile(values: Sequence[float], q: float) -> float:
+        """Nearest-rank percentile of ``values`` (0 if empty)."""
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+    
+    def summary(self) -> Dict[str, float]:
+        """Percentiles over the window, in milliseconds."""
+        return {
+            "calls": self.calls,
+            "p50_ms": self.percentile(self.samples, 0.5) * 1000,
+            "p95_ms": self.percentile(self.samples, 0.95) * 1000,
+            "p99_ms": self.percentile(self.samples, 0.99) * 1000,
+            "max_ms": max(self.samples, default=0.0) * 1000,
+            "avg_rows": sum(self.rows) / len(self.rows) if self.rows else 0.0,
+            "wait_p95_ms": self.percentile(self.waits, 0.95) * 1000,
+        }
+
+class _Call:
+    """Per-call accumulator for the method currently running."""
+    __slots__ = ("method", "started", "wait", "rows")
+    
+    def __init__(self, method: str):
+        self.method = method
+        self.started = time.perf_counter()
+        self.wait = 0.0
+        self.rows = 0
+
+_current_call: ContextVar[Optional[_Call]] = ContextVar("db_current_call", default=None)
+
+class QueryTracer:
+    """Collects method and statement timings for one ``Database``."""
+    
+    def __init__(self, slow_query_ms: float = 100.0, window: int = 1000, max_explained: int = 256):
+        self.slow_query = slow_query_ms / 1000
+        self.window = window
+        self.methods: Dict[str, RollingStats] = {}
+        self.queries: Dict[str, RollingStats] = {}
+        self.slow_queries = 0
+        self._explained: Deque[str] = deque(maxlen=max_explained)  # Statements whose plan was already logged
+    
+    def _stats(self, table: Dict[str, RollingStats], key: str) -> RollingStats:
+        stats = table.get(key)
+        if stats is None:
+            stats = table[key] = RollingStats(self.window)
+        return stats
+    
+    def begin(self, method: str) -> _Call:
+        """Start timing a call to ``Database.<method>``."""
+        return _Call(method)
+    
+    def end(self, call: _Call):
+        """Finish timing a call and add it to the method's window."""
+        self._stats(self.methods, call.method).add(time.perf_counter() - call.started, call.rows, call.wait)
+    
+    def connect(self, db_path: str) -> "_TracedConnect":
+        """Open a connection whose statements are timed."""
+        return _TracedConnect(self, db_path)
+    
+    async def record_query(
+        self,
+        conn: aiosqlite.Connection,
+        sql: str,
+        params: Any,
+        seconds: float,
+        rows: int
+    ):
+        """Record one statement, logging it with its plan if it was slow."""
+        key = _WHITESPACE.sub(" ", sql).strip()
+        self._stats(self.queries, key).add(seconds, rows)
+        call = _current_call.get()
+        if call is not None:
+            call.rows += rows
+        if seconds < self.slow_query:
+            return
+        
+        self.slow_queries += 1
+        method = call.method if call else "?"
+        plan = ""
+        if key not in self._explained:
+            self._explained.append(key)
+            try:
+                cursor = await conn.execute(f"EXPLAIN QUERY PLAN {sql}", params or ())
+                plan = "\n".join(f"  {row[-1]}" for row in await cursor.fetchall())
+            except Exception as e:
+                plan = f"  (no plan: {e})"
+        logger.warning(
+            f"Slow query in Database.{method}: {seconds * 1000:.1f} ms, {rows} row(s): {key}"
+            + (f"\n{plan}" if plan else "")
+        )
+    
+    def snapshot(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """Per-method and per-statement summaries, slowest p95 first."""
+        def ranked(table: Dict[str, RollingStats]) -> List[Dict[str, Any]]:
+            rows = [{"name": name, **stats.summary()} for name, stats in table.items()]
+            rows.sort(key=lambda row: row["p95_ms"], reverse=True)
+            return rows[:top] if top else rows
+        return {
+            "methods": ranked(self.methods),
+            "queries": ranked(self.queries),
+            "slow_queries": self.slow_queries,
+        }
+    
+    def prometheus(self) -> str:
+        """Method timings in the Prometheus text exposition format."""
+        lines = [
+            "# HELP bot_db_method_seconds Database method latency over the recent window",
+            "# TYPE bot_db_method_seconds summary",
+        ]
+        for name, stats in sorted(self.methods.items()):
+            for q in (0.5, 0.95, 0.99):
+                value = RollingStats.percentile(stats.samples, q)
+                lines.append(f'bot_db_method_seconds{{method="{name}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'bot_db_method_seconds_sum{{method="{name}"}} {stats.total:.6f}')
+            lines.append(f'bot_db_method_seconds_count{{method="{name}"}} {stats.calls}')
+        lines += [
+            "# HELP bot_db_slow_queries_total Statements slower than the slow query threshold",
+            "# TYPE bot_db_slow_queries_total counter",
+            f"bot_db_slow_queries_total {self.slow_queries}",
+        ]
+        return "\n".join(lines) + "\n"
+
+class _TracedCursor:
+    """Cursor proxy that records its statement once results are fetched."""
+    
+    def __init__(self, tracer: QueryTracer, conn: aiosqlite.Connection, cursor, sql: str, params, started: float):
+        self._tracer = tracer
+        self._conn = conn
+        self._cursor = cursor
+        self._sql = sql
+        self._params = params
+        self._started = started
+        self._recorded = False
+    
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+    
+    async def _record(self, rows: int):
+        if not self._recorded:
+            self._recorded = True
+            seconds = time.perf_counter() - self._started
+            await self._tracer.record_query(self._conn, self._sql, self._params, seconds, rows)
+    
+    async def fetchone(self):
+        row = await self._cursor.fetchone()
+        await self._record(1 if row is not None else 0)
+        return row
+    
+    async def fetchall(self):
+        rows = await self._cursor.fetchall()
+        await self._record(len(rows))
+        return rows
+
+class _TracedConnection:
+    """Connection proxy timing ``execute`` and ``executemany``."""
+    
+    def __init__(self, tracer: QueryTracer, conn: aiosqlite.Connection):
+        self._tracer = tracer
+        self._conn = conn
+    
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+    
+    async def execute(self, sql: str, params: Any = None):
+        started = time.perf_counter()
+        cursor = await self._conn.execute(sql, params)
+        traced = _TracedCursor(self._tracer, self._conn, cursor, sql, params, started)
+        if cursor.description is None:
+            # No result set (INSERT/UPDATE/DDL): the statement already ran
+            await traced._record(max(cursor.rowcount, 0))
+        return traced
+    
+    async def executemany(self, sql: str, params_seq):
+        params_seq = list(params_seq)
+        started = time.perf_counter()
+        cursor = await self._conn.executemany(sql, params_seq)
+        seconds = time.perf_counter() - started
+        await self._tracer.record_query(self._conn, sql, params_seq[0] if params_seq else None, seconds, len(params_seq))
+        return cursor
+
+class _TracedConnect:
+    """``async with`` wrapper around ``aiosqlite.connect`` measuring connection wait."""
+    
+    def __init__(self, tracer: QueryTracer, db_path: str):
+        self._tracer = tracer
+        self._connect = aiosqlite.connect(db_path)
+    
+    async def __aenter__(self) -> _TracedConnection:
+        started = time.perf_counter()
+        conn = await self._connect.__aenter__()
+        call = _current_call.get()
+        if call is not None:
+            call.wait += time.perf_counter() - started
+        return _TracedConnection(self._tracer, conn)
+    
+    async def __aexit__(self, *exc_info):
+        return await self._connect.__aexit__(*exc_info)
+
+def _trace_coroutine(name: str, method):
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        tracer = self.tracer
+        if tracer is None:
+            return await method(self, *args, **kwargs)
+        call = tracer.begin(name)
+        token = _current_call.set(call)
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            _current_call.reset(token)
+            tracer.end(call)
+    return wrapper
+
+def _trace_generator(name: str, method):
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        tracer = self.tracer
+        generator = method(self, *args, **kwargs)
+        if tracer is None:
+            async for item in generator:
+                yield item
+            return
+        # Only time spent inside the generator counts, not the consumer's work between items
+        call = tracer.begin(name)
+        busy = 0.0
+        try:
+            while True:
+                token = _current_call.set(call)
+                step_started = time.perf_counter()
+                try:
+                    item = await generator.__anext__()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    busy += time.perf_counter() - step_started
+                    _current_call.reset(token)
+                yield item
+        finally:
+            await generator.aclose()
+            call.started = time.perf_counter() - busy
+            tracer.end(call)
+    return wrapper
+
+def traced_methods(cls):
+    """Class decorator wrapping every public coroutine and async generator for tracing."""
+    for name, member in list(vars(cls).items()):
+        if name.startswith("_"):
+            continue
+        if inspect.isasyncgenfunction(member):
+            setattr(cls, name, _trace_generator(name, member))
+        elif inspect.iscoroutinefunction(member):
+            setattr(cls, name, _trace_coroutine(name, member))
+    return cls
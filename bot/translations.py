@@ -1,4 +1,8 @@
 """Translation module for bilingual support (English and Persian)."""
+import sys
+from functools import lru_cache
+from typing import Callable, Dict, Tuple
+from bot.config import LANGUAGE, SUPPORTED_LANGUAGES
 
 class Translations:
     """Provides translations for all bot messages."""
@@ -33,6 +37,10 @@ class Translations:
         "round_paused": "⏸ <b>Round Paused</b>\n\nWaiting for admin to resume...",
         "round_resumed": "▶️ <b>Round {round} Resumed!</b>\n\nContinue guessing!",
         "round_closed": "🔒 <b>Round {round} Closed</b>\n\nNo winner yet. Admin can start the next round.",
+        "summary_title": "📊 <b>Round Summary</b>",
+        "summary_guesses": "🎯 Guesses: <b>{guesses}</b> from <b>{players}</b> player(s)",
+        "summary_range": "🔎 The number is between <b>{low}</b> and <b>{high}</b>",
+        "summary_top": "🏅 Most active: {players}",
         
         # Hints
         "hint_title": "💡 <b>Hint!</b>",
@@ -133,6 +141,57 @@ class Translations:
         "round_closed_btn": "🔒 Round closed",
         "game_revealed_btn": "🔓 Game revealed",
         "game_canceled_btn": "❌ Game canceled",
+        
+        # Guess replies
+        "guess_higher": "The number is <b>higher</b> ⬆️",
+        "guess_lower": "The number is <b>lower</b> ⬇️",
+        "slow_down": "🐢 You're sending guesses too fast. Please wait a moment.",
+        "guess_ruled_out": "🚫 Already ruled out! The number is between <b>{low}</b> and <b>{high}</b>.",
+        
+        # Language settings
+        "cmd_language": "/language [en|fa] - (Admin) Set the bot language for this chat",
+        "language_usage": "⚠️ <b>Usage:</b> <code>/language en</code> or <code>/language fa</code>",
+        "language_set": "✅ Language set to English.",
+        "cmd_analytics": "/analytics - (Admin) Guess heatmap and player statistics for this chat",
+        "analytics_unavailable": "⚠️ Analytics are not available on this server (NumPy is not installed).",
+        "analytics_empty": "📊 No guesses have been recorded in this chat yet.",
+        "analytics_title": "📊 <b>Guess Analytics</b>",
+        "analytics_totals": "🎯 <b>{guesses}</b> guesses · <b>{games}</b> game(s) · <b>{players}</b> player(s)",
+        "analytics_wasted": "🗑 Guesses already ruled out by hints: <b>{wasted}</b>",
+        "analytics_hot": "🔥 Most guessed: {numbers}",
+        "analytics_heatmap": "🗺 <b>Guess Heatmap</b>",
+        "analytics_rounds": "⏱ <b>Convergence by Round</b>",
+        "analytics_round_line": "Round {round}: {guesses:.1f} guesses, {left:.0f} numbers left",
+        "analytics_players": "🧠 <b>Most Efficient Players</b> (bits per guess)",
+        
+        # Guess log (Merkle) proofs
+        "cmd_proof": "/proof - Prove your last guess is in the round's guess log (reply to a guess for that one)",
+        "summary_log": "🧾 Guess log: <b>{size}</b> entries, root <code>{root}</code>",
+        "winner_log": "🧾 Winning guess is entry <b>{index}</b> of {size} in the round's guess log\nRoot: <code>{root}</code>",
+        "log_proof_title": "🧾 <b>Guess Log Proof</b>",
+        "log_proof_position": "Round {round}: entry <b>{index}</b> of {size}",
+        "log_proof_leaf": "Leaf: <code>{leaf}</code>",
+        "log_proof_root": "Root: <code>{root}</code>",
+        "log_proof_path": "Path (leaf to root):",
+        "log_proof_none": "⚠️ No logged guess of yours was found in this chat.",
+        
+        # Database statistics
+        "cmd_dbstats": "/dbstats - (Admin) Slowest database operations",
+        "dbstats_disabled": "⚠️ Database tracing is disabled (DB_TRACE=false).",
+        "dbstats_title": "🗄 <b>Database Timings</b> (slowest p95 first, ms)",
+        "dbstats_line": "<code>{name}</code>: p50 {p50:.1f} · p95 {p95:.1f} · p99 {p99:.1f} · {calls} calls · {rows:.1f} rows · wait {wait:.1f}",
+        "dbstats_slow": "🐢 Slow queries logged: <b>{count}</b>",
+        
+        # Profiling
+        "cmd_profile": "/profile [seconds] - (Admin) Profile the running bot",
+        "profile_usage": "⚠️ Usage: <code>/profile [seconds]</code>, at most {max} seconds.",
+        "profile_busy": "⏳ A profile is already running.",
+        "profile_started": "🔬 Profiling for {seconds:.0f}s...",
+        "profile_title": "🔬 <b>Profile</b>: {seconds:.1f}s, {samples} samples, {cpu:.2f}s CPU",
+        "profile_split": "<code>{name}</code>: {share:.0%} ({cpu:.2f}s)",
+        "profile_top": "🔥 <b>Busiest functions</b>",
+        "profile_function": "<code>{name}</code>: {samples}",
+        "profile_files": "📁 <code>{path}</code>\n📁 <code>{tasks_path}</code>",
     }
     
     # Persian translations (با پشتیبانی RTL)
@@ -165,6 +224,10 @@ class Translations:
         "round_paused": "⏸ <b>دور متوقف شد</b>\n\nمنتظر ادمین برای ادامه...",
         "round_resumed": "▶️ <b>دور {round} از سر گرفته شد!</b>\n\nبه حدس زدن ادامه دهید!",
         "round_closed": "🔒 <b>دور {round} بسته شد</b>\n\nهنوز برنده‌ای نداریم. ادمین می‌تواند دور بعدی را شروع کند.",
+        "summary_title": "📊 <b>خلاصه دور</b>",
+        "summary_guesses": "🎯 حدس‌ها: <b>{guesses}</b> از <b>{players}</b> بازیکن",
+        "summary_range": "🔎 عدد بین <b>{low}</b> و <b>{high}</b> است",
+        "summary_top": "🏅 فعال‌ترین‌ها: {players}",
         
         # Hints
         "hint_title": "💡 <b>راهنما!</b>",
@@ -265,8 +328,138 @@ class Translations:
         "round_closed_btn": "🔒 دور بسته شد",
         "game_revealed_btn": "🔓 بازی فاش شد",
         "game_canceled_btn": "❌ بازی لغو شد",
+        
+        # Guess replies
+        "guess_higher": "عدد <b>بالاتر</b> است ⬆️",
+        "guess_lower": "عدد <b>پایین‌تر</b> است ⬇️",
+        "slow_down": "🐢 خیلی سریع حدس می‌فرستید. لطفا کمی صبر کنید.",
+        "guess_ruled_out": "🚫 این عدد قبلا رد شده! عدد بین <b>{low}</b> و <b>{high}</b> است.",
+        
+        # Language settings
+        "cmd_language": "/language [en|fa] - (ادمین) تنظیم زبان ربات برای این گروه",
+        "language_usage": "⚠️ <b>نحوه استفاده:</b> <code>/language en</code> یا <code>/language fa</code>",
+        "language_set": "✅ زبان به فارسی تغییر کرد.",
+        "cmd_analytics": "/analytics - (ادمین) نقشه حرارتی حدس‌ها و آمار بازیکنان این گروه",
+        "analytics_unavailable": "⚠️ آمار روی این سرور در دسترس نیست (NumPy نصب نشده است).",
+        "analytics_empty": "📊 هنوز هیچ حدسی در این گروه ثبت نشده است.",
+        "analytics_title": "📊 <b>آمار حدس‌ها</b>",
+        "analytics_totals": "🎯 <b>{guesses}</b> حدس · <b>{games}</b> بازی · <b>{players}</b> بازیکن",
+        "analytics_wasted": "🗑 حدس‌هایی که راهنماها قبلا رد کرده بودند: <b>{wasted}</b>",
+        "analytics_hot": "🔥 پرتکرارترین حدس‌ها: {numbers}",
+        "analytics_heatmap": "🗺 <b>نقشه حرارتی حدس‌ها</b>",
+        "analytics_rounds": "⏱ <b>همگرایی در هر دور</b>",
+        "analytics_round_line": "دور {round}: {guesses:.1f} حدس، {left:.0f} عدد باقی‌مانده",
+        "analytics_players": "🧠 <b>کارآمدترین بازیکنان</b> (بیت در هر حدس)",
+        
+        # Guess log (Merkle) proofs
+        "cmd_proof": "/proof - اثبات ثبت آخرین حدس شما در دفتر حدس‌های دور (برای حدس خاص، روی آن ریپلای کنید)",
+        "summary_log": "🧾 دفتر حدس‌ها: <b>{size}</b> مورد، ریشه <code>{root}</code>",
+        "winner_log": "🧾 حدس برنده مورد <b>{index}</b> از {size} در دفتر حدس‌های دور است\nریشه: <code>{root}</code>",
+        "log_proof_title": "🧾 <b>اثبات دفتر حدس‌ها</b>",
+        "log_proof_position": "دور {round}: مورد <b>{index}</b> از {size}",
+        "log_proof_leaf": "برگ: <code>{leaf}</code>",
+        "log_proof_root": "ریشه: <code>{root}</code>",
+        "log_proof_path": "مسیر (از برگ تا ریشه):",
+        "log_proof_none": "⚠️ هیچ حدس ثبت‌شده‌ای از شما در این گروه پیدا نشد.",
+        
+        # Database statistics
+        "cmd_dbstats": "/dbstats - (ادمین) کندترین عملیات پایگاه داده",
+        "dbstats_disabled": "⚠️ ردیابی پایگاه داده غیرفعال است (DB_TRACE=false).",
+        "dbstats_title": "🗄 <b>زمان‌بندی پایگاه داده</b> (کندترین p95 اول، میلی‌ثانیه)",
+        "dbstats_line": "<code>{name}</code>: p50 {p50:.1f} · p95 {p95:.1f} · p99 {p99:.1f} · {calls} فراخوانی · {rows:.1f} ردیف · انتظار {wait:.1f}",
+        "dbstats_slow": "🐢 کوئری‌های کند ثبت‌شده: <b>{count}</b>",
+        
+        # Profiling
+        "cmd_profile": "/profile [ثانیه] - (ادمین) پروفایل ربات در حال اجرا",
+        "profile_usage": "⚠️ استفاده: <code>/profile [ثانیه]</code>، حداکثر {max} ثانیه.",
+        "profile_busy": "⏳ یک پروفایل در حال اجراست.",
+        "profile_started": "🔬 پروفایل به مدت {seconds:.0f} ثانیه...",
+        "profile_title": "🔬 <b>پروفایل</b>: {seconds:.1f} ثانیه، {samples} نمونه، {cpu:.2f} ثانیه CPU",
+        "profile_split": "<code>{name}</code>: {share:.0%} ({cpu:.2f} ثانیه)",
+        "profile_top": "🔥 <b>پرکارترین توابع</b>",
+        "profile_function": "<code>{name}</code>: {samples}",
+        "profile_files": "📁 <code>{path}</code>\n📁 <code>{tasks_path}</code>",
     }
     
+    # Per-chat language overrides (chat_id -> language code), loaded from the DB at startup
+    chat_languages: Dict[int, str] = {}
+    
+    @staticmethod
+    def chat_language(chat_id: int) -> str:
+        """Get the language for a chat, falling back to the configured default."""
+        return Translations.chat_languages.get(chat_id, LANGUAGE)
+    
+    @staticmethod
+    def set_chat_language(chat_id: int, lang: str):
+        """Cache the language for a chat (persisting it is the caller's job)."""
+        if lang == LANGUAGE:
+            Translations.chat_languages.pop(chat_id, None)
+        else:
+            Translations.chat_languages[chat_id] = lang
+    
+    @staticmethod
+    def load_chat_languages(languages: Dict[int, str]):
+        """Replace the per-chat language cache with languages loaded from storage."""
+        Translations.chat_languages = {
+            chat_id: lang for chat_id, lang in languages.items()
+            if lang in SUPPORTED_LANGUAGES and lang != LANGUAGE
+        }
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def template(key: str, lang: str = "en") -> str:
+        """
+        Get the raw (unformatted) translated text for a key.
+        
+        Results are cached per (key, language), so repeated lookups are free.
+        
+        Args:
+            key: Translation key
+            lang: Language code ('en' or 'fa')
+            
+        Returns:
+            Raw translated text, falling back to English and then to the key
+        """
+        translations = _INDEX.get(lang, _INDEX["en"])
+        return translations.get(key, _INDEX["en"].get(key, f"[{key}]"))
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def formatter(key: str, lang: str = "en") -> Callable[..., str]:
+        """
+        Get a pre-bound ``str.format`` for a translated template.
+        
+        Args:
+            key: Translation key
+            lang: Language code ('en' or 'fa')
+            
+        Returns:
+            Callable that formats the template with keyword arguments
+        """
+        return Translations.template(key, lang).format
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def block(keys: Tuple[str, ...], lang: str = "en") -> str:
+        """
+        Render a static multi-line block of translations once and cache it.
+        
+        Args:
+            keys: Tuple of translation keys, one per line (empty string = blank line)
+            lang: Language code ('en' or 'fa')
+            
+        Returns:
+            The joined block of text
+        """
+        return "\n".join(Translations.template(key, lang) if key else "" for key in keys)
+    
+    @staticmethod
+    def preload():
+        """Warm the template cache for every key in every language."""
+        for lang in SUPPORTED_LANGUAGES:
+            for key in Translations.EN:
+                Translations.template(key, lang)
+    
     @staticmethod
     def get(key: str, lang: str = "en", **kwargs) -> str:
         """
@@ -280,11 +473,19 @@ class Translations:
         Returns:
             Formatted translated text
         """
-        translations = Translations.FA if lang == "fa" else Translations.EN
-        text = translations.get(key, Translations.EN.get(key, f"[{key}]"))
+        text = Translations.template(key, lang)
+        if not kwargs:
+            return text
         
         # Format with provided kwargs
         try:
             return text.format(**kwargs)
         except KeyError:
             return text
+
+
+# Preloaded per-language index with interned keys and values
+_INDEX = {
+    lang: {sys.intern(key): sys.intern(text) for key, text in table.items()}
+    for lang, table in (("en", Translations.EN), ("fa", Translations.FA))
+}
@@ -0,0 +1,163 @@
+"""Clocks for the game engine: real time, or simulated time for replays."""
+import asyncio
+import heapq
+import itertools
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+class SystemClock:
+    """Real time, backed by ``datetime.now`` and ``asyncio.sleep``."""
+    
+    def now(self) -> datetime:
+        """Current local time."""
+        return datetime.now()
+    
+    def time(self) -> float:
+        """Current Unix timestamp."""
+        return time.time()
+    
+    def monotonic(self) -> float:
+        """Monotonic seconds, for measuring intervals."""
+        return time.monotonic()
+    
+    async def sleep(self, seconds: float):
+        """Sleep for ``seconds`` of real time."""
+        await asyncio.sleep(seconds)
+
+class VirtualClock:
+    """
+    Simulated time that only moves when advanced.
+    
+    ``sleep`` parks the calling task until ``advance``/``advance_to`` moves
+    time past its deadline. Sleepers wake in deadline order (ties in the
+    order they went to sleep), and each woken task runs until it sleeps
+    again or finishes before the next one is woken. A replay is therefore
+    deterministic however fast it runs in wall-clock time.
+    
+    With a ``resolution`` > 0, sleepers due within that many seconds of each
+    other are woken together and run concurrently. This trades strict
+    ordering for throughput in load simulations.
+    """
+    
+    def __init__(self, start: Optional[datetime] = None, settle_timeout: float = 5.0, resolution: float = 0.0):
+        """
+        Args:
+            start: Time the clock starts at (default: now)
+            settle_timeout: Real seconds to wait for a woken task to sleep
+                again or finish before moving on
+            resolution: Window in seconds within which sleepers wake together
+        """
+        self.start = start or datetime.now()
+        self.settle_timeout = settle_timeout
+        self.resolution = resolution
+        self._epoch = self.start.timestamp()
+        self._elapsed = 0.0
+        self._sequence = itertools.count()
+        self._sleepers: List[Tuple[float, int, asyncio.Future, Optional[asyncio.Task]]] = []
+        self._settling: Dict[asyncio.Task, asyncio.Future] = {}
+    
+    @property
+    def elapsed(self) -> float:
+        """Virtual seconds since ``start``."""
+        return self._elapsed
+    
+    def now(self) -> datetime:
+        """Current virtual local time."""
+        return self.start + timedelta(seconds=self._elapsed)
+    
+    def time(self) -> float:
+        """Current virtual Unix timestamp."""
+        return self._epoch + self._elapsed
+    
+    def monotonic(self) -> float:
+        """Virtual monotonic seconds."""
+        return self._elapsed
+    
+    def pending(self) -> int:
+        """Number of tasks sleeping on this clock."""
+        return sum(1 for _, _, future, _ in self._sleepers if not future.done())
+    
+    def next_deadline(self) -> Optional[float]:
+        """Elapsed time of the earliest pending sleeper, if any."""
+        while self._sleepers and self._sleepers[0][2].done():
+            heapq.heappop(self._sleepers)
+        return self._sleepers[0][0] if self._sleepers else None
+    
+    async def sleep(self, seconds: float):
+        """Park the current task until virtual time has moved ``seconds`` ahead."""
+        task = asyncio.current_task()
+        self._mark_settled(task)
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self._elapsed + seconds, next(self._sequence), future, task))
+        await future
+    
+    async def advance(self, seconds: float):
+        """Move virtual time forward by ``seconds``, waking due sleepers in order."""
+        await self.advance_to_elapsed(self._elapsed + seconds)
+    
+    async def advance_to(self, when: datetime):
+        """Move virtual time forward to ``when`` (never backwards)."""
+        await self.advance_to_elapsed((when - self.start).total_seconds())
+    
+    async def advance_to_elapsed(self, target: float):
+        """Move virtual time forward to ``target`` seconds after ``start``."""
+        # Let tasks scheduled since the last step reach their first sleep
+        await asyncio.sleep(0)
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > target:
+                break
+            batch = []
+            window = min(deadline + self.resolution, target)
+            while self._sleepers and self._sleepers[0][0] <= window:
+                due, _, future, task = heapq.heappop(self._sleepers)
+                if not future.done():
+                    batch.append((future, task))
+                    self._elapsed = max(self._elapsed, due)
+            if len(batch) == 1:
+                await self._wake(*batch[0])
+            else:
+                await asyncio.gather(*(self._wake(future, task) for future, task in batch))
+        self._elapsed = max(self._elapsed, target)
+    
+    async def run_until_idle(self, limit: Optional[float] = None):
+        """Keep advancing to the next deadline until nothing sleeps (or ``limit`` is reached)."""
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or (limit is not None and deadline > limit):
+                return
+            await self.advance_to_elapsed(deadline)
+    
+    async def spawn(self, coro) -> asyncio.Task:
+        """Start a task and wait until it first sleeps on this clock (or finishes)."""
+        task = asyncio.create_task(coro)
+        await self._run_until_settled(task)
+        return task
+    
+    async def _wake(self, future: asyncio.Future, task: Optional[asyncio.Task]):
+        """Resolve a sleeper and wait until its task sleeps again or finishes."""
+        future.set_result(None)
+        if task is not None and not task.done():
+            await self._run_until_settled(task)
+    
+    async def _run_until_settled(self, task: asyncio.Task):
+        """Wait until a runnable task sleeps on this clock again or finishes."""
+        settled = asyncio.get_running_loop().create_future()
+        self._settling[task] = settled
+        task.add_done_callback(self._mark_settled)
+        try:
+            await asyncio.wait_for(asyncio.shield(settled), self.settle_timeout)
+        except asyncio.TimeoutError:
+            # Blocked on something other than this clock; carry on without it
+            self._settling.pop(task, None)
+        finally:
+            task.remove_done_callback(self._mark_settled)
+    
+    def _mark_settled(self, task: Optional[asyncio.Task]):
+        settled = self._settling.pop(task, None)
+        if settled is not None and not settled.done():
+            settled.set_result(None)
@@ -0,0 +1,25 @@
+"""Shared fixtures: every storage test runs against both backends."""
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+os.environ.setdefault("BOT_TOKEN", "42:TEST")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.storage.db import Database  # noqa: E402
+from bot.storage.memory import MemoryDatabase  # noqa: E402
+from bot.utils.clock import VirtualClock  # noqa: E402
+
+@pytest.fixture
+def clock():
+    """Virtual clock, so round timers and backoffs never wait in real time."""
+    return VirtualClock(datetime(2025, 1, 1, 12, 0, 0))
+
+@pytest.fixture(params=["sqlite", "memory"])
+def db(request, tmp_path, clock):
+    """Storage on the virtual clock; tests await ``init_db`` inside their own event loop."""
+    if request.param == "memory":
+        return MemoryDatabase(clock=clock)
+    return Database(str(tmp_path / "game.db"), clock)
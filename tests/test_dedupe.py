@@ -0,0 +1,43 @@
+"""Redelivered update filtering."""
+import asyncio
+from datetime import datetime
+
+from aiogram.types import Chat, Message, Update, User
+
+from bot.middlewares.dedupe import DedupeMiddleware, RecentKeys
+
+def text_update(update_id, message_id, chat_id=-100):
+    return Update(
+        update_id=update_id,
+        message=Message(
+            message_id=message_id,
+            date=datetime(2025, 1, 1),
+            chat=Chat(id=chat_id, type="supergroup"),
+            from_user=User(id=1, is_bot=False, first_name="Player"),
+            text="42"
+        )
+    )
+
+def test_recent_keys_is_a_bounded_lru():
+    keys = RecentKeys(2)
+    assert keys.add("a") and keys.add("b")
+    assert not keys.add("a")  # Refreshes "a"
+    assert keys.add("c")  # Evicts "b"
+    assert "a" in keys and "c" in keys and "b" not in keys
+    assert len(keys) == 2
+
+def test_duplicate_updates_and_messages_are_skipped():
+    async def scenario():
+        middleware = DedupeMiddleware(100)
+        handled = []
+        
+        async def handler(event, data):
+            handled.append(event.update_id)
+        
+        await middleware(handler, text_update(1, 10), {})
+        await middleware(handler, text_update(1, 10), {})  # Same update redelivered
+        await middleware(handler, text_update(2, 10), {})  # Same message, new update ID
+        await middleware(handler, text_update(3, 10, chat_id=-200), {})  # Same ID in another chat
+        await middleware(handler, text_update(4, 11), {})
+        assert handled == [1, 3, 4]
+    asyncio.run(scenario())
@@ -0,0 +1,20 @@
+"""Dispatcher setup can run more than once per process (replays, tests)."""
+from aiogram import Dispatcher
+
+from bot.main import setup_dispatcher
+from bot.middlewares.prefilter import GuessPrefilterMiddleware
+from bot.middlewares.throttling import GuessThrottleMiddleware
+from bot.services.rate_limit import TokenBucketLimiter
+
+def test_each_dispatcher_gets_its_own_routers_and_middlewares():
+    dispatchers = [Dispatcher(), Dispatcher()]
+    for dp in dispatchers:
+        setup_dispatcher(dp, TokenBucketLimiter(1, 5, 30))
+    
+    first, second = (dp.sub_routers for dp in dispatchers)
+    assert len(first) == len(second) == 3
+    assert all(a is not b for a, b in zip(first, second))
+    for player_router in (first[2], second[2]):
+        middlewares = [type(m) for m in player_router.message.outer_middleware]
+        assert middlewares == [GuessPrefilterMiddleware, GuessThrottleMiddleware]
+        assert player_router.message.handlers
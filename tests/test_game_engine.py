@@ -0,0 +1,126 @@
+"""Game engine invariants: first correct guess wins, rounds close once, ranges only narrow."""
+import asyncio
+
+from bot.config import MAX_NUMBER
+from bot.services.events import RoundClosed
+from bot.services.game_engine import GameEngine
+from bot.services.outbox import make_announcement
+from bot.storage.models import GameStatus, RoundStatus
+
+async def start_game(db, clock):
+    await db.init_db()
+    engine = GameEngine(db, clock=clock)
+    game, _ = await engine.create_game(-100)
+    round_obj = await engine.start_round(game.id, 1)
+    return engine, game, round_obj
+
+def wrong_value(game) -> int:
+    return game.number + 1 if game.number < MAX_NUMBER else game.number - 1
+
+def test_second_correct_guess_is_rejected(db, clock):
+    async def scenario():
+        engine, game, round_obj = await start_game(db, clock)
+        first = await engine.register_guess(game.id, round_obj.id, 1, game.number, 10)
+        second = await engine.register_guess(game.id, round_obj.id, 2, game.number, 11)
+        assert first[0] is True and first[1] is not None
+        assert second == (False, None)
+        
+        assert await engine.finish_game(game.id, 1, make_announcement(game.chat_id, "winner 1"))
+        assert not await engine.finish_game(game.id, 2, make_announcement(game.chat_id, "winner 2"))
+        
+        stored = await db.get_game(game.id)
+        assert stored.status == GameStatus.GAME_FINISHED
+        assert stored.winner_user_id == 1
+        assert (await db.get_round(round_obj.id)).status == RoundStatus.CLOSED
+        assert len(await db.get_round_leaves(round_obj.id)) == 1
+        assert await db.count_pending_outbox() == 1
+        await engine.stop_round_timers()
+    asyncio.run(scenario())
+
+def test_concurrent_correct_guesses_have_one_winner(db, clock):
+    async def scenario():
+        engine, game, round_obj = await start_game(db, clock)
+        results = await asyncio.gather(*(
+            engine.register_guess(game.id, round_obj.id, user_id, game.number, 100 + user_id)
+            for user_id in range(1, 9)
+        ))
+        winners = [guess for is_correct, guess in results if is_correct]
+        assert len(winners) == 1
+        assert winners[0].log_index == 0
+        assert len(await db.get_round_leaves(round_obj.id)) == 1
+        await engine.stop_round_timers()
+    asyncio.run(scenario())
+
+def test_finished_game_takes_no_guesses_after_restart(db, clock):
+    async def scenario():
+        engine, game, round_obj = await start_game(db, clock)
+        await engine.register_guess(game.id, round_obj.id, 1, game.number, 10)
+        await engine.finish_game(game.id, 1)
+        
+        restarted = GameEngine(db, clock=clock)
+        assert await restarted.register_guess(game.id, round_obj.id, 2, game.number, 11) == (False, None)
+        assert len(await db.get_round_leaves(round_obj.id)) == 1
+        await engine.stop_round_timers()
+    asyncio.run(scenario())
+
+def test_racing_closes_announce_once(db, clock):
+    async def scenario():
+        engine, game, round_obj = await start_game(db, clock)
+        closed = []
+        engine.events.subscribe_sync(closed.append, RoundClosed)
+        await engine.register_guess(game.id, round_obj.id, 1, wrong_value(game), 10)
+        
+        summary, _ = await asyncio.gather(
+            engine.close_round(round_obj.id),
+            engine._auto_close_round(round_obj.id, game.id)
+        )
+        assert summary.guess_count == 1
+        assert len(closed) == 1
+        assert await db.count_pending_outbox() == 1
+        assert (await engine.close_round(round_obj.id)).log_root == summary.log_root
+        await engine.stop_round_timers()
+    asyncio.run(scenario())
+
+def test_closed_round_log_covers_every_accepted_guess(db, clock):
+    async def scenario():
+        engine, game, round_obj = await start_game(db, clock)
+        value = wrong_value(game)
+        guesses = [
+            engine.register_guess(game.id, round_obj.id, user_id, value, 100 + user_id)
+            for user_id in range(1, 6)
+        ]
+        results = await asyncio.gather(*guesses[:3], engine.close_round(round_obj.id), *guesses[3:])
+        summary = results[3]
+        accepted = [guess for _, guess in results[:3] + results[4:] if guess is not None]
+        assert summary.log_size == len(accepted) == len(await db.get_round_leaves(round_obj.id))
+        assert await engine.register_guess(game.id, round_obj.id, 9, value, 999) == (False, None)
+        await engine.stop_round_timers()
+    asyncio.run(scenario())
+
+def test_known_range_survives_restart(db, clock):
+    async def scenario():
+        engine, game, round_obj = await start_game(db, clock)
+        low_guess = game.number - 1 if game.number > 1 else None
+        high_guess = game.number + 1 if game.number < MAX_NUMBER else None
+        if low_guess is not None:
+            await engine.register_guess(game.id, round_obj.id, 1, low_guess, 10)
+        expected = engine.known_range(game.id)
+        
+        restarted = GameEngine(db, clock=clock)
+        if high_guess is not None:
+            await restarted.register_guess(game.id, round_obj.id, 2, high_guess, 11)
+            expected = (expected[0], high_guess - 1)
+        assert restarted.known_range(game.id) == expected
+        stored = await db.get_round(round_obj.id)
+        assert (stored.range_low, stored.range_high) == expected
+        await engine.stop_round_timers()
+    asyncio.run(scenario())
+
+def test_cancel_closes_the_open_round(db, clock):
+    async def scenario():
+        engine, game, round_obj = await start_game(db, clock)
+        await engine.cancel_game(game.id)
+        assert (await db.get_round(round_obj.id)).status == RoundStatus.CLOSED
+        assert round_obj.id not in engine.round_timers
+        assert await engine.register_guess(game.id, round_obj.id, 1, game.number, 10) == (False, None)
+    asyncio.run(scenario())
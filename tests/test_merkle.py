@@ -0,0 +1,41 @@
+"""Merkle guess log: incremental roots and inclusion proofs."""
+from bot.services.merkle import MerkleLog, hash_leaf, inclusion_path, leaf_data, tree_root, verify_inclusion
+
+def leaves(n):
+    return [hash_leaf(leaf_data(1, user_id, user_id * 7, user_id)) for user_id in range(n)]
+
+def test_every_leaf_has_a_valid_proof():
+    for size in range(1, 34):
+        tree = leaves(size)
+        root = tree_root(tree)
+        for index, leaf in enumerate(tree):
+            assert verify_inclusion(leaf, index, size, inclusion_path(tree, index), root)
+
+def test_proof_fails_for_a_different_leaf_index_or_root():
+    tree = leaves(11)
+    root = tree_root(tree)
+    path = inclusion_path(tree, 5)
+    assert not verify_inclusion(tree[6], 5, 11, path, root)
+    assert not verify_inclusion(tree[5], 4, 11, path, root)
+    assert not verify_inclusion(tree[5], 5, 11, path, tree_root(tree[:10]))
+    assert not verify_inclusion(tree[5], 11, 11, path, root)
+
+def test_stored_frontier_continues_the_same_log():
+    tree = leaves(23)
+    log = MerkleLog()
+    for leaf in tree[:13]:
+        log.append(leaf)
+    restored = MerkleLog.from_state(log.size, log.state())
+    for leaf in tree[13:]:
+        restored.append(leaf)
+    assert restored.size == 23
+    assert restored.root() == tree_root(tree)
+    assert len(restored.frontier) == bin(23).count("1")
+
+def test_copy_leaves_the_original_untouched():
+    log = MerkleLog()
+    log.append(leaves(1)[0])
+    root = log.root()
+    copy = log.copy()
+    copy.append(leaves(2)[1])
+    assert (log.size, log.root()) == (1, root)
@@ -0,0 +1,70 @@
+"""Outbox delivery: per-chat order, retries and giving up."""
+import asyncio
+
+from aiogram.exceptions import TelegramBadRequest
+
+from bot.services.outbox import OutboxDispatcher, make_announcement
+
+class FakeBot:
+    """Records sent texts; texts in ``failing`` raise until removed."""
+    
+    def __init__(self, failing=(), error=None):
+        self.failing = set(failing)
+        self.error = error
+        self.sent = []
+    
+    async def send_message(self, chat_id, text, **kwargs):
+        if text in self.failing:
+            raise self.error or RuntimeError("network down")
+        self.sent.append((chat_id, text))
+
+def test_failed_message_holds_back_its_chat_only(db, clock):
+    async def scenario():
+        await db.init_db()
+        bot = FakeBot(failing={"first"})
+        outbox = OutboxDispatcher(db, bot, base_backoff=2.0)
+        await db.enqueue_outbox([
+            make_announcement(1, "first"),
+            make_announcement(1, "second"),
+            make_announcement(2, "other chat"),
+        ])
+        
+        assert await outbox.flush() == 2
+        assert bot.sent == [(2, "other chat")]
+        # In backoff: "second" still waits behind it
+        assert await outbox.flush() == 0
+        
+        bot.failing.clear()
+        await clock.advance(3)
+        while await outbox.flush():
+            pass
+        assert bot.sent == [(2, "other chat"), (1, "first"), (1, "second")]
+        assert await db.count_pending_outbox() == 0
+    asyncio.run(scenario())
+
+def test_permanent_error_gives_up_and_unblocks_the_chat(db, clock):
+    async def scenario():
+        await db.init_db()
+        bot = FakeBot(failing={"broken"}, error=TelegramBadRequest(method=None, message="Bad Request: can't parse entities"))
+        outbox = OutboxDispatcher(db, bot)
+        await db.enqueue_outbox([make_announcement(1, "broken"), make_announcement(1, "next")])
+        
+        while await outbox.flush():
+            pass
+        assert bot.sent == [(1, "next")]
+        assert await db.count_pending_outbox() == 0
+    asyncio.run(scenario())
+
+def test_retries_stop_after_max_attempts(db, clock):
+    async def scenario():
+        await db.init_db()
+        bot = FakeBot(failing={"flaky"})
+        outbox = OutboxDispatcher(db, bot, max_attempts=3, base_backoff=1.0)
+        await db.enqueue_outbox([make_announcement(1, "flaky")])
+        
+        for _ in range(3):
+            assert await outbox.flush() == 1
+            await clock.advance(60)
+        assert await outbox.flush() == 0
+        assert await db.count_pending_outbox() == 0
+    asyncio.run(scenario())
@@ -0,0 +1,36 @@
+"""Guess extraction from chat messages."""
+import pytest
+
+from bot.services.parsing import contains_digit, extract_guess
+
+@pytest.mark.parametrize("text, expected", [
+    ("42", 42),
+    ("  my guess is 42!", 42),
+    ("۴۲", 42),
+    ("٤٢", 42),
+    ("abc12 7", 7),
+    ("I say 50. Then 60", 50),
+    ("10000", 10000),
+    ("no numbers here", None),
+    ("call 09123456789 or 50", None),
+    ("5,000", None),
+    ("5.5", None),
+    ("٥٬٠٠٠", None),
+    ("9" * 5000, None),
+])
+def test_extract_guess(text, expected):
+    assert extract_guess(text) == expected
+
+@pytest.mark.parametrize("text, expected", [
+    (" 42 ", 42),
+    ("۴۲", 42),
+    ("42!", None),
+    ("guess 42", None),
+    ("123456789", None),
+])
+def test_extract_guess_strict(text, expected):
+    assert extract_guess(text, strict=True) == expected
+
+def test_contains_digit_in_every_script():
+    assert contains_digit("a1") and contains_digit("۳") and contains_digit("٣")
+    assert not contains_digit("hello")
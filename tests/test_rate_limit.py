@@ -0,0 +1,49 @@
+"""Token bucket guess throttling."""
+from bot.services.rate_limit import TokenBucketLimiter
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def monotonic(self):
+        return self.now
+
+def test_burst_then_one_warning_per_cooldown():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate=1, burst=3, cooldown=10, clock=clock)
+    assert [limiter.check("u") for _ in range(3)] == [(True, False)] * 3
+    assert limiter.check("u") == (False, True)
+    assert limiter.check("u") == (False, False)
+    
+    clock.now = 5
+    assert limiter.check("u") == (False, False)  # Still muted, although tokens refilled
+    clock.now = 10.5
+    assert limiter.check("u") == (True, False)
+
+def test_keys_are_independent():
+    limiter = TokenBucketLimiter(rate=1, burst=1, cooldown=10, clock=FakeClock())
+    assert limiter.check((1, 1)) == (True, False)
+    assert limiter.check((1, 1)) == (False, True)
+    assert limiter.check((1, 2)) == (True, False)
+    assert limiter.check((2, 1)) == (True, False)
+
+def test_bucket_count_is_capped_and_idle_buckets_are_swept():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate=1, burst=2, cooldown=10, max_keys=50, clock=clock, sweep_every=10)
+    for key in range(500):
+        limiter.check(key)
+    assert len(limiter) == 50
+    
+    clock.now = 100
+    for key in range(1000, 1010):
+        limiter.check(key)
+    assert len(limiter) <= 10
+
+def test_muted_bucket_survives_the_sweep():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate=1, burst=1, cooldown=1000, clock=clock, sweep_every=1)
+    limiter.check("flooder")
+    limiter.check("flooder")
+    clock.now = 100
+    limiter.check("other")
+    assert limiter.check("flooder") == (False, False)
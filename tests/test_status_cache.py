@@ -0,0 +1,118 @@
+"""Per-chat /status cache: loads, event patching and invalidation."""
+import asyncio
+from datetime import datetime, timedelta
+
+from bot.services.events import GuessRegistered, RoundPaused
+from bot.services.status_cache import StatusCache
+from bot.storage.models import Game, Guess, Round
+
+START = datetime(2025, 1, 1)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def monotonic(self):
+        return self.now
+
+def loaded_status(total_guesses=0):
+    game = Game(id=1, chat_id=-100, number=50)
+    active_round = Round(id=10, game_id=1, total_guesses=total_guesses, range_low=1, range_high=100)
+    return {'game': game, 'active_round': active_round, 'last_guess': None}
+
+def guess(value, log_index, seconds=0):
+    return Guess(id=log_index + 1, game_id=1, round_id=10, user_id=1, value=value,
+                 created_at=START + timedelta(seconds=seconds), log_index=log_index)
+
+def render(status, lang):
+    round_obj = status['active_round']
+    return f"{lang}:{round_obj.total_guesses}:{round_obj.range_low}-{round_obj.range_high}"
+
+class Loader:
+    def __init__(self, status_factory=loaded_status):
+        self.calls = 0
+        self.status_factory = status_factory
+    
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.status_factory()
+
+def test_second_status_is_served_from_cache():
+    async def scenario():
+        cache, load = StatusCache(clock=FakeClock()), Loader()
+        assert await cache.text(-100, "en", load, render) == "en:0:1-100"
+        assert await cache.text(-100, "en", load, render) == "en:0:1-100"
+        assert (load.calls, cache.hits, cache.misses) == (1, 1, 1)
+    asyncio.run(scenario())
+
+def test_concurrent_misses_share_one_load():
+    async def scenario():
+        cache, load = StatusCache(clock=FakeClock()), Loader()
+        texts = await asyncio.gather(*(cache.text(-100, "en", load, render) for _ in range(5)))
+        assert set(texts) == {"en:0:1-100"}
+        assert load.calls == 1
+    asyncio.run(scenario())
+
+def test_guesses_patch_the_cached_round():
+    async def scenario():
+        cache, load = StatusCache(clock=FakeClock()), Loader()
+        await cache.text(-100, "en", load, render)
+        cache.guess_registered(-100, guess(30, 0), (31, 100))
+        cache.guess_registered(-100, guess(70, 1, seconds=1), (1, 69))
+        assert await cache.text(-100, "en", load, render) == "en:2:31-69"
+        assert load.calls == 1
+    asyncio.run(scenario())
+
+def test_guess_already_counted_by_the_load_is_not_counted_twice():
+    async def scenario():
+        cache = StatusCache(clock=FakeClock())
+        await cache.text(-100, "en", Loader(lambda: loaded_status(total_guesses=1)), render)
+        cache.guess_registered(-100, guess(30, 0), (31, 100))
+        assert await cache.text(-100, "en", Loader(), render) == "en:1:31-100"
+    asyncio.run(scenario())
+
+def test_load_racing_with_an_event_is_not_kept():
+    async def scenario():
+        cache, load = StatusCache(clock=FakeClock()), Loader()
+        pending = asyncio.ensure_future(cache.text(-100, "en", load, render))
+        await asyncio.sleep(0)  # The load is in flight
+        cache.invalidate(-100)
+        assert await pending == "en:0:1-100"
+        assert len(cache) == 0
+        await cache.text(-100, "en", load, render)
+        assert load.calls == 2
+    asyncio.run(scenario())
+
+def test_state_changes_drop_the_entry():
+    async def scenario():
+        cache, load = StatusCache(clock=FakeClock()), Loader()
+        await cache.text(-100, "en", load, render)
+        cache.on_event(RoundPaused(Round(id=10, game_id=1)))  # No chat ID: found through the game
+        assert len(cache) == 0
+        await cache.text(-100, "en", load, render)
+        cache.on_event(GuessRegistered(Game(id=1, chat_id=-100), Guess(round_id=99, log_index=0), (1, 100)))
+        assert len(cache) == 0  # A guess for another round can't be patched in
+    asyncio.run(scenario())
+
+def test_rerenders_are_debounced():
+    async def scenario():
+        clock = FakeClock()
+        cache, load = StatusCache(debounce=1.0, clock=clock), Loader()
+        await cache.text(-100, "en", load, render)
+        cache.guess_registered(-100, guess(30, 0), (31, 100))
+        assert await cache.text(-100, "en", load, render) == "en:0:1-100"
+        clock.now = 1.0
+        assert await cache.text(-100, "en", load, render) == "en:1:31-100"
+    asyncio.run(scenario())
+
+def test_oldest_chat_is_evicted_when_full():
+    async def scenario():
+        cache = StatusCache(max_entries=2, clock=FakeClock())
+        for chat_id in (-1, -2, -3):
+            await cache.text(chat_id, "en", Loader(), render)
+        assert len(cache) == 2
+        load = Loader()
+        await cache.text(-1, "en", load, render)
+        assert load.calls == 1
+    asyncio.run(scenario())
@@ -0,0 +1,70 @@
+"""Storage invariants both backends must share."""
+import asyncio
+
+from bot.services.outbox import make_announcement
+from bot.storage.models import Game, Guess, Round, GameStatus, RoundStatus
+
+async def game_with_round(db, clock):
+    await db.init_db()
+    game_id = await db.create_game(Game(
+        chat_id=-100, status=GameStatus.ROUND_ACTIVE, target_hash="h", salt="s", number=50, created_at=clock.now()
+    ))
+    round_id = await db.create_round(Round(
+        game_id=game_id, round_index=1, status=RoundStatus.ACTIVE, started_at=clock.now()
+    ))
+    return game_id, round_id
+
+def test_redelivered_guess_is_stored_once(db, clock):
+    async def scenario():
+        game_id, round_id = await game_with_round(db, clock)
+        guess = Guess(game_id=game_id, round_id=round_id, user_id=1, value=10, created_at=clock.now(), message_id=7)
+        assert await db.create_guess(guess) is not None
+        assert await db.create_guess(guess) is None
+        assert len(await db.get_guesses_for_game(game_id)) == 1
+    asyncio.run(scenario())
+
+def test_round_interval_only_narrows(db, clock):
+    async def scenario():
+        _, round_id = await game_with_round(db, clock)
+        await db.increment_round_guesses(round_id, 20, 80)
+        await db.increment_round_guesses(round_id, 30, 90)
+        await db.increment_round_guesses(round_id, 10, 70)
+        stored = await db.get_round(round_id)
+        assert (stored.range_low, stored.range_high, stored.total_guesses) == (30, 70, 3)
+    asyncio.run(scenario())
+
+def test_finish_game_only_once_and_closes_its_round(db, clock):
+    async def scenario():
+        game_id, round_id = await game_with_round(db, clock)
+        assert await db.finish_game(game_id, 1, [make_announcement(-100, "won by 1")])
+        assert not await db.finish_game(game_id, 2, [make_announcement(-100, "won by 2")])
+        
+        game = await db.get_game(game_id)
+        assert (game.status, game.winner_user_id) == (GameStatus.GAME_FINISHED, 1)
+        assert (await db.get_round(round_id)).status == RoundStatus.CLOSED
+        assert await db.get_active_round(game_id) is None
+        assert [m.text for m in await db.get_due_outbox(clock.time(), 10)] == ["won by 1"]
+    asyncio.run(scenario())
+
+def test_canceled_game_cannot_be_won(db, clock):
+    async def scenario():
+        game_id, round_id = await game_with_round(db, clock)
+        await db.update_game_status(game_id, GameStatus.GAME_CANCELED)
+        assert (await db.get_round(round_id)).status == RoundStatus.CLOSED
+        assert not await db.finish_game(game_id, 1)
+        assert (await db.get_game(game_id)).status == GameStatus.GAME_CANCELED
+    asyncio.run(scenario())
+
+def test_due_outbox_waits_behind_older_messages_of_the_chat(db, clock):
+    async def scenario():
+        await db.init_db()
+        await db.enqueue_outbox([make_announcement(1, "a"), make_announcement(1, "b"), make_announcement(2, "c")])
+        first, other = await db.get_due_outbox(clock.time(), 10)
+        assert (first.text, other.text) == ("a", "c")
+        await db.mark_outbox_failed(first.id, 1, clock.time() + 30, "timeout")
+        await db.mark_outbox_sent([other.id], clock.time())
+        assert await db.get_due_outbox(clock.time(), 10) == []
+        assert [m.text for m in await db.get_due_outbox(clock.time() + 30, 10)] == ["a"]
+        await db.mark_outbox_sent([first.id], clock.time())
+        assert [m.text for m in await db.get_due_outbox(clock.time(), 10)] == ["b"]
+    asyncio.run(scenario())